@@ -1,7 +1,16 @@
-# @version ^0.3.1
+# @version ^0.3.3
 
 '''
 Contract is not editable, if something needs to change, deploy a new one.
+
+With a zero `threshold` and `interval` every payment is distributed right
+away. Otherwise payments accumulate until the balance reaches `threshold`
+or `interval` seconds passed since the last distribution, whichever comes
+first (a zero value disables that condition). Rounding dust stays in the
+balance and is part of the next distribution.
+
+With `compact_events` a distribution logs a single DistributionRound instead
+of one Distribution per member.
 '''
 
 SIZE: constant(uint8) = 4
@@ -10,6 +19,12 @@ rate: public(uint256)
 members: public(address[SIZE])
 owner: public(address)
 equities: public(uint8[SIZE])
+last_distribution: public(uint256)
+
+# Set on deployment, read from the code instead of storage
+THRESHOLD: immutable(uint256)
+INTERVAL: immutable(uint256)
+COMPACT_EVENTS: immutable(bool)
 
 event Payment:
     sender: indexed(address)
@@ -19,13 +34,17 @@ event Distribution:
     receiver: indexed(address)
     amount: uint256
 
+event DistributionRound:
+    receivers: address[SIZE]
+    amounts: uint256[SIZE]
+
 @external
 @payable
 def __default__():
     log Payment(msg.sender, msg.value)
 
 @external
-def __init__(rate: uint256, members: address[SIZE], equities: uint8[SIZE]):
+def __init__(rate: uint256, members: address[SIZE], equities: uint8[SIZE], threshold: uint256, interval: uint256, compact_events: bool):
     sum: uint8 = 0
 
     for ix in range(SIZE):
@@ -37,6 +56,26 @@ def __init__(rate: uint256, members: address[SIZE], equities: uint8[SIZE]):
     self.members = members
     self.owner = msg.sender
     self.equities = equities
+    self.last_distribution = block.timestamp
+
+    THRESHOLD = threshold
+    INTERVAL = interval
+    COMPACT_EVENTS = compact_events
+
+@external
+@view
+def threshold() -> uint256:
+    return THRESHOLD
+
+@external
+@view
+def interval() -> uint256:
+    return INTERVAL
+
+@external
+@view
+def compact_events() -> bool:
+    return COMPACT_EVENTS
 
 @internal
 @pure
@@ -53,17 +92,41 @@ def _calculate(amount: uint256, equities: uint8[4]) -> uint256[4]:
 def calculate(amount: uint256, equities: uint8[4]) -> uint256[4]:
     return self._calculate(amount, equities)
 
+@internal
+@view
+def _due() -> bool:
+    if THRESHOLD == 0 and INTERVAL == 0:
+        return True
+
+    if THRESHOLD > 0 and self.balance >= THRESHOLD:
+        return True
+
+    return INTERVAL > 0 and block.timestamp >= self.last_distribution + INTERVAL
+
 @internal
 def _distribute():
+    if INTERVAL > 0:
+        self.last_distribution = block.timestamp
+
     splits: uint256[SIZE] = self._calculate(self.balance, self.equities)
 
+    # Members as read by the loop, the compact round logs them without
+    # reading their slots again
+    members: address[SIZE] = empty(address[SIZE])
+
     for ix in range(SIZE):
         member: address = self.members[ix]
         amount: uint256 = splits[ix]
 
         send(member, amount)
 
-        log Distribution(member, amount)
+        if COMPACT_EVENTS:
+            members[ix] = member
+        else:
+            log Distribution(member, amount)
+
+    if COMPACT_EVENTS:
+        log DistributionRound(members, splits)
 
 @external
 def distribute():
@@ -74,7 +137,8 @@ def distribute():
 def pay():
     log Payment(msg.sender, msg.value)
 
-    self._distribute()
+    if self._due():
+        self._distribute()
 
 @external
 def shutdown():
@@ -0,0 +1,280 @@
+# @version ^0.3.3
+
+'''
+Pull based variant of Unit. distribute() only credits vendors and advances a
+cumulative tokens per share accumulator, members claim() their share on their
+own schedule. The keeper cost does not depend on the number of members.
+
+Members and vendors removed by an edit keep their credited balance and can
+still claim it. shutdown() pays out the current ones and leaves the credits
+of removed ones claimable, the contract is only destroyed once none is left.
+'''
+
+from vyper.interfaces import ERC20
+
+MONTH_TIMEDELTA: constant(uint256) = 2629800
+
+DISTRIBUTION_THRESHOLD: constant(uint256) = 1_000_000_000_000_000_000
+
+MEMBERS: constant(uint256) = 256
+SHARES: constant(uint256) = 10000
+
+VENDORS: constant(uint8) = 3
+
+# Fixed point scale of the tokens per share accumulator
+PRECISION: constant(uint256) = 1_000_000_000_000_000_000
+
+start_timestamp: public(uint256)
+distributions_counter: public(uint256)
+
+owner: public(address)
+
+members: public(DynArray[address, MEMBERS])
+equities: public(HashMap[address, uint256])
+
+vendors: public(address[VENDORS])
+fees: public(uint256[VENDORS])
+
+token: ERC20
+
+# Accumulated tokens per share (scaled by PRECISION) since deployment
+tokens_per_share: public(uint256)
+# Accumulator value at each account's last settlement
+settled_per_share: HashMap[address, uint256]
+# Tokens settled to each account and not claimed yet
+credits: HashMap[address, uint256]
+# Tokens held for members and vendors, excluded from new distributions
+reserved: public(uint256)
+# Sum of credits, what is left of it after shutdown stays claimable
+credited: public(uint256)
+
+# Set by shutdown() while removed members or vendors have credits to claim
+shut_down: public(bool)
+
+event Credit:
+    amount: uint256
+    tokens_per_share: uint256
+
+event Claim:
+    receiver: indexed(address)
+    amount: uint256
+
+@external
+def __init__(
+        start_timestamp: uint256,
+        token_contract: address,
+        members: DynArray[address, MEMBERS],
+        equities: DynArray[uint256, MEMBERS],
+        vendors: address[VENDORS],
+        fees: uint256[VENDORS],
+    ):
+    assert len(members) == len(equities), 'Members and equities length mismatch'
+
+    sum: uint256 = 0
+
+    for ix in range(MEMBERS):
+        if ix >= len(members):
+            break
+
+        assert members[ix] != ZERO_ADDRESS and equities[ix] > 0, \
+            'Every member needs an address and non-zero equity'
+
+        self.equities[members[ix]] += equities[ix]
+
+        sum += equities[ix]
+
+    assert sum == SHARES, 'Equities sum not equals total shares'
+
+    for ix in range(VENDORS):
+        assert (vendors[ix] == ZERO_ADDRESS and fees[ix] == 0)  \
+            or (vendors[ix] != ZERO_ADDRESS and fees[ix]  > 0), \
+            'Only zero address can have zero fee'
+
+    self.start_timestamp = start_timestamp
+    self.distributions_counter = 0
+
+    self.owner = msg.sender
+
+    self.members = members
+
+    self.vendors = vendors
+    self.fees = fees
+
+    self.token = ERC20(token_contract)
+
+@internal
+def _settle(account: address):
+    tokens_per_share: uint256 = self.tokens_per_share
+
+    accrued: uint256 = self.equities[account] * (tokens_per_share - self.settled_per_share[account]) / PRECISION
+
+    if accrued > 0:
+        self.credits[account] += accrued
+        self.credited += accrued
+
+    self.settled_per_share[account] = tokens_per_share
+
+@internal
+def _pay(account: address):
+    amount: uint256 = self.credits[account]
+
+    if amount > 0:
+        self.credits[account] = 0
+        self.reserved -= amount
+        self.credited -= amount
+
+        self.token.transfer(account, amount)
+
+        log Claim(account, amount)
+
+@internal
+@view
+def _pending_distributions() -> uint256:
+    assert block.timestamp > self.start_timestamp # dev: Contract start date is in the future
+
+    months_since_start: uint256 = (block.timestamp - self.start_timestamp) / MONTH_TIMEDELTA
+
+    return months_since_start - self.distributions_counter
+
+@external
+@view
+def pending_distributions() -> uint256:
+    return self._pending_distributions()
+
+@external
+@view
+def withdrawable(account: address) -> uint256:
+    return self.credits[account] \
+        + self.equities[account] * (self.tokens_per_share - self.settled_per_share[account]) / PRECISION
+
+@external
+def distribute():
+    assert not self.shut_down, 'Unit is shut down'
+
+    token_balance: uint256 = self.token.balanceOf(self)
+
+    # Only tokens received since the last distribution are distributed
+    income: uint256 = token_balance - self.reserved
+
+    assert income > DISTRIBUTION_THRESHOLD, 'Balance below the distribution threshold'
+
+    pending_distributions: uint256 = self._pending_distributions()
+
+    if pending_distributions > 0:
+        vendors_total: uint256 = 0
+
+        # Credit vendors
+        for ix in range(VENDORS):
+            amount: uint256 = self.fees[ix] * pending_distributions
+
+            if amount > 0:
+                self.credits[self.vendors[ix]] += amount
+
+                vendors_total += amount
+
+        assert income >= vendors_total, 'Insufficient balance to pay vendors'
+
+        self.credited += vendors_total
+
+        # Update the distributions count
+        self.distributions_counter += pending_distributions
+
+        income -= vendors_total
+
+    # Credit members, integer division dust stays reserved until shutdown
+    tokens_per_share: uint256 = self.tokens_per_share + income * PRECISION / SHARES
+
+    self.tokens_per_share = tokens_per_share
+    self.reserved = token_balance
+
+    log Credit(income, tokens_per_share)
+
+@external
+def claim():
+    self._settle(msg.sender)
+
+    assert self.credits[msg.sender] > 0, 'Nothing to claim'
+
+    self._pay(msg.sender)
+
+@external
+def change_owner(new_owner: address):
+    assert msg.sender == self.owner # dev: Caller is not the owner
+
+    self.owner = new_owner
+
+@external
+def change_members_and_equities(members: DynArray[address, MEMBERS], equities: DynArray[uint256, MEMBERS]):
+    assert msg.sender == self.owner # dev: Caller is not the owner
+
+    assert self._pending_distributions() == 0, 'There are pending distributions'
+
+    assert len(members) == len(equities), 'Members and equities length mismatch'
+
+    # Settle what current members earned so far with their current equity
+    for member in self.members:
+        self._settle(member)
+        self.equities[member] = 0
+
+    sum: uint256 = 0
+
+    for ix in range(MEMBERS):
+        if ix >= len(members):
+            break
+
+        assert members[ix] != ZERO_ADDRESS and equities[ix] > 0, \
+            'Every member needs an address and non-zero equity'
+
+        # New members start accruing from the current accumulator value
+        self._settle(members[ix])
+        self.equities[members[ix]] += equities[ix]
+
+        sum += equities[ix]
+
+    assert sum == SHARES, 'Equities sum not equals total shares'
+
+    self.members = members
+
+@external
+def change_vendors_and_fees(vendors: address[VENDORS], fees: uint256[VENDORS]):
+    assert msg.sender == self.owner # dev: Caller is not the owner
+
+    assert self._pending_distributions() == 0, 'There are pending distributions'
+
+    for ix in range(VENDORS):
+        assert (vendors[ix] == ZERO_ADDRESS and fees[ix] == 0)  \
+            or (vendors[ix] != ZERO_ADDRESS and fees[ix]  > 0), \
+            'Only zero address can have zero fee'
+
+    self.vendors = vendors
+    self.fees = fees
+
+@external
+def shutdown():
+    assert msg.sender == self.owner # dev: Caller is not the owner
+
+    # Pay what current members and vendors are owed
+    for member in self.members:
+        self._settle(member)
+        self._pay(member)
+
+    for vendor in self.vendors:
+        if vendor != ZERO_ADDRESS:
+            self._pay(vendor)
+
+    # Credits of removed members and vendors stay claimable
+    owed: uint256 = self.credited
+
+    self.reserved = owed
+
+    # Return remaining tokens
+    token_balance: uint256 = self.token.balanceOf(self)
+
+    if token_balance > owed:
+        self.token.transfer(self.owner, token_balance - owed)
+
+    if owed > 0:
+        self.shut_down = True
+    else:
+        # Return Ether and destroy
+        selfdestruct(self.owner)
@@ -0,0 +1,76 @@
+# @version ^0.3.3
+
+'''
+Distributes many Units in a single transaction. Every unit is called, a unit
+that reverts does not revert the others and is previewed for the reason. The
+outcome of every unit is returned and logged.
+'''
+
+# Units handled by a single call
+MAX_UNITS: constant(uint256) = 64
+
+# Gas forwarded to each distribute(), well above what a Unit paying every
+# recipient uses, so a unit burning all its gas leaves enough for the rest
+DISTRIBUTE_GAS: constant(uint256) = 1_000_000
+
+# Encoded preview_distribution() result, 26 words with every recipient
+PREVIEW_SIZE: constant(uint256) = 832
+
+# Outcomes, DISTRIBUTED when distribute() succeeded, otherwise the status of
+# Unit.preview_distribution() and FAILED when the preview does not explain
+# the revert
+DISTRIBUTED: constant(uint256) = 0
+BELOW_THRESHOLD: constant(uint256) = 1
+INSUFFICIENT_FOR_VENDORS: constant(uint256) = 2
+NOT_STARTED: constant(uint256) = 3
+FAILED: constant(uint256) = 4
+
+event DistributionResults:
+    addresses: DynArray[address, MAX_UNITS]
+    outcomes: DynArray[uint256, MAX_UNITS]
+
+@internal
+def _distribute(unit: address) -> uint256:
+    if not unit.is_contract:
+        return FAILED
+
+    # Most units distribute, previewing all of them first would read their
+    # configuration twice
+    if raw_call(unit, method_id("distribute()"), gas=DISTRIBUTE_GAS, revert_on_failure=False):
+        return DISTRIBUTED
+
+    success: bool = False
+    response: Bytes[PREVIEW_SIZE] = b""
+
+    success, response = raw_call(
+        unit,
+        method_id("preview_distribution()"),
+        max_outsize=PREVIEW_SIZE,
+        is_static_call=True,
+        revert_on_failure=False,
+    )
+
+    # Units deployed before preview_distribution() have no reason, the
+    # status is the first word of the struct
+    if success and len(response) >= 64:
+        status: uint256 = extract32(response, 32, output_type=uint256)
+
+        if status != DISTRIBUTED:
+            return status
+
+    return FAILED
+
+@external
+def distribute(addresses: DynArray[address, MAX_UNITS]) -> DynArray[uint256, MAX_UNITS]:
+    """
+    Calls distribute() on every unit, returns the outcome of every unit in
+    order.
+    """
+    outcomes: DynArray[uint256, MAX_UNITS] = []
+
+    for unit in addresses:
+        outcomes.append(self._distribute(unit))
+
+    log DistributionResults(addresses, outcomes)
+
+    return outcomes
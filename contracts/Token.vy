@@ -10,6 +10,12 @@ from vyper.interfaces import ERC20
 
 implements: ERC20
 
+# Receivers per transfer_batch() call
+BATCH_SIZE: constant(uint256) = 64
+
+# ERC-165 identifiers, the batch one is the transfer_batch selector
+ERC165_INTERFACE_ID: constant(bytes4) = 0x01ffc9a7
+TRANSFER_BATCH_INTERFACE_ID: constant(bytes4) = 0x53ca06e4
 
 event Approval:
     owner: indexed(address)
@@ -52,6 +58,17 @@ def balanceOf(_owner: address) -> uint256:
     return self.balances[_owner]
 
 
+@view
+@external
+def supportsInterface(_interface_id: bytes4) -> bool:
+    """
+    @notice ERC-165 interface detection
+    @param _interface_id Interface identifier
+    @return True for ERC-165 itself and the transfer_batch interface
+    """
+    return _interface_id == ERC165_INTERFACE_ID or _interface_id == TRANSFER_BATCH_INTERFACE_ID
+
+
 @view
 @external
 def allowance(_owner : address, _spender : address) -> uint256:
@@ -121,3 +138,27 @@ def transferFrom(_from : address, _to : address, _value : uint256) -> bool:
     self.allowances[_from][msg.sender] -= _value
     self._transfer(_from, _to, _value)
     return True
+
+
+@external
+def transfer_batch(_receivers: DynArray[address, BATCH_SIZE], _amounts: DynArray[uint256, BATCH_SIZE]) -> bool:
+    """
+    @notice Transfer tokens to several addresses at once
+    @dev The sender balance is checked and updated once for the whole batch,
+         a Transfer event is logged for every receiver
+    @param _receivers The addresses to transfer to
+    @param _amounts The amounts to be transferred, one per receiver
+    @return Success boolean
+    """
+    assert len(_receivers) == len(_amounts), "Receivers and amounts length mismatch"
+    total: uint256 = 0
+    for amount in _amounts:
+        total += amount
+    assert self.balances[msg.sender] >= total, "Insufficient balance"
+    self.balances[msg.sender] -= total
+    for ix in range(BATCH_SIZE):
+        if ix >= len(_receivers):
+            break
+        self.balances[_receivers[ix]] += _amounts[ix]
+        log Transfer(msg.sender, _receivers[ix], _amounts[ix])
+    return True
@@ -2,6 +2,9 @@
 
 from vyper.interfaces import ERC20
 
+interface BatchToken:
+    def transfer_batch(receivers: DynArray[address, RECIPIENTS], amounts: DynArray[uint256, RECIPIENTS]) -> bool: nonpayable
+
 MONTH_TIMEDELTA: constant(uint256) = 2629800
 
 DISTRIBUTION_THRESHOLD: constant(uint256) = 1_000_000_000_000_000_000
@@ -11,23 +14,113 @@ SHARES: constant(uint256) = 10000
 
 VENDORS: constant(uint8) = 3
 
+# Equities and fees are packed into a single slot each, one lane per index
+EQUITY_BITS: constant(int128) = 16
+EQUITY_MASK: constant(uint256) = 2**16 - 1
+
+FEE_BITS: constant(int128) = 85
+FEE_MASK: constant(uint256) = 2**85 - 1
+
+# The fee lanes leave the top bit of packed_fees free, it enables arrears mode
+ARREARS_MODE: constant(uint256) = 2**255
+
+# Extra tokens distribute_many() handles in a single call
+TOKENS: constant(uint256) = 8
+
+# Vendors plus members paid by a distribution
+RECIPIENTS: constant(uint256) = 10
+
+# Bits of flags
+BATCH_TRANSFERS: constant(uint256) = 1
+COMPACT_EVENTS: constant(uint256) = 2
+
+# ERC-165 identifier of Token.transfer_batch
+TRANSFER_BATCH_INTERFACE_ID: constant(bytes4) = 0x53ca06e4
+
+# Status of preview_distribution(), whether distribute() would succeed or
+# which check it would fail
+DISTRIBUTABLE: constant(uint256) = 0
+BELOW_THRESHOLD: constant(uint256) = 1
+INSUFFICIENT_FOR_VENDORS: constant(uint256) = 2
+NOT_STARTED: constant(uint256) = 3
+
+struct Snapshot:
+    owner: address
+    start_timestamp: uint256
+    distributions_counter: uint256
+    pending_distributions: uint256
+    members: address[MEMBERS]
+    equities: uint256[MEMBERS]
+    vendors: address[VENDORS]
+    fees: uint256[VENDORS]
+    token: address
+    token_balance: uint256
+
+struct Preview:
+    status: uint256
+    receivers: DynArray[address, RECIPIENTS]
+    amounts: DynArray[uint256, RECIPIENTS]
+
 start_timestamp: public(uint256)
 distributions_counter: public(uint256)
 
 owner: public(address)
 
 members: public(address[MEMBERS])
-equities: public(uint256[MEMBERS])
+packed_equities: uint256
 
 vendors: public(address[VENDORS])
-fees: public(uint256[VENDORS])
+packed_fees: uint256
 
 token: ERC20
 
+# BATCH_TRANSFERS when the primary token supports transfer_batch(), detected
+# on deployment, and COMPACT_EVENTS when the owner enabled them. A single slot
+# read once per distribution
+flags: uint256
+
+# Distribution threshold of the extra tokens accepted by distribute_many(),
+# zero for tokens that are not accepted
+thresholds: public(HashMap[address, uint256])
+
+# Primary token received by every address ever paid, members and vendors
+# removed from the configuration keep their totals
+received: public(HashMap[address, uint256])
+
+# Fees the balance could not cover in arrears mode, per vendor slot
+arrears: public(uint256[VENDORS])
+
+# Extra tokens with a non-zero threshold, shutdown() returns all of them
+accepted_tokens: public(uint256)
+
 event Distribution:
     receiver: indexed(address)
     amount: uint256
 
+event TokenDistribution:
+    token: indexed(address)
+    receiver: indexed(address)
+    amount: uint256
+
+# With compact events a distribution logs a single round instead of one
+# Distribution or TokenDistribution per receiver
+event DistributionRound:
+    months: uint256
+    distributions_counter: uint256
+    receivers: DynArray[address, RECIPIENTS]
+    amounts: DynArray[uint256, RECIPIENTS]
+
+event TokenDistributionRound:
+    token: indexed(address)
+    receivers: DynArray[address, RECIPIENTS]
+    amounts: DynArray[uint256, RECIPIENTS]
+
+# Owner, members, equities, vendors, fees or the arrears mode changed, lets
+# clients keep the configuration cached until it is logged. `owner` is the
+# owner after the change
+event ConfigurationChanged:
+    owner: indexed(address)
+
 @external
 def __init__(
         start_timestamp: uint256,
@@ -38,6 +131,7 @@ def __init__(
         fees: uint256[VENDORS],
     ):
     sum: uint256 = 0
+    packed_equities: uint256 = 0
 
     for ix in range(MEMBERS):
         assert (members[ix] == ZERO_ADDRESS and equities[ix] == 0)  \
@@ -45,27 +139,162 @@ def __init__(
             'Only zero address can have zero equity'
 
         sum += equities[ix]
+        packed_equities = bitwise_or(packed_equities, shift(equities[ix], convert(ix, int128) * EQUITY_BITS))
 
     assert sum == SHARES, 'Equities sum not equals total shares'
 
+    packed_fees: uint256 = 0
+
     for ix in range(VENDORS):
         assert (vendors[ix] == ZERO_ADDRESS and fees[ix] == 0)  \
             or (vendors[ix] != ZERO_ADDRESS and fees[ix]  > 0), \
             'Only zero address can have zero fee'
 
+        assert fees[ix] <= FEE_MASK, 'Fee exceeds the maximum'
+
+        packed_fees = bitwise_or(packed_fees, shift(fees[ix], convert(ix, int128) * FEE_BITS))
+
     self.start_timestamp = start_timestamp
     self.distributions_counter = 0
 
     self.owner = msg.sender
 
     self.members = members
-    self.equities = equities
+    self.packed_equities = packed_equities
 
     self.vendors = vendors
-    self.fees = fees
+    self.packed_fees = packed_fees
 
     self.token = ERC20(token_contract)
 
+    # Plain ERC-20 tokens fail the call or return nothing
+    success: bool = False
+    response: Bytes[32] = b""
+
+    success, response = raw_call(
+        token_contract,
+        _abi_encode(TRANSFER_BATCH_INTERFACE_ID, method_id=method_id("supportsInterface(bytes4)")),
+        max_outsize=32,
+        is_static_call=True,
+        revert_on_failure=False,
+    )
+
+    if success and len(response) == 32 and convert(response, uint256) == 1:
+        self.flags = BATCH_TRANSFERS
+
+@internal
+@pure
+def _pack_equities(members: address[MEMBERS], equities: uint256[MEMBERS]) -> uint256:
+    """
+    Validates members and equities, returns the equities packed in one word.
+    """
+    sum: uint256 = 0
+    packed_equities: uint256 = 0
+
+    for ix in range(MEMBERS):
+        assert (members[ix] == ZERO_ADDRESS and equities[ix] == 0)  \
+            or (members[ix] != ZERO_ADDRESS and equities[ix]  > 0), \
+            'Only zero address can have zero equity'
+
+        sum += equities[ix]
+        packed_equities = bitwise_or(packed_equities, shift(equities[ix], convert(ix, int128) * EQUITY_BITS))
+
+    assert sum == SHARES, 'Equities sum not equals total shares'
+
+    return packed_equities
+
+@internal
+@pure
+def _pack_fees(vendors: address[VENDORS], fees: uint256[VENDORS]) -> uint256:
+    """
+    Validates vendors and fees, returns the fees packed in one word.
+    """
+    packed_fees: uint256 = 0
+
+    for ix in range(VENDORS):
+        assert (vendors[ix] == ZERO_ADDRESS and fees[ix] == 0)  \
+            or (vendors[ix] != ZERO_ADDRESS and fees[ix]  > 0), \
+            'Only zero address can have zero fee'
+
+        assert fees[ix] <= FEE_MASK, 'Fee exceeds the maximum'
+
+        packed_fees = bitwise_or(packed_fees, shift(fees[ix], convert(ix, int128) * FEE_BITS))
+
+    return packed_fees
+
+@external
+def initialize(
+        start_timestamp: uint256,
+        token_contract: address,
+        members: address[MEMBERS],
+        equities: uint256[MEMBERS],
+        vendors: address[VENDORS],
+        fees: uint256[VENDORS],
+        owner: address,
+    ):
+    """
+    Configures a minimal proxy of this contract, see UnitFactory. Runs the
+    same validation as the constructor, which already initialized any
+    contract deployed directly.
+    """
+    # Equities always sum SHARES once configured
+    assert self.packed_equities == 0, 'Already initialized'
+
+    self.start_timestamp = start_timestamp
+
+    self.owner = owner
+
+    self.members = members
+    self.packed_equities = self._pack_equities(members, equities)
+
+    self.vendors = vendors
+    self.packed_fees = self._pack_fees(vendors, fees)
+
+    self.token = ERC20(token_contract)
+
+    success: bool = False
+    response: Bytes[32] = b""
+
+    success, response = raw_call(
+        token_contract,
+        _abi_encode(TRANSFER_BATCH_INTERFACE_ID, method_id=method_id("supportsInterface(bytes4)")),
+        max_outsize=32,
+        is_static_call=True,
+        revert_on_failure=False,
+    )
+
+    if success and len(response) == 32 and convert(response, uint256) == 1:
+        self.flags = BATCH_TRANSFERS
+
+@external
+@view
+def equities(ix: uint256) -> uint256:
+    assert ix < convert(MEMBERS, uint256) # dev: Index out of range
+
+    return bitwise_and(shift(self.packed_equities, -convert(ix, int128) * EQUITY_BITS), EQUITY_MASK)
+
+@external
+@view
+def fees(ix: uint256) -> uint256:
+    assert ix < convert(VENDORS, uint256) # dev: Index out of range
+
+    return bitwise_and(shift(self.packed_fees, -convert(ix, int128) * FEE_BITS), FEE_MASK)
+
+@external
+@view
+def batch_transfers() -> bool:
+    return bitwise_and(self.flags, BATCH_TRANSFERS) != 0
+
+@external
+@view
+def compact_events() -> bool:
+    return bitwise_and(self.flags, COMPACT_EVENTS) != 0
+
+@external
+@view
+def arrears_mode() -> bool:
+    return bitwise_and(self.packed_fees, ARREARS_MODE) != 0
+
 @internal
 @view
 def _pending_distributions() -> uint256:
@@ -81,48 +310,324 @@ def pending_distributions() -> uint256:
     return self._pending_distributions()
 
 @external
-def distribute():
-    token_balance: uint256 = self.token.balanceOf(self)
+@view
+def snapshot() -> Snapshot:
+    """
+    Returns the whole configuration and state in a single call, pending
+    distributions are 0 until the start date.
+    """
+    pending_distributions: uint256 = 0
 
-    assert token_balance > DISTRIBUTION_THRESHOLD, 'Balance below the distribution threshold'
+    if block.timestamp > self.start_timestamp:
+        pending_distributions = self._pending_distributions()
+
+    equities: uint256[MEMBERS] = empty(uint256[MEMBERS])
+    packed_equities: uint256 = self.packed_equities
+
+    for ix in range(MEMBERS):
+        equities[ix] = bitwise_and(packed_equities, EQUITY_MASK)
+        packed_equities = shift(packed_equities, -EQUITY_BITS)
+
+    fees: uint256[VENDORS] = empty(uint256[VENDORS])
+    packed_fees: uint256 = self.packed_fees
+
+    for ix in range(VENDORS):
+        fees[ix] = bitwise_and(packed_fees, FEE_MASK)
+        packed_fees = shift(packed_fees, -FEE_BITS)
+
+    return Snapshot({
+        owner: self.owner,
+        start_timestamp: self.start_timestamp,
+        distributions_counter: self.distributions_counter,
+        pending_distributions: pending_distributions,
+        members: self.members,
+        equities: equities,
+        vendors: self.vendors,
+        fees: fees,
+        token: self.token.address,
+        token_balance: self.token.balanceOf(self),
+    })
+
+@external
+@view
+def received_totals() -> (uint256[MEMBERS], uint256[VENDORS]):
+    """
+    Returns the primary token received so far by every current member and
+    vendor, in slot order. Empty slots are 0.
+    """
+    members: uint256[MEMBERS] = empty(uint256[MEMBERS])
+    vendors: uint256[VENDORS] = empty(uint256[VENDORS])
+
+    for ix in range(MEMBERS):
+        members[ix] = self.received[self.members[ix]]
+
+    for ix in range(VENDORS):
+        vendors[ix] = self.received[self.vendors[ix]]
+
+    return members, vendors
 
+@internal
+@view
+def _vendor_payments(token_balance: uint256, pending_distributions: uint256) -> (uint256[VENDORS], uint256[VENDORS], bool):
+    """
+    Returns what each vendor is paid out of `token_balance` for the pending
+    months, the arrears left afterwards and whether the balance covers the
+    fees. In arrears mode vendors get their arrears first and then the fees,
+    in slot order, as far as the balance allows.
+    """
+    amounts: uint256[VENDORS] = empty(uint256[VENDORS])
+    arrears: uint256[VENDORS] = empty(uint256[VENDORS])
+
+    fees: uint256 = self.packed_fees
+
+    arrears_mode: bool = bitwise_and(fees, ARREARS_MODE) != 0
+
+    # Arrears are paid even without pending months
+    if pending_distributions == 0 and not arrears_mode:
+        return amounts, arrears, True
+
+    # Check if there are enough tokens for vendors
+    vendors_total: uint256 = 0
+
+    for ix in range(VENDORS):
+        amounts[ix] = bitwise_and(fees, FEE_MASK) * pending_distributions
+        vendors_total += amounts[ix]
+
+        fees = shift(fees, -FEE_BITS)
+
+    if not arrears_mode:
+        return amounts, arrears, token_balance >= vendors_total
+
+    due: uint256[VENDORS] = amounts
+    arrears = self.arrears
+
+    available: uint256 = token_balance
+
+    for ix in range(VENDORS):
+        amounts[ix] = min(arrears[ix], available)
+        available -= amounts[ix]
+
+    for ix in range(VENDORS):
+        amount: uint256 = min(due[ix], available)
+        available -= amount
+
+        amounts[ix] += amount
+        arrears[ix] = arrears[ix] + due[ix] - amounts[ix]
+
+    return amounts, arrears, True
+
+@internal
+def _vendors_due(token_balance: uint256) -> (uint256[VENDORS], uint256):
+    """
+    Returns what each vendor is paid for the pending months, in the primary
+    token, and the number of months, which are marked as distributed. See
+    _vendor_payments().
+    """
     pending_distributions: uint256 = self._pending_distributions()
 
-    if pending_distributions > 0:
-        # Check if there are enough tokens for vendors
-        vendors_total: uint256 = 0
+    amounts: uint256[VENDORS] = empty(uint256[VENDORS])
+    arrears: uint256[VENDORS] = empty(uint256[VENDORS])
+    covered: bool = False
+
+    amounts, arrears, covered = self._vendor_payments(token_balance, pending_distributions)
 
-        for fee in self.fees:
-            vendors_total += fee * pending_distributions
+    assert covered, 'Insufficient balance to pay vendors'
 
-        assert token_balance >= vendors_total, 'Insufficient balance to pay vendors'
+    if bitwise_and(self.packed_fees, ARREARS_MODE) != 0:
+        for ix in range(VENDORS):
+            if self.arrears[ix] != arrears[ix]:
+                self.arrears[ix] = arrears[ix]
 
-        # Update the distributions count
+    # Update the distributions count
+    if pending_distributions > 0:
         self.distributions_counter += pending_distributions
 
-        # Pay vendors
-        for ix in range(VENDORS):
-            vendor: address = self.vendors[ix]
-            amount: uint256 = self.fees[ix] * pending_distributions
+    return amounts, pending_distributions
 
-            if amount > 0:
-                self.token.transfer(vendor, amount)
+@internal
+@view
+def _payouts(token_balance: uint256, vendor_amounts: uint256[VENDORS]) -> (DynArray[address, RECIPIENTS], DynArray[uint256, RECIPIENTS]):
+    """
+    Returns the receivers and amounts paying `vendor_amounts` out of
+    `token_balance` and splitting the rest among members by equity, in
+    transfer order.
+    """
+    receivers: DynArray[address, RECIPIENTS] = []
+    amounts: DynArray[uint256, RECIPIENTS] = []
+
+    remaining: uint256 = token_balance
+
+    # Vendors first, empty slots have a zero fee and are skipped
+    for ix in range(VENDORS):
+        amount: uint256 = vendor_amounts[ix]
+
+        if amount > 0:
+            remaining -= amount
 
-                log Distribution(vendor, amount)
+            receivers.append(self.vendors[ix])
+            amounts.append(amount)
 
-        token_balance -= vendors_total
+    # Members, empty slots have a zero equity and are skipped
+    equities: uint256 = self.packed_equities
 
-    # Pay members
     for ix in range(MEMBERS):
-        member: address = self.members[ix]
-        equity: uint256 = self.equities[ix]
+        equity: uint256 = bitwise_and(equities, EQUITY_MASK)
 
-        amount: uint256 = token_balance * equity / SHARES
+        equities = shift(equities, -EQUITY_BITS)
+
+        if equity == 0:
+            continue
+
+        amount: uint256 = remaining * equity / SHARES
 
         if amount > 0:
-            self.token.transfer(member, amount)
+            receivers.append(self.members[ix])
+            amounts.append(amount)
+
+    return receivers, amounts
+
+@internal
+def _transfer(token: address, primary: bool, receiver: address, amount: uint256, compact: bool):
+    ERC20(token).transfer(receiver, amount)
+
+    if compact:
+        return
+
+    if primary:
+        log Distribution(receiver, amount)
+    else:
+        log TokenDistribution(token, receiver, amount)
+
+@internal
+def _distribute(token: address, token_balance: uint256, vendor_amounts: uint256[VENDORS], months: uint256, flags: uint256):
+    """
+    Pays `vendor_amounts` out of `token_balance` of `token` and splits the
+    rest among members by equity. With BATCH_TRANSFERS in `flags` every
+    recipient is paid through a single transfer_batch() call, with
+    COMPACT_EVENTS the payouts are logged as a single round.
+    """
+    primary: bool = token == self.token.address
+
+    batch: bool = bitwise_and(flags, BATCH_TRANSFERS) != 0
+    compact: bool = bitwise_and(flags, COMPACT_EVENTS) != 0
+
+    receivers: DynArray[address, RECIPIENTS] = []
+    amounts: DynArray[uint256, RECIPIENTS] = []
+
+    receivers, amounts = self._payouts(token_balance, vendor_amounts)
+
+    for ix in range(RECIPIENTS):
+        if ix >= len(receivers):
+            break
+
+        if primary:
+            self.received[receivers[ix]] += amounts[ix]
+
+        if not batch:
+            self._transfer(token, primary, receivers[ix], amounts[ix], compact)
+
+    # Only the primary token is batched
+    if batch:
+        BatchToken(token).transfer_batch(receivers, amounts)
+
+        if not compact:
+            for ix in range(RECIPIENTS):
+                if ix >= len(receivers):
+                    break
+
+                log Distribution(receivers[ix], amounts[ix])
+
+    if compact:
+        if primary:
+            log DistributionRound(months, self.distributions_counter, receivers, amounts)
+        else:
+            log TokenDistributionRound(token, receivers, amounts)
+
+@external
+def distribute():
+    token_balance: uint256 = self.token.balanceOf(self)
+
+    assert token_balance > DISTRIBUTION_THRESHOLD, 'Balance below the distribution threshold'
+
+    vendor_amounts: uint256[VENDORS] = empty(uint256[VENDORS])
+    months: uint256 = 0
+
+    vendor_amounts, months = self._vendors_due(token_balance)
+
+    self._distribute(self.token.address, token_balance, vendor_amounts, months, self.flags)
+
+@external
+@view
+def preview_distribution() -> Preview:
+    """
+    Returns what distribute() would transfer at the current block, in the
+    order of the Distribution logs, computed by the same internal functions.
+    The status tells which check it would fail instead, without transfers.
+    """
+    preview: Preview = Preview({status: DISTRIBUTABLE, receivers: [], amounts: []})
+
+    token_balance: uint256 = self.token.balanceOf(self)
+
+    if token_balance <= DISTRIBUTION_THRESHOLD:
+        preview.status = BELOW_THRESHOLD
+        return preview
+
+    if block.timestamp <= self.start_timestamp:
+        preview.status = NOT_STARTED
+        return preview
+
+    vendor_amounts: uint256[VENDORS] = empty(uint256[VENDORS])
+    arrears: uint256[VENDORS] = empty(uint256[VENDORS])
+    covered: bool = False
+
+    vendor_amounts, arrears, covered = self._vendor_payments(token_balance, self._pending_distributions())
+
+    if not covered:
+        preview.status = INSUFFICIENT_FOR_VENDORS
+        return preview
+
+    preview.receivers, preview.amounts = self._payouts(token_balance, vendor_amounts)
+
+    return preview
+
+@external
+@nonreentrant('distribute_many')
+def distribute_many(tokens: DynArray[address, TOKENS]):
+    """
+    Distributes the primary token as distribute() does, then splits the balance
+    of every accepted token in `tokens` among members. Tokens below their
+    threshold are skipped, vendors are only paid along with the primary token.
+    """
+    distributed: bool = False
+
+    flags: uint256 = self.flags
+
+    token_balance: uint256 = self.token.balanceOf(self)
+
+    if token_balance > DISTRIBUTION_THRESHOLD:
+        vendor_amounts: uint256[VENDORS] = empty(uint256[VENDORS])
+        months: uint256 = 0
+
+        vendor_amounts, months = self._vendors_due(token_balance)
+
+        self._distribute(self.token.address, token_balance, vendor_amounts, months, flags)
 
-            log Distribution(member, amount)
+        distributed = True
+
+    for token in tokens:
+        threshold: uint256 = self.thresholds[token]
+
+        assert threshold > 0, 'Token not accepted'
+
+        token_balance = ERC20(token).balanceOf(self)
+
+        if token_balance > threshold:
+            # Only the primary token is batched
+            self._distribute(token, token_balance, empty(uint256[VENDORS]), 0, bitwise_and(flags, COMPACT_EVENTS))
+
+            distributed = True
+
+    assert distributed, 'Balance below the distribution threshold'
 
 @external
 def change_owner(new_owner: address):
@@ -130,25 +635,88 @@ def change_owner(new_owner: address):
 
     self.owner = new_owner
 
+    log ConfigurationChanged(new_owner)
+
 @external
-def change_members_and_equities(members: address[MEMBERS], equities: uint256[MEMBERS]):
+def change_compact_events(enabled: bool):
+    """
+    Compact events log every distribution as a single DistributionRound or
+    TokenDistributionRound instead of one event per receiver.
+    """
     assert msg.sender == self.owner # dev: Caller is not the owner
 
-    assert self._pending_distributions() == 0, 'There are pending distributions'
+    if enabled:
+        self.flags = bitwise_or(self.flags, COMPACT_EVENTS)
+    else:
+        self.flags = bitwise_and(self.flags, BATCH_TRANSFERS)
 
-    sum: uint256 = 0
+@external
+def change_threshold(token: address, threshold: uint256):
+    assert msg.sender == self.owner # dev: Caller is not the owner
 
-    for ix in range(MEMBERS):
-        assert (members[ix] == ZERO_ADDRESS and equities[ix] == 0)  \
-            or (members[ix] != ZERO_ADDRESS and equities[ix]  > 0), \
-            'Only zero address can have zero equity'
+    assert token != self.token.address, 'Primary token threshold is fixed'
 
-        sum += equities[ix]
+    current: uint256 = self.thresholds[token]
 
-    assert sum == SHARES, 'Equities sum not equals total shares'
+    if current == 0 and threshold > 0:
+        assert self.accepted_tokens < TOKENS, 'Too many accepted tokens'
+
+        self.accepted_tokens += 1
+    elif current > 0 and threshold == 0:
+        self.accepted_tokens -= 1
+
+    self.thresholds[token] = threshold
+
+@internal
+@view
+def _pack_vendor_fees(vendors: address[VENDORS], fees: uint256[VENDORS]) -> uint256:
+    """
+    Validates new vendors and fees, returns the packed fees keeping the
+    arrears mode. A vendor with arrears can change its fee but not leave its
+    slot until the arrears are paid.
+    """
+    packed_fees: uint256 = self._pack_fees(vendors, fees)
+
+    if bitwise_and(self.packed_fees, ARREARS_MODE) == 0:
+        return packed_fees
+
+    for ix in range(VENDORS):
+        if self.arrears[ix] > 0:
+            assert vendors[ix] == self.vendors[ix], 'Vendor has arrears'
+
+    return bitwise_or(packed_fees, ARREARS_MODE)
+
+@external
+def change_arrears_mode(enabled: bool):
+    """
+    In arrears mode distribute() pays vendors what the balance covers instead
+    of reverting, records the rest as arrears and pays them first later on.
+    It can only be disabled once the arrears are paid.
+    """
+    assert msg.sender == self.owner # dev: Caller is not the owner
+
+    if enabled:
+        self.packed_fees = bitwise_or(self.packed_fees, ARREARS_MODE)
+    else:
+        for ix in range(VENDORS):
+            assert self.arrears[ix] == 0, 'Vendors have arrears'
+
+        self.packed_fees = bitwise_and(self.packed_fees, ARREARS_MODE - 1)
+
+    log ConfigurationChanged(msg.sender)
+
+@external
+def change_members_and_equities(members: address[MEMBERS], equities: uint256[MEMBERS]):
+    assert msg.sender == self.owner # dev: Caller is not the owner
+
+    assert self._pending_distributions() == 0, 'There are pending distributions'
+
+    packed_equities: uint256 = self._pack_equities(members, equities)
 
     self.members = members
-    self.equities = equities
+    self.packed_equities = packed_equities
+
+    log ConfigurationChanged(msg.sender)
 
 @external
 def change_vendors_and_fees(vendors: address[VENDORS], fees: uint256[VENDORS]):
@@ -156,23 +724,91 @@ def change_vendors_and_fees(vendors: address[VENDORS], fees: uint256[VENDORS]):
 
     assert self._pending_distributions() == 0, 'There are pending distributions'
 
-    for ix in range(VENDORS):
-        assert (vendors[ix] == ZERO_ADDRESS and fees[ix] == 0)  \
-            or (vendors[ix] != ZERO_ADDRESS and fees[ix]  > 0), \
-            'Only zero address can have zero fee'
+    packed_fees: uint256 = self._pack_vendor_fees(vendors, fees)
 
     self.vendors = vendors
-    self.fees = fees
+    self.packed_fees = packed_fees
+
+    log ConfigurationChanged(msg.sender)
 
 @external
-def shutdown():
+def reconfigure(
+        members: address[MEMBERS],
+        equities: uint256[MEMBERS],
+        vendors: address[VENDORS],
+        fees: uint256[VENDORS],
+    ):
+    """
+    Replaces members, equities, vendors and fees in a single call. The whole
+    configuration is validated first, then only the slots whose value
+    changes are written.
+    """
     assert msg.sender == self.owner # dev: Caller is not the owner
 
-    # Return remaining tokens
+    assert self._pending_distributions() == 0, 'There are pending distributions'
+
+    packed_equities: uint256 = self._pack_equities(members, equities)
+    packed_fees: uint256 = self._pack_vendor_fees(vendors, fees)
+
+    for ix in range(MEMBERS):
+        if self.members[ix] != members[ix]:
+            self.members[ix] = members[ix]
+
+    if self.packed_equities != packed_equities:
+        self.packed_equities = packed_equities
+
+    for ix in range(VENDORS):
+        if self.vendors[ix] != vendors[ix]:
+            self.vendors[ix] = vendors[ix]
+
+    if self.packed_fees != packed_fees:
+        self.packed_fees = packed_fees
+
+    log ConfigurationChanged(msg.sender)
+
+@external
+def shutdown(tokens: DynArray[address, TOKENS] = []):
+    """
+    Returns the primary token and every accepted token to the owner and
+    destroys the unit. `tokens` must list each accepted token once, so none
+    is left behind. Vendor arrears are paid first, as far as the primary
+    token balance goes.
+    """
+    assert msg.sender == self.owner # dev: Caller is not the owner
+
+    assert len(tokens) == self.accepted_tokens, 'Accepted tokens missing'
+
     token_balance: uint256 = self.token.balanceOf(self)
 
+    if bitwise_and(self.packed_fees, ARREARS_MODE) != 0:
+        for ix in range(VENDORS):
+            amount: uint256 = min(self.arrears[ix], token_balance)
+
+            if amount > 0:
+                self._transfer(self.token.address, True, self.vendors[ix], amount, False)
+
+                token_balance -= amount
+
+    # Return remaining tokens
     if token_balance > 0:
         self.token.transfer(self.owner, token_balance)
 
+    for ix in range(TOKENS):
+        if ix >= len(tokens):
+            break
+
+        assert self.thresholds[tokens[ix]] > 0, 'Token not accepted'
+
+        for jx in range(TOKENS):
+            if jx >= ix:
+                break
+
+            assert tokens[jx] != tokens[ix], 'Duplicate token'
+
+        token_balance = ERC20(tokens[ix]).balanceOf(self)
+
+        if token_balance > 0:
+            ERC20(tokens[ix]).transfer(self.owner, token_balance)
+
     # Return Ether and destroy
     selfdestruct(self.owner)
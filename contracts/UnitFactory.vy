@@ -0,0 +1,52 @@
+# @version ^0.3.3
+
+MEMBERS: constant(uint8) = 7
+VENDORS: constant(uint8) = 3
+
+interface Unit:
+    def owner() -> address: view
+    def initialize(
+        start_timestamp: uint256,
+        token_contract: address,
+        members: address[MEMBERS],
+        equities: uint256[MEMBERS],
+        vendors: address[VENDORS],
+        fees: uint256[VENDORS],
+        owner: address,
+    ): nonpayable
+
+# Unit every proxy delegates to
+template: public(address)
+
+event UnitCreated:
+    unit: indexed(address)
+    owner: indexed(address)
+
+@external
+def __init__(template: address):
+    # An owner could shutdown() the template and break every proxy
+    assert Unit(template).owner() == ZERO_ADDRESS, 'Template has an owner'
+
+    self.template = template
+
+@external
+def create_unit(
+        start_timestamp: uint256,
+        token_contract: address,
+        members: address[MEMBERS],
+        equities: uint256[MEMBERS],
+        vendors: address[VENDORS],
+        fees: uint256[VENDORS],
+        owner: address,
+    ) -> address:
+    """
+    Deploys an EIP-1167 minimal proxy of the template and initializes it in
+    the same transaction, so nobody else can configure it first.
+    """
+    unit: address = create_forwarder_to(self.template)
+
+    Unit(unit).initialize(start_timestamp, token_contract, members, equities, vendors, fees, owner)
+
+    log UnitCreated(unit, owner)
+
+    return unit
@@ -0,0 +1,330 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from brownie import Token, Unit, accounts, chain, web3
+from eth_account import Account
+from web3.exceptions import TransactionNotFound
+
+## Pipelined sender for bulk Unit administration
+#
+# Transactions from one account are signed locally with sequential nonces
+# and broadcast without waiting for receipts. poll() then follows all of
+# them concurrently: a transaction is done once it is SENDER_CONFIRMATIONS
+# blocks deep on the canonical chain. Transactions the node lost (a failed
+# broadcast, a dropped or reorged out transaction, the gap that blocks
+# every later nonce) are broadcast again, transactions pending for more
+# than SENDER_STUCK_AFTER seconds are replaced with 12.5% higher fees, up
+# to SENDER_MAX_FEE_GWEI. Chains without a base fee (before London, like
+# the istanbul development chain) get legacy transactions with a gas price.
+#
+# main() times administrative transactions sent the brownie way, one
+# receipt at a time, against the pipeline.
+
+CONFIRMATIONS = int(os.environ.get('SENDER_CONFIRMATIONS', '1'))
+
+STUCK_AFTER = float(os.environ.get('SENDER_STUCK_AFTER', '60'))
+
+MAX_FEE = int(float(os.environ.get('SENDER_MAX_FEE_GWEI', '200')) * 10**9)
+
+# Seconds between polls while waiting
+POLL_INTERVAL = float(os.environ.get('SENDER_POLL_INTERVAL', '0.05'))
+
+# Concurrent receipt requests
+CONCURRENCY = int(os.environ.get('SENDER_CONCURRENCY', '16'))
+
+# Transactions of the benchmark, spread over distribute(),
+# change_members_and_equities() and change_vendors_and_fees() of many units
+BENCHMARK = int(os.environ.get('SENDER_BENCHMARK', '100'))
+
+# Geth requires a 10% bump on both fee fields, or on the legacy gas price,
+# to replace a transaction
+BUMP_NUMERATOR = 9
+BUMP_DENOMINATOR = 8
+
+MONTH_TIMEDELTA = 2629800
+DAY = 86400
+
+ZERO = '0x0000000000000000000000000000000000000000'
+
+def ether(value):
+    return value * 10**18
+
+def bump(value):
+    return -(-value * BUMP_NUMERATOR // BUMP_DENOMINATOR)
+
+class Transaction:
+    def __init__(self, fields):
+        self.fields = fields
+        self.nonce = fields['nonce']
+
+        # Signed raw transactions and their hashes, the original first and
+        # then every replacement, any of them may be the one mined
+        self.raw = []
+        self.hashes = []
+
+        self.sent = None
+        self.receipt = None
+        self.confirmed = False
+
+class PipelinedSender:
+    def __init__(self, account, confirmations=CONFIRMATIONS, stuck_after=STUCK_AFTER, max_fee=MAX_FEE):
+        self.account = account
+        self.confirmations = confirmations
+        self.stuck_after = stuck_after
+        self.max_fee = max_fee
+
+        self.chain_id = web3.eth.chain_id
+        self.nonce = web3.eth.get_transaction_count(account.address, 'pending')
+
+        self.transactions = []
+        self.fees = self._fees()
+
+        self.rebroadcasts = 0
+        self.replacements = 0
+
+    def _fees(self):
+        '''
+        Returns (max fee, priority fee), twice the base fee leaves room for
+        six full blocks in a row. Without a base fee the max fee is the
+        legacy gas price and the priority fee is None
+        '''
+        base = web3.eth.get_block('latest').get('baseFeePerGas')
+
+        if base is None:
+            return min(self.max_fee, web3.eth.gas_price), None
+
+        tip = web3.eth.max_priority_fee
+
+        return min(self.max_fee, 2 * base + tip), min(self.max_fee, tip)
+
+    def _sign(self, tx, max_fee, tip):
+        if tip is None:
+            tx.fields['gasPrice'] = max_fee
+        else:
+            tx.fields.update({'type': 2, 'maxFeePerGas': max_fee, 'maxPriorityFeePerGas': tip})
+
+        signed = self.account.sign_transaction(tx.fields)
+
+        tx.raw.append(getattr(signed, 'raw_transaction', None) or signed.rawTransaction)
+        tx.hashes.append(signed.hash)
+
+    def _broadcast(self, tx):
+        tx.sent = time.monotonic()
+
+        try:
+            web3.eth.send_raw_transaction(tx.raw[-1])
+        except (ValueError, OSError):
+            # Lost, poll() broadcasts it again
+            pass
+
+    def submit(self, to, data, gas):
+        '''
+        Signs and broadcasts a transaction with the next nonce, returns
+        without waiting for it
+        '''
+        tx = Transaction({
+            'chainId': self.chain_id,
+            'nonce': self.nonce,
+            'to': to,
+            'data': data,
+            'value': 0,
+            'gas': gas,
+        })
+
+        self._sign(tx, *self.fees)
+        self._broadcast(tx)
+
+        self.transactions.append(tx)
+        self.nonce += 1
+
+        return tx
+
+    def _receipt(self, tx):
+        '''
+        Returns the receipt of whichever version of `tx` was mined, None
+        while none is or when its block was replaced by a reorg
+        '''
+        for tx_hash in reversed(tx.hashes):
+            try:
+                receipt = web3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+
+            if web3.eth.get_block(receipt['blockNumber'])['hash'] != receipt['blockHash']:
+                return None
+
+            return receipt
+
+        return None
+
+    def _known(self, *hashes):
+        '''
+        Whether the node has any of `hashes`, pending or mined
+        '''
+        for tx_hash in hashes:
+            try:
+                web3.eth.get_transaction(tx_hash)
+            except TransactionNotFound:
+                continue
+
+            return True
+
+        return False
+
+    def poll(self):
+        '''
+        Follows every outstanding transaction once, returns how many are not
+        confirmed yet
+        '''
+        outstanding = [tx for tx in self.transactions if not tx.confirmed]
+
+        if not outstanding:
+            return 0
+
+        # Nonces below it are used, read before the receipts so a
+        # transaction mined in between has its receipt
+        used = web3.eth.get_transaction_count(self.account.address)
+        head = web3.eth.block_number
+
+        self.fees = self._fees()
+
+        with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+            receipts = list(executor.map(self._receipt, outstanding))
+
+        for tx, receipt in zip(outstanding, receipts):
+            tx.receipt = receipt
+
+            if receipt is not None:
+                tx.confirmed = head - receipt['blockNumber'] + 1 >= self.confirmations
+                continue
+
+            if tx.nonce < used:
+                # During a reorg the nonce can count a version of `tx` whose
+                # receipt is not on the canonical chain yet
+                if self._known(*tx.hashes):
+                    continue
+
+                raise RuntimeError(f'Nonce {tx.nonce} was used by a transaction not sent from here')
+
+            if not self._known(tx.hashes[-1]):
+                # Dropped or reorged out, later nonces wait for it
+                self.rebroadcasts += 1
+                self._broadcast(tx)
+
+            elif time.monotonic() - tx.sent > self.stuck_after:
+                if 'gasPrice' in tx.fields:
+                    max_fee, tip = max(bump(tx.fields['gasPrice']), self.fees[0]), None
+                else:
+                    max_fee, tip = tx.fields['maxFeePerGas'], tx.fields['maxPriorityFeePerGas']
+
+                    max_fee, tip = max(bump(max_fee), self.fees[0]), min(max(bump(tip), self.fees[1]), max_fee)
+
+                if max_fee <= self.max_fee:
+                    self.replacements += 1
+                    self._sign(tx, max_fee, tip)
+                    self._broadcast(tx)
+
+        return sum(not tx.confirmed for tx in self.transactions)
+
+    def wait(self, timeout=600):
+        '''
+        Polls until every transaction is confirmed, returns the receipts in
+        submission order
+        '''
+        deadline = time.monotonic() + timeout
+
+        while self.poll():
+            if time.monotonic() > deadline:
+                raise TimeoutError(f'{sum(not tx.confirmed for tx in self.transactions)} transactions not confirmed')
+
+            time.sleep(POLL_INTERVAL)
+
+        return [tx.receipt for tx in self.transactions]
+
+def administration(units, count):
+    '''
+    Returns `count` (unit, function name, args) calls, each unit gets a
+    distribution and then new members and vendors
+    '''
+    members = [accounts[3], accounts[4], ZERO, ZERO, ZERO, ZERO, ZERO]
+    equities = [5000, 5000, 0, 0, 0, 0, 0]
+    vendors = [accounts[6], ZERO, ZERO]
+    fees = [ether(200), 0, 0]
+
+    calls = [
+        call
+        for unit in units
+        for call in [
+            (unit, 'distribute', []),
+            (unit, 'change_members_and_equities', [members, equities]),
+            (unit, 'change_vendors_and_fees', [vendors, fees]),
+        ]
+    ]
+
+    return calls[:count]
+
+def deploy_units(token, count, owner):
+    units = []
+
+    for _ in range(count):
+        unit = Unit.deploy(
+            chain.time() - MONTH_TIMEDELTA - DAY,
+            token,
+            [accounts[3], accounts[4], accounts[5], ZERO, ZERO, ZERO, ZERO],
+            [       5000,        3000,        2000,    0,    0,    0,    0],
+            [ accounts[6], ZERO, ZERO],
+            [  ether(150),    0,    0],
+            {'from': owner}
+        )
+
+        token.transfer(unit, ether(10_000), {'from': owner})
+
+        units.append(unit)
+
+    return units
+
+def main():
+    # A local key, the pipeline signs itself
+    key = Account.create()
+    admin = accounts.add(key.key.hex())
+
+    accounts[0].transfer(admin, ether(50))
+
+    token = Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': admin})
+
+    units = -(-BENCHMARK // 3)
+
+    serial_units = deploy_units(token, units, admin)
+    pipelined_units = deploy_units(token, units, admin)
+
+    # Enough for any of the calls, gas is not estimated ahead of the
+    # distribution the member changes depend on
+    gas = 600_000
+
+    started = time.perf_counter()
+
+    for unit, name, args in administration(serial_units, BENCHMARK):
+        getattr(unit, name)(*args, {'from': admin, 'gas_limit': gas})
+
+    serial = time.perf_counter() - started
+
+    started = time.perf_counter()
+
+    sender = PipelinedSender(key)
+
+    for unit, name, args in administration(pipelined_units, BENCHMARK):
+        sender.submit(unit.address, getattr(unit, name).encode_input(*args), gas)
+
+    receipts = sender.wait()
+
+    pipelined = time.perf_counter() - started
+
+    assert all(receipt['status'] == 1 for receipt in receipts)
+
+    for unit, name, _ in administration(pipelined_units, BENCHMARK):
+        if name == 'change_members_and_equities':
+            assert unit.equities(1) == 5000
+
+    print(f'{BENCHMARK} transactions: serial {serial:.2f}s, pipelined {pipelined:.2f}s ({serial / pipelined:.1f}x)')
+    print(f'{sender.rebroadcasts} broadcast again, {sender.replacements} replaced')
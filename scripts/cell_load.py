@@ -0,0 +1,196 @@
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from brownie import Cell, accounts, web3
+from eth_account import Account
+
+## Load test of Cell payments
+#
+# CELL_LOAD_PAYERS fresh accounts send CELL_LOAD_PAYMENTS payments in total
+# to a Cell, every payer from its own thread, waiting for each confirmation
+# before its next payment like a client would. Every configuration in
+# CELL_LOAD_CONFIGS gets its own Cell and the same payment schedule, and is
+# reported side by side: transactions per second, confirmation latency
+# percentiles, gas per payment and whether the members received exactly
+# their equity of everything paid.
+
+PAYMENTS = int(os.environ.get('CELL_LOAD_PAYMENTS', '2000'))
+
+PAYERS = int(os.environ.get('CELL_LOAD_PAYERS', '50'))
+
+CONFIGS = os.environ.get('CELL_LOAD_CONFIGS', 'eager,compact,accumulating,default').split(',')
+
+SEED = int(os.environ.get('CELL_LOAD_SEED', '0'))
+
+EQUITIES = [60, 20, 10, 10]
+
+# Payments are a random multiple of STEP up to MAX_STEPS, multiples of 100
+# wei so every split is exact and the expected amounts are known
+STEP = 10**13
+MAX_STEPS = 100
+
+# Covers a payment distributing to the 4 members
+GAS = 200_000
+
+# name -> (threshold, interval, compact_events, paid through pay())
+CONFIGURATIONS = {
+    'eager': (0, 0, False, True),
+    'compact': (0, 0, True, True),
+    # Fans out every ~100 payments
+    'accumulating': (50 * MAX_STEPS * STEP, 0, False, True),
+    # Plain transfers only log the payment, distributed once at the end
+    'default': (0, 0, False, False),
+}
+
+PERCENTILES = (50, 90, 99)
+
+def percentile(values, q):
+    '''
+    Nearest-rank percentile
+    '''
+    ordered = sorted(values)
+
+    return ordered[max(0, -(-len(ordered) * q // 100) - 1)]
+
+def schedule(rng, payments, payers):
+    '''
+    Returns the amounts every payer sends, in order
+    '''
+    amounts = [[] for _ in range(payers)]
+
+    for ix in range(payments):
+        amounts[ix % payers].append(rng.randint(1, MAX_STEPS) * STEP)
+
+    return amounts
+
+def fund(payers, amounts, configs, sender):
+    '''
+    Sends every payer what it pays in all the configurations plus the gas
+    '''
+    gas_price = web3.eth.gas_price
+
+    for payer, paid in zip(payers, amounts):
+        sender.transfer(payer.address, configs * (sum(paid) + len(paid) * GAS * gas_price))
+
+def _pay(cell, data, payer, amounts, chain_id, gas_price):
+    '''
+    Sends the payments of one payer one after the other, returns the
+    (latency, receipt) of each
+    '''
+    nonce = web3.eth.get_transaction_count(payer.address)
+    results = []
+
+    for amount in amounts:
+        signed = payer.sign_transaction({
+            'to': cell.address,
+            'value': amount,
+            'data': data,
+            'gas': GAS,
+            'gasPrice': gas_price,
+            'nonce': nonce,
+            'chainId': chain_id,
+        })
+
+        started = time.perf_counter()
+
+        tx_hash = web3.eth.send_raw_transaction(getattr(signed, 'raw_transaction', None) or signed.rawTransaction)
+        receipt = web3.eth.wait_for_transaction_receipt(tx_hash, timeout=600, poll_latency=0.005)
+
+        results.append((time.perf_counter() - started, receipt))
+        nonce += 1
+
+    return results
+
+def run_load(name, payers, amounts, members, deployer):
+    '''
+    Deploys a Cell with the `name` configuration, sends the payments of
+    every payer concurrently and returns the measurements
+    '''
+    threshold, interval, compact, pay = CONFIGURATIONS[name]
+
+    cell = Cell.deploy(6000, members, EQUITIES, threshold, interval, compact, {'from': deployer})
+
+    data = cell.pay.encode_input() if pay else '0x'
+    chain_id = web3.eth.chain_id
+    gas_price = web3.eth.gas_price
+
+    before = [web3.eth.get_balance(member) for member in members]
+
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=len(payers)) as executor:
+        futures = [
+            executor.submit(_pay, cell, data, payer, paid, chain_id, gas_price)
+            for payer, paid in zip(payers, amounts)
+        ]
+
+        results = [result for future in futures for result in future.result()]
+
+    elapsed = time.perf_counter() - started
+
+    # Whatever accumulated is distributed, so the members get everything
+    if cell.balance() > 0:
+        cell.distribute({'from': deployer})
+
+    total = sum(sum(paid) for paid in amounts)
+    received = [web3.eth.get_balance(member) - balance for member, balance in zip(members, before)]
+
+    latencies = [latency for latency, _ in results]
+    receipts = [receipt for _, receipt in results]
+
+    return {
+        'name': name,
+        'payments': len(results),
+        'seconds': elapsed,
+        'tps': len(results) / elapsed,
+        'latency': {q: percentile(latencies, q) for q in PERCENTILES + (100,)},
+        'gas': sum(receipt['gasUsed'] for receipt in receipts) / len(receipts),
+        # A payment logging more than its Payment also distributed
+        'distributions': sum(len(receipt['logs']) > 1 for receipt in receipts),
+        'received': received,
+        'correct': (
+            all(receipt['status'] == 1 for receipt in receipts)
+            and received == [total * equity // 100 for equity in EQUITIES]
+            and cell.balance() == 0
+        ),
+    }
+
+def table(results):
+    header = f'{"config":<14}{"payments":>9}{"tps":>8}' + ''.join(f'{f"p{q} ms":>9}' for q in PERCENTILES)
+    header += f'{"max ms":>9}{"gas/payment":>13}{"distributions":>15}  correct'
+
+    rows = [header]
+
+    for result in results:
+        latency = ''.join(f'{result["latency"][q] * 1000:>9.1f}' for q in PERCENTILES + (100,))
+
+        rows.append(
+            f'{result["name"]:<14}{result["payments"]:>9}{result["tps"]:>8.1f}{latency}'
+            f'{result["gas"]:>13,.0f}{result["distributions"]:>15}  {"yes" if result["correct"] else "NO"}'
+        )
+
+    return '\n'.join(rows)
+
+def main():
+    deployer = accounts[0]
+
+    rng = random.Random(SEED)
+
+    payers = [Account.create() for _ in range(PAYERS)]
+    members = [Account.create().address for _ in EQUITIES]
+
+    amounts = schedule(rng, PAYMENTS, PAYERS)
+
+    fund(payers, amounts, len(CONFIGS), deployer)
+
+    results = []
+
+    for name in CONFIGS:
+        results.append(run_load(name, payers, amounts, members, deployer))
+
+        print(f'{name}: {PAYMENTS} payments from {PAYERS} payers in {results[-1]["seconds"]:.2f}s')
+
+    print()
+    print(table(results))
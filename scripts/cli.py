@@ -0,0 +1,270 @@
+'''
+Standalone CLI for the production Unit.
+
+Does not load the brownie project: the ABI and bytecode come from the
+compiled artifacts in build/contracts (run `brownie compile` once), a single
+RPC connection and the decrypted signer are reused for every command of a
+session.
+
+    $ python scripts/cli.py status
+    $ python scripts/cli.py              # interactive session
+'''
+
+import time
+
+STARTED = time.perf_counter()
+
+import cmd
+import getpass
+import json
+import os
+import shlex
+import sys
+from decimal import Decimal
+
+from eth_account import Account
+from web3 import HTTPProvider, IPCProvider, Web3
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError
+
+# Datitos contract
+UNIT = os.environ.get('CLI_UNIT', '0x09364b188f062cce8dec8dd1022111aa643bf33a')
+
+# Dai, for contracts deployed before snapshot() exposed the token
+TOKEN = os.environ.get('CLI_TOKEN', '0x6B175474E89094C44Da98b954EedeAC495271d0F')
+
+RPC = os.environ.get('CLI_RPC', 'http://127.0.0.1:8545')
+
+ARTIFACTS = os.environ.get('CLI_ARTIFACTS', 'build/contracts')
+
+# Brownie keystore, or an address unlocked on the node (local chains)
+KEYSTORE = os.environ.get('CLI_KEYSTORE', os.path.expanduser('~/.brownie/accounts/test_account.json'))
+UNLOCKED = os.environ.get('CLI_UNLOCKED')
+
+MEMBERS = 7
+VENDORS = 3
+
+# Dai has 18 decimals
+DECIMALS = 18
+
+ZERO = '0x0000000000000000000000000000000000000000'
+
+BALANCE_OF_ABI = [{
+    'name': 'balanceOf',
+    'type': 'function',
+    'stateMutability': 'view',
+    'inputs': [{'name': 'account', 'type': 'address'}],
+    'outputs': [{'name': '', 'type': 'uint256'}],
+}]
+
+def load_artifact(name, path=ARTIFACTS):
+    with open(os.path.join(path, f'{name}.json')) as f:
+        artifact = json.load(f)
+
+    return artifact['abi'], artifact.get('deployedBytecode', '')
+
+def connect(uri=RPC):
+    '''
+    HTTP keeps the connection alive between requests, IPC for local nodes
+    '''
+    if uri.startswith('http'):
+        return Web3(HTTPProvider(uri))
+
+    return Web3(IPCProvider(uri))
+
+def tokens(value):
+    return int( Decimal(value) * 10**DECIMALS )
+
+def parse_pairs(args, size, amount):
+    '''
+    Parses `address:value` arguments padding with zero slots up to `size`
+    '''
+    if len(args) > size:
+        raise ValueError(f'At most {size} entries')
+
+    addresses, values = [], []
+
+    for arg in args:
+        address, value = arg.split(':')
+        addresses.append(Web3.to_checksum_address(address))
+        values.append(amount(value))
+
+    padding = size - len(args)
+
+    return addresses + [ZERO] * padding, values + [0] * padding
+
+class Signer:
+    '''
+    Signs locally with a keystore decrypted once, or sends through the node
+    when `unlocked` is an address the node manages.
+    '''
+    def __init__(self, web3, keystore=KEYSTORE, unlocked=UNLOCKED):
+        self.web3 = web3
+
+        if unlocked:
+            self.account = None
+            self.address = Web3.to_checksum_address(unlocked)
+        else:
+            with open(keystore) as f:
+                encrypted = json.load(f)
+
+            self.account = Account.from_key(Account.decrypt(encrypted, getpass.getpass('Keystore password: ')))
+            self.address = self.account.address
+
+    def send(self, function):
+        tx = function.build_transaction({
+            'from': self.address,
+            'nonce': self.web3.eth.get_transaction_count(self.address, 'pending'),
+        })
+
+        if self.account is None:
+            tx_hash = self.web3.eth.send_transaction(tx)
+        else:
+            signed = self.account.sign_transaction(tx)
+            raw = getattr(signed, 'raw_transaction', None) or signed.rawTransaction
+            tx_hash = self.web3.eth.send_raw_transaction(raw)
+
+        print(f'Sent {Web3.to_hex(tx_hash)}')
+
+        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+
+        if receipt['status'] != 1:
+            raise RuntimeError(f'Transaction reverted in block {receipt["blockNumber"]}')
+
+        print(f'Mined in block {receipt["blockNumber"]}, {receipt["gasUsed"]} gas')
+
+        return receipt
+
+class Session(cmd.Cmd):
+    intro = 'Unit CLI, type help or ? to list commands'
+    prompt = 'unit> '
+
+    def __init__(self, web3, address=UNIT, artifacts=ARTIFACTS, interactive=True):
+        super().__init__()
+
+        self.web3 = web3
+        self.interactive = interactive
+
+        abi, self.bytecode = load_artifact('Unit', artifacts)
+
+        self.unit = web3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+        self._signer = None
+
+    @property
+    def signer(self):
+        # Only commands that send transactions unlock the account
+        if self._signer is None:
+            self._signer = Signer(self.web3)
+
+        return self._signer
+
+    def onecmd(self, line):
+        # A failed command does not end an interactive session
+        try:
+            return super().onecmd(line)
+        except Exception as exc:
+            if not self.interactive:
+                raise
+
+            print(f'Error: {exc}')
+
+    def _state(self):
+        '''
+        Returns the snapshot() fields, read one by one from contracts
+        deployed before snapshot() was added
+        '''
+        try:
+            return self.unit.functions.snapshot().call()
+        except (BadFunctionCallOutput, ContractLogicError):
+            pass
+
+        view = self.unit.functions
+
+        try:
+            pending = view.pending_distributions().call()
+        except ContractLogicError:
+            # Start date is in the future
+            pending = 0
+
+        token = self.web3.eth.contract(address=Web3.to_checksum_address(TOKEN), abi=BALANCE_OF_ABI)
+
+        return (
+            view.owner().call(),
+            view.start_timestamp().call(),
+            view.distributions_counter().call(),
+            pending,
+            [view.members(ix).call() for ix in range(MEMBERS)],
+            [view.equities(ix).call() for ix in range(MEMBERS)],
+            [view.vendors(ix).call() for ix in range(VENDORS)],
+            [view.fees(ix).call() for ix in range(VENDORS)],
+            token.address,
+            token.functions.balanceOf(self.unit.address).call(),
+        )
+
+    def _pending(self):
+        return self._state()[3]
+
+    def do_status(self, arg):
+        'Prints the whole contract configuration: status'
+        (owner, start, counter, pending, members, equities,
+         vendors, fees, token, balance) = self._state()
+
+        deployed = self.web3.eth.get_code(self.unit.address).hex()
+
+        print(f'Owner:     {owner}')
+        print(f'Start:     {time.strftime("%Y-%m-%d", time.gmtime(start))}')
+        print(f'Counter:   {counter} distributions, {pending} pending')
+        print(f'Token:     {token}')
+        print(f'Balance:   {Decimal(balance) / 10**DECIMALS}')
+
+        for member, equity in zip(members, equities):
+            if member != ZERO:
+                print(f'Member:    {member} {equity / 100:.2f}%')
+
+        for vendor, fee in zip(vendors, fees):
+            if vendor != ZERO:
+                print(f'Vendor:    {vendor} {Decimal(fee) / 10**DECIMALS}')
+
+        if self.bytecode and deployed.removeprefix('0x') != self.bytecode.removeprefix('0x'):
+            print('Warning:   deployed bytecode differs from the cached artifact')
+
+    def do_distribute(self, arg):
+        'Distributes the token balance: distribute'
+        self.signer.send(self.unit.functions.distribute())
+
+    def do_members(self, arg):
+        'Replaces members: members ADDRESS:EQUITY ... (equities sum 10000)'
+        members, equities = parse_pairs(shlex.split(arg), MEMBERS, int)
+
+        assert self._pending() == 0, 'Distribute the pending months first'
+
+        self.signer.send(self.unit.functions.change_members_and_equities(members, equities))
+
+    def do_vendors(self, arg):
+        'Replaces vendors: vendors ADDRESS:FEE ... (fees in tokens, e.g. 150)'
+        vendors, fees = parse_pairs(shlex.split(arg), VENDORS, tokens)
+
+        assert self._pending() == 0, 'Distribute the pending months first'
+
+        self.signer.send(self.unit.functions.change_vendors_and_fees(vendors, fees))
+
+    def do_exit(self, arg):
+        'Leaves the session: exit'
+        return True
+
+    do_EOF = do_exit
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    session = Session(connect(), interactive=not argv)
+
+    if os.environ.get('CLI_TIMING'):
+        print(f'Ready in {time.perf_counter() - STARTED:.3f}s')
+
+    if argv:
+        session.onecmd(' '.join(shlex.quote(arg) for arg in argv))
+    else:
+        session.cmdloop()
+
+if __name__ == '__main__':
+    main()
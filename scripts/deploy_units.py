@@ -0,0 +1,126 @@
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+from brownie import Unit, UnitFactory, accounts, network
+
+## Batch deployment of Units as minimal proxies
+#
+# Every Unit in UNITS_CONFIG is created through UnitFactory, which deploys a
+# 45 byte EIP-1167 proxy of a single template instead of the whole bytecode.
+# All transactions are broadcast before waiting for the first receipt. The
+# created units are printed as keeper registry entries.
+
+MEMBERS = 7
+VENDORS = 3
+SHARES = 10000
+
+ZERO = '0x0000000000000000000000000000000000000000'
+
+# JSON list of units, see scripts/units.json
+CONFIG = os.environ.get('UNITS_CONFIG', 'scripts/units.json')
+
+# Existing factory, a template and a factory are deployed when empty
+FACTORY = os.environ.get('UNITS_FACTORY')
+
+def pad(entries, size):
+    '''
+    Splits {address: value} into two arrays padded with empty slots
+    '''
+    if len(entries) > size:
+        raise ValueError(f'At most {size} entries')
+
+    padding = size - len(entries)
+
+    return list(entries) + [ZERO] * padding, list(entries.values()) + [0] * padding
+
+def load_config(path, owner):
+    '''
+    Returns the UnitFactory.create_unit() arguments of every unit in `path`.
+
+    Entries look like {"start": "2022-05-01", "token": address, "members":
+    {address: equity}, "vendors": {address: fee}, "owner": address}, fees
+    are whole tokens of 18 decimals and the owner defaults to `owner`.
+    '''
+    with open(path) as f:
+        entries = json.load(f)
+
+    units = []
+
+    for entry in entries:
+        start = datetime.fromisoformat(entry['start']).replace(tzinfo=timezone.utc)
+
+        members, equities = pad(entry['members'], MEMBERS)
+        vendors, fees = pad({vendor: fee * 10**18 for vendor, fee in entry.get('vendors', {}).items()}, VENDORS)
+
+        units.append((
+            int(start.timestamp()),
+            entry['token'],
+            members,
+            equities,
+            vendors,
+            fees,
+            entry.get('owner', owner),
+        ))
+
+    return units
+
+def deploy_factory(sender):
+    '''
+    Deploys the template every proxy delegates to, without an owner so it
+    can never be shut down, and the factory using it
+    '''
+    template = Unit.deploy(
+        0,
+        ZERO,
+        [sender] + [ZERO] * (MEMBERS - 1),
+        [SHARES] + [0] * (MEMBERS - 1),
+        [ZERO] * VENDORS,
+        [0] * VENDORS,
+        {'from': sender}
+    )
+
+    template.change_owner(ZERO, {'from': sender})
+
+    return UnitFactory.deploy(template, {'from': sender})
+
+def create_units(factory, units, sender):
+    '''
+    Creates every unit, returns the receipts in order
+    '''
+    pending = [
+        factory.create_unit(*args, {'from': sender, 'required_confs': 0})
+        for args in units
+    ]
+
+    for tx in pending:
+        tx.wait(1)
+
+        if tx.status != 1:
+            raise RuntimeError(f'{tx.txid} reverted')
+
+    return pending
+
+def main():
+    if network.show_active() == 'development':
+        sender = accounts[0]
+    else:
+        sender = accounts.load('test_account')
+
+    units = load_config(CONFIG, sender.address)
+
+    factory = UnitFactory.at(FACTORY) if FACTORY else deploy_factory(sender)
+
+    started = time.perf_counter()
+    receipts = create_units(factory, units, sender)
+    elapsed = time.perf_counter() - started
+
+    gas_used = sum(tx.gas_used for tx in receipts)
+
+    print(f'{len(receipts)} units in {elapsed:.2f}s, {gas_used} gas ({gas_used // max(len(receipts), 1)} per unit)')
+
+    print(json.dumps([
+        {'unit': tx.events['UnitCreated']['unit'], 'token': args[1]}
+        for tx, args in zip(receipts, units)
+    ], indent=2))
@@ -0,0 +1,262 @@
+import os
+import time
+
+import numpy as np
+
+## Vectorised cash-flow simulator of Unit.distribute()
+#
+# Evaluates thousands of scenarios at once, one NumPy operation per month,
+# member and vendor. Amounts keep the exact integer semantics of the contract
+# (floor division by SHARES, fees times pending months, the distribution
+# threshold and the revert on insufficient balance).
+#
+# Token amounts do not fit in int64, so every amount is held as two int64
+# limbs (hi, lo) with value hi * BASE + lo and 0 <= lo < BASE. BASE is a
+# multiple of SHARES, which keeps the floor division exact limb by limb.
+
+MONTH_TIMEDELTA = 2629800
+DISTRIBUTION_THRESHOLD = 1_000_000_000_000_000_000
+
+MEMBERS = 7
+VENDORS = 3
+SHARES = 10000
+
+BASE = 10**12
+
+# Largest hi limb for which hi * SHARES fits in int64 (~9.2e8 tokens of 18 decimals)
+MAX_HI = np.iinfo(np.int64).max // SHARES
+
+# Production configuration, see scripts/prod_deploy.py
+EQUITIES = [1538, 3846, 2308, 2308, 0, 0, 0]
+FEES = [120, 0, 0] # DAI
+
+# Monte Carlo defaults
+SCENARIOS = int(os.environ.get('FORECAST_SCENARIOS', '10000'))
+MONTHS = int(os.environ.get('FORECAST_MONTHS', '36'))
+SEED = int(os.environ.get('FORECAST_SEED', '0'))
+PAYMENT = int(os.environ.get('FORECAST_PAYMENT', '5000')) # DAI per month
+
+def ether(value):
+    return value * 10**18
+
+def to_limbs(values):
+    '''
+    Splits an array of (Python) integers into (hi, lo) int64 arrays
+    '''
+    values = np.asarray(values, dtype=object)
+
+    return np.asarray(values // BASE, np.int64), np.asarray(values % BASE, np.int64)
+
+def from_limbs(amount):
+    '''
+    Joins (hi, lo) back into an array of exact Python integers
+    '''
+    hi, lo = amount
+
+    return hi.astype(object) * BASE + lo.astype(object)
+
+def zeros(shape):
+    return np.zeros(shape, np.int64), np.zeros(shape, np.int64)
+
+def add(a, b):
+    lo = a[1] + b[1]
+    carry = lo >= BASE
+
+    return a[0] + b[0] + carry, lo - carry * BASE
+
+def sub(a, b):
+    lo = a[1] - b[1]
+    borrow = lo < 0
+
+    return a[0] - b[0] - borrow, lo + borrow * BASE
+
+def mul(a, k):
+    '''
+    a * k for small non negative integers k
+    '''
+    lo = a[1] * k
+
+    return a[0] * k + lo // BASE, lo % BASE
+
+def share(a, equity):
+    '''
+    a * equity // SHARES, exact as BASE is a multiple of SHARES
+    '''
+    high = a[0] * equity
+    lo = (high % SHARES) * (BASE // SHARES) + a[1] * equity // SHARES
+
+    return high // SHARES + lo // BASE, lo % BASE
+
+def gt(a, b):
+    return (a[0] > b[0]) | ((a[0] == b[0]) & (a[1] > b[1]))
+
+def ge(a, b):
+    return (a[0] > b[0]) | ((a[0] == b[0]) & (a[1] >= b[1]))
+
+def where(mask, a, b):
+    return np.where(mask, a[0], b[0]), np.where(mask, a[1], b[1])
+
+def column(a, *ix):
+    return a[0][ix], a[1][ix]
+
+def simulate(payments, runs, fees, equities):
+    '''
+    Runs every scenario month by month and returns the exact totals paid.
+
+    `payments` (scenarios x months) are the tokens received during each
+    month, `runs` (scenarios x months) whether the keeper calls distribute()
+    that month, ~10 days in. `fees` (scenarios x months x VENDORS) are the
+    fees the owner wants in force for each month, a zero fee is an empty
+    vendor slot. The contract is deployed with the first month's fees and
+    later changes go through change_vendors_and_fees() right after the
+    keeper run, which reverts (and is retried the next month) while there
+    are pending distributions. `equities` (MEMBERS, or scenarios x MEMBERS)
+    are fixed for the whole run.
+    '''
+    payments = to_limbs(payments)
+    count, months = payments[0].shape
+
+    runs = np.broadcast_to(np.asarray(runs, dtype=bool), (count, months))
+    fees = to_limbs(np.broadcast_to(np.asarray(fees, dtype=object), (count, months, VENDORS)))
+    equities = np.broadcast_to(np.asarray(equities, dtype=np.int64), (count, MEMBERS))
+
+    # Balances never exceed what was paid in, pending months never exceed the run
+    if payments[0].sum(axis=1).max(initial=0) + months >= MAX_HI \
+            or (fees[0].max(initial=0) + 1) * VENDORS * months >= MAX_HI:
+        raise OverflowError('Amounts exceed the simulator range')
+
+    threshold = to_limbs(DISTRIBUTION_THRESHOLD)
+
+    balance = zeros(count)
+    counter = np.zeros(count, np.int64)
+    current = column(fees, slice(None), 0)
+
+    paid_members = zeros((count, MEMBERS))
+    paid_vendors = zeros((count, VENDORS))
+
+    below_threshold = np.zeros(count, np.int64)
+    insufficient = np.zeros(count, np.int64)
+    rejected_fee_changes = np.zeros(count, np.int64)
+
+    for ix in range(months):
+        month = ix + 1
+
+        balance = add(balance, column(payments, slice(None), ix))
+
+        due = mul(current, (month - counter)[:, None])
+
+        vendors_total = zeros(count)
+
+        for vendor in range(VENDORS):
+            vendors_total = add(vendors_total, column(due, slice(None), vendor))
+
+        above = gt(balance, threshold)
+        enough = ge(balance, vendors_total)
+
+        below_threshold += runs[:, ix] & ~above
+        insufficient += runs[:, ix] & above & ~enough
+
+        ok = runs[:, ix] & above & enough
+
+        remaining = sub(balance, vendors_total)
+        left = remaining
+
+        for vendor in range(VENDORS):
+            amount = where(ok, column(due, slice(None), vendor), zeros(count))
+
+            paid_vendors[0][:, vendor], paid_vendors[1][:, vendor] = \
+                add(column(paid_vendors, slice(None), vendor), amount)
+
+        for member in range(MEMBERS):
+            amount = where(ok, share(remaining, equities[:, member]), zeros(count))
+
+            paid_members[0][:, member], paid_members[1][:, member] = \
+                add(column(paid_members, slice(None), member), amount)
+
+            left = sub(left, amount)
+
+        balance = where(ok, left, balance)
+        counter = np.where(ok, month, counter)
+
+        if month < months:
+            wanted = column(fees, slice(None), month)
+
+            changed = ((wanted[0] != current[0]) | (wanted[1] != current[1])).any(axis=1)
+            allowed = counter == month
+
+            rejected_fee_changes += changed & ~allowed
+
+            current = where((changed & allowed)[:, None], wanted, current)
+
+    return {
+        'members': from_limbs(paid_members),
+        'vendors': from_limbs(paid_vendors),
+        'balance': from_limbs(balance),
+        'distributions_counter': counter,
+        'below_threshold': below_threshold,
+        'insufficient_balance': insufficient,
+        'rejected_fee_changes': rejected_fee_changes,
+    }
+
+def random_scenarios(rng, count, months, payment=PAYMENT, fees=FEES, spread=0.2,
+                     missed_payment=0.1, missed_run=0.2, fee_change=0.02):
+    '''
+    Returns (payments, runs, fees) for `count` scenarios of `months` months.
+    Payments are whole cents around `payment` tokens, a month can go unpaid
+    or without a keeper run, and each vendor fee moves up to `spread` with
+    probability `fee_change` every month.
+    '''
+    cents = rng.normal(payment * 100, payment * 100 * spread, (count, months)).round().clip(0)
+    cents[rng.random((count, months)) < missed_payment] = 0
+
+    payments = cents.astype(np.int64).astype(object) * 10**16
+
+    runs = rng.random((count, months)) >= missed_run
+
+    schedule = np.empty((count, months, VENDORS), np.int64)
+    schedule[:, 0] = fees
+
+    for ix in range(1, months):
+        factor = rng.uniform(1 - spread, 1 + spread, (count, VENDORS))
+        moved = (schedule[:, ix - 1] * factor).round().astype(np.int64).clip(1)
+
+        changes = rng.random((count, VENDORS)) < fee_change
+
+        # Empty vendor slots stay empty
+        schedule[:, ix] = np.where(changes & (schedule[:, ix - 1] > 0), moved, schedule[:, ix - 1])
+
+    return payments, runs, schedule.astype(object) * 10**18
+
+def summary(amounts, decimals=18, percentiles=(5, 50, 95)):
+    '''
+    Percentiles of the totals per recipient slot, in tokens
+    '''
+    tokens = amounts.astype(float) / 10**decimals
+
+    return np.percentile(tokens, percentiles, axis=0).T
+
+def main():
+    rng = np.random.default_rng(SEED)
+
+    payments, runs, fees = random_scenarios(rng, SCENARIOS, MONTHS)
+
+    started = time.perf_counter()
+    result = simulate(payments, runs, fees, EQUITIES)
+    elapsed = time.perf_counter() - started
+
+    print(f'{SCENARIOS * MONTHS:,} scenario-months in {elapsed:.2f}s ({SCENARIOS * MONTHS / elapsed:,.0f}/s)')
+    print()
+    print(f'{"":10} {"p5":>14} {"p50":>14} {"p95":>14}')
+
+    for ix, row in enumerate(summary(result['members'])):
+        if EQUITIES[ix] > 0:
+            print(f'member {ix}  ' + ' '.join(f'{value:>14,.2f}' for value in row))
+
+    for ix, row in enumerate(summary(result['vendors'])):
+        if FEES[ix] > 0:
+            print(f'vendor {ix}  ' + ' '.join(f'{value:>14,.2f}' for value in row))
+
+    print()
+    print(f'Runs below the threshold:    {result["below_threshold"].mean():.2f} per scenario')
+    print(f'Runs short to pay vendors:   {result["insufficient_balance"].mean():.2f} per scenario')
+    print(f'Fee changes retried:         {result["rejected_fee_changes"].mean():.2f} per scenario')
@@ -0,0 +1,337 @@
+import os
+import re
+from collections import Counter
+
+from brownie import Cell, ClaimUnit, PlainToken, Token, Unit, UnitFactory, accounts
+
+## Per-line gas profile of representative transactions
+#
+# Every scenario runs on the local chain, its trace is fetched and the gas of
+# each step is attributed to the Vyper source line it belongs to, the
+# enclosing function and the innermost `for` loop. Calls are split so a
+# CALL step only counts its own cost, the gas used inside the callee goes to
+# the callee's lines.
+#
+# Prints the hot-spot table of every scenario and of the whole run, and
+# writes folded stacks (`frame;frame;line gas`) to GAS_PROFILE_DIR, ready
+# for flamegraph.pl or speedscope.
+
+OUTPUT = os.environ.get('GAS_PROFILE_DIR', 'gas-profile')
+
+# Rows of the hot-spot tables
+TOP = int(os.environ.get('GAS_PROFILE_TOP', '15'))
+
+MONTH_TIMEDELTA = 2629800
+DAY = 86400
+
+ZERO = '0x0000000000000000000000000000000000000000'
+
+# Steps without source map, the dispatcher and compiler generated code
+NO_SOURCE = '(no source)'
+
+def ether(value):
+    return value * 10**18
+
+def step_costs(trace):
+    '''
+    Returns the gas of every step excluding the gas used by the frames it
+    calls into.
+
+    A step's cost is the gas left before it minus the gas left before the
+    next step at the same depth, which for a CALL includes everything the
+    callee used; the callee's own steps are then subtracted.
+    '''
+    costs = [0] * len(trace)
+
+    # [index of the call step, gas used by its callee so far]
+    calls = []
+
+    for ix, step in enumerate(trace):
+        # Back from one or more calls
+        while calls and step['depth'] <= trace[calls[-1][0]]['depth']:
+            call, used = calls.pop()
+            inclusive = trace[call]['gas'] - step['gas']
+
+            costs[call] = inclusive - used
+
+            if calls:
+                calls[-1][1] += inclusive
+
+        following = trace[ix + 1] if ix + 1 < len(trace) else None
+
+        if following is not None and following['depth'] > step['depth']:
+            calls.append([ix, 0])
+            continue
+
+        if following is not None and following['depth'] == step['depth']:
+            costs[ix] = step['gas'] - following['gas']
+        else:
+            # Last step of a frame
+            costs[ix] = step['gasCost']
+
+        if calls:
+            calls[-1][1] += costs[ix]
+
+    # Calls the trace ends in, e.g. a callee that ran out of gas
+    for call, used in calls:
+        costs[call] = trace[call]['gasCost'] - used
+
+    return costs
+
+class Source:
+    '''
+    Line lookup of a Vyper source, with the function and innermost loop
+    enclosing every line
+    '''
+    def __init__(self, path):
+        with open(path) as f:
+            self.text = f.read()
+
+        self.lines = self.text.splitlines()
+        self.starts = [0]
+
+        for line in self.lines:
+            self.starts.append(self.starts[-1] + len(line) + 1)
+
+        self.scopes = self._scopes()
+
+    def _scopes(self):
+        scopes = []
+
+        # (indent, kind, line number, header) of the open blocks
+        blocks = []
+
+        for number, line in enumerate(self.lines, 1):
+            stripped = line.strip()
+
+            if stripped and not stripped.startswith('#'):
+                indent = len(line) - len(line.lstrip())
+
+                while blocks and indent <= blocks[-1][0]:
+                    blocks.pop()
+
+                match = re.match(r'(def|for)\b', stripped)
+
+                if match:
+                    blocks.append((indent, match.group(1), number, stripped.rstrip(':')))
+
+            function = next((b for b in reversed(blocks) if b[1] == 'def'), None)
+            loop = next((b for b in reversed(blocks) if b[1] == 'for'), None)
+
+            scopes.append((
+                re.match(r'def (\w+)', function[3]).group(1) if function else None,
+                f'{loop[3]} (line {loop[2]})' if loop else None,
+            ))
+
+        return scopes
+
+    def line(self, offset):
+        '''
+        1-based line number of a character offset
+        '''
+        low, high = 0, len(self.starts) - 1
+
+        while low < high:
+            middle = (low + high + 1) // 2
+
+            if self.starts[middle] <= offset:
+                low = middle
+            else:
+                high = middle - 1
+
+        return low + 1
+
+    def code(self, number):
+        return self.lines[number - 1].strip()
+
+    def scope(self, number):
+        return self.scopes[number - 1]
+
+class Profile:
+    def __init__(self):
+        self.sources = {}
+
+        self.lines = Counter()
+        self.blocks = Counter()
+        self.stacks = Counter()
+
+        self.total = 0
+
+    def source(self, path):
+        if path not in self.sources:
+            self.sources[path] = Source(path)
+
+        return self.sources[path]
+
+    def add(self, tx, label):
+        '''
+        Attributes the gas of `tx` to source lines, returns the gas outside
+        the trace (intrinsic cost, calldata and refunds)
+        '''
+        trace = tx.trace
+        costs = step_costs(trace)
+
+        # Frame labels of the calls leading to the current depth
+        frames = []
+        current = None
+
+        for ix, step in enumerate(trace):
+            while len(frames) > step['depth']:
+                frames.pop()
+
+            while len(frames) < step['depth']:
+                frames.append(current)
+
+            name = step.get('contractName') or step['address']
+
+            if step.get('source'):
+                source = self.source(step['source']['filename'])
+                number = source.line(step['source']['offset'][0])
+
+                function, loop = source.scope(number)
+                function = f'{name}.{function}' if function else step.get('fn') or name
+
+                location = f"{os.path.basename(step['source']['filename'])}:{number}"
+                code = source.code(number)
+            else:
+                function = step.get('fn') or name
+                loop = None
+                location = NO_SOURCE
+                code = ''
+
+            current = function
+
+            self.lines[location, function, code] += costs[ix]
+            self.blocks[function, loop] += costs[ix]
+
+            stack = [label] + frames + [function] + ([loop] if loop else []) + [location]
+            self.stacks[';'.join(frame.replace(';', ',') for frame in stack)] += costs[ix]
+
+        outside = tx.gas_used - sum(costs)
+
+        self.lines['(intrinsic, calldata and refunds)', label, ''] += outside
+        self.stacks[f'{label};(intrinsic, calldata and refunds)'] += max(outside, 0)
+
+        self.total += tx.gas_used
+
+        return outside
+
+    def hot_spots(self, top=TOP):
+        rows = [
+            f'{"gas":>9} {"%":>6}  {"line":<28} {"function":<32} code',
+        ]
+
+        for (location, function, code), gas in self.lines.most_common(top):
+            rows.append(f'{gas:>9} {gas / self.total:>6.1%}  {location:<28} {function:<32} {code[:60]}')
+
+        return '\n'.join(rows)
+
+    def functions(self):
+        '''
+        Gas by function, with the share of each loop underneath
+        '''
+        totals = Counter()
+
+        for (function, _), gas in self.blocks.items():
+            totals[function] += gas
+
+        rows = [f'{"gas":>9} {"%":>6}  function / loop']
+
+        for function, gas in totals.most_common():
+            rows.append(f'{gas:>9} {gas / self.total:>6.1%}  {function}')
+
+            loops = [(loop, gas) for (name, loop), gas in self.blocks.items() if name == function and loop]
+
+            for loop, gas in sorted(loops, key=lambda item: -item[1]):
+                rows.append(f'{gas:>9} {gas / self.total:>6.1%}    {loop}')
+
+        return '\n'.join(rows)
+
+    def write_folded(self, path):
+        with open(path, 'w') as f:
+            for stack, gas in sorted(self.stacks.items()):
+                if gas > 0:
+                    f.write(f'{stack} {gas}\n')
+
+def scenarios(chain, sender):
+    '''
+    Yields (label, transaction) for representative calls of every contract
+    '''
+    members = [accounts.add(f'0x{ix + 1:064x}').address for ix in range(10)]
+
+    token = Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': sender})
+    plain = PlainToken.deploy('Plain Token', 'PTK', 18, ether(1_000_000), {'from': sender})
+
+    yield 'Token.transfer', token.transfer(members[0], ether(1), {'from': sender})
+    yield 'Token.transfer_batch', token.transfer_batch(members[:5], [ether(1)] * 5, {'from': sender})
+
+    # Production configuration, 4 members and 1 vendor
+    config = (
+        chain.time() - MONTH_TIMEDELTA - DAY,
+        None,
+        members[:4] + [ZERO] * 3,
+        [1538, 3846, 2308, 2308, 0, 0, 0],
+        [members[9], ZERO, ZERO],
+        [ether(120), 0, 0],
+    )
+
+    for name, contract in [('batch', token), ('plain', plain)]:
+        unit = Unit.deploy(config[0], contract, *config[2:], {'from': sender})
+
+        contract.transfer(unit, ether(5000), {'from': sender})
+
+        yield f'Unit.distribute ({name})', unit.distribute({'from': sender})
+
+    yield 'Unit.change_members_and_equities', unit.change_members_and_equities(
+        members[4:8] + [ZERO] * 3,
+        config[3],
+        {'from': sender}
+    )
+
+    template = Unit.deploy(0, ZERO, [sender] + [ZERO] * 6, [10000] + [0] * 6, [ZERO] * 3, [0] * 3, {'from': sender})
+    template.change_owner(ZERO, {'from': sender})
+
+    factory = UnitFactory.deploy(template, {'from': sender})
+
+    yield 'UnitFactory.create_unit', factory.create_unit(config[0], token, *config[2:], sender, {'from': sender})
+
+    claim_unit = ClaimUnit.deploy(config[0], token, members[:4], config[3][:4], *config[4:], {'from': sender})
+
+    token.transfer(claim_unit, ether(5000), {'from': sender})
+
+    yield 'ClaimUnit.distribute', claim_unit.distribute({'from': sender})
+
+    cell = Cell.deploy(6000, members[:4], [40, 30, 20, 10], 0, 0, False, {'from': sender})
+
+    yield 'Cell.pay', cell.pay({'from': sender, 'value': ether(1)})
+
+def main():
+    from brownie import chain
+
+    sender = accounts[0]
+
+    os.makedirs(OUTPUT, exist_ok=True)
+
+    total = Profile()
+
+    for label, tx in scenarios(chain, sender):
+        profile = Profile()
+        profile.sources = total.sources
+
+        profile.add(tx, label)
+        total.add(tx, label)
+
+        print(f'\n{label}: {tx.gas_used} gas\n')
+        print(profile.hot_spots())
+
+        name = re.sub(r'\W+', '_', label).strip('_')
+        profile.write_folded(os.path.join(OUTPUT, f'{name}.folded'))
+
+    print(f'\nAll scenarios: {total.total} gas\n')
+    print(total.hot_spots())
+    print()
+    print(total.functions())
+
+    total.write_folded(os.path.join(OUTPUT, 'all.folded'))
+
+    print(f'\nFolded stacks written to {OUTPUT}/, e.g. flamegraph.pl {OUTPUT}/all.folded > gas.svg')
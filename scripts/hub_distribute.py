@@ -0,0 +1,68 @@
+import json
+import os
+
+from brownie import DistributorHub, accounts, network
+
+# JSON list of {"unit": address, "token": address} entries
+REGISTRY = os.environ.get('KEEPER_REGISTRY', 'scripts/keeper_registry.json')
+
+# Deployed hub, a new one is deployed when empty
+HUB = os.environ.get('HUB_ADDRESS')
+
+# Units per transaction, a first distribution of 50 units needs ~13M gas
+BATCH = int(os.environ.get('HUB_BATCH', '25'))
+
+# DistributorHub outcomes
+DISTRIBUTED = 0
+
+OUTCOMES = {
+    0: 'distributed',
+    1: 'balance below the distribution threshold',
+    2: 'insufficient balance to pay vendors',
+    3: 'start date is in the future',
+    4: 'distribute() reverted',
+}
+
+def distribute(hub, units, sender, batch=BATCH):
+    '''
+    Distributes `units` through the hub in batches, returns {unit: outcome}.
+    Every batch is dry run first and only sent when a unit would distribute.
+    '''
+    outcomes = {}
+
+    for ix in range(0, len(units), batch):
+        chunk = units[ix:ix + batch]
+
+        results = hub.distribute.call(chunk, {'from': sender})
+
+        if DISTRIBUTED in results:
+            tx = hub.distribute(chunk, {'from': sender})
+
+            # The state may have changed since the dry run
+            results = tx.events['DistributionResults']['outcomes']
+
+            print(f'Batch {ix // batch + 1}: {tx.gas_used} gas')
+
+        outcomes.update(zip(chunk, results))
+
+    return outcomes
+
+def main():
+    if network.show_active() == 'development':
+        sender = accounts[0]
+    else:
+        sender = accounts.load('test_account')
+
+    with open(REGISTRY) as f:
+        units = [entry['unit'] for entry in json.load(f)]
+
+    hub = DistributorHub.at(HUB) if HUB else DistributorHub.deploy({'from': sender})
+
+    outcomes = distribute(hub, units, sender)
+
+    for unit, outcome in outcomes.items():
+        print(f'{unit}  {OUTCOMES[outcome]}')
+
+    distributed = sum(outcome == DISTRIBUTED for outcome in outcomes.values())
+
+    print(f'{distributed} of {len(outcomes)} units distributed')
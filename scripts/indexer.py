@@ -0,0 +1,293 @@
+import json
+import os
+import sqlite3
+import time
+from collections import defaultdict
+
+import requests
+from brownie import web3
+from eth_utils import keccak, to_checksum_address
+from hexbytes import HexBytes
+
+# SQLite file with the indexed logs
+DATABASE = os.environ.get('INDEXER_DB', 'distributions.sqlite')
+
+# Blocks re-indexed on every run to survive reorgs
+CONFIRMATIONS = int(os.environ.get('INDEXER_CONFIRMATIONS', '12'))
+
+# First block to index, usually the deployment block of the oldest contract
+START_BLOCK = int(os.environ.get('INDEXER_START_BLOCK', '0'))
+
+# Contracts to index, defaults to the Units in the keeper registry
+REGISTRY = os.environ.get('KEEPER_REGISTRY', 'scripts/keeper_registry.json')
+
+# Block range of a single eth_getLogs request, adapted as the indexer runs
+CHUNK = 2_000
+MAX_CHUNK = 100_000
+
+# Grow the range while responses stay below this many logs
+TARGET_LOGS = 2_000
+
+# topic0 -> (event name, indexed fields, layout of a compact round)
+#
+# Compact rounds carry the receivers and amounts arrays after `head` static
+# words, `size` is the length of fixed size arrays. They are stored as one
+# row per receiver, like the per-receiver events they replace.
+EVENTS = {
+    keccak(text='Distribution(address,uint256)'): ('Distribution', ['account'], None),
+    keccak(text='Payment(address,uint256)'): ('Payment', ['account'], None),
+    keccak(text='TokenDistribution(address,address,uint256)'): ('TokenDistribution', ['token', 'account'], None),
+    keccak(text='DistributionRound(uint256,uint256,address[],uint256[])'): ('Distribution', [], {'head': 2}),
+    keccak(text='TokenDistributionRound(address,address[],uint256[])'): ('TokenDistribution', ['token'], {'head': 0}),
+    keccak(text='DistributionRound(address[4],uint256[4])'): ('Distribution', [], {'size': 4}),
+}
+
+# Layout of the store, older stores are dropped and indexed again
+SCHEMA_VERSION = 1
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS events (
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    tx TEXT NOT NULL,
+    contract TEXT NOT NULL,
+    event TEXT NOT NULL,
+    account TEXT NOT NULL,
+    token TEXT,
+    amount TEXT NOT NULL,
+    item INTEGER NOT NULL,
+    PRIMARY KEY (block, log_index, item)
+);
+CREATE INDEX IF NOT EXISTS events_account ON events (account, event);
+CREATE TABLE IF NOT EXISTS blocks (
+    number INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    block INTEGER NOT NULL
+);
+'''
+
+def decode_round(data, head=0, size=None):
+    '''
+    Returns the (receiver, amount) pairs of a compact round event, in payout
+    order. `head` static words precede the receivers and amounts arrays,
+    `size` is given for fixed size arrays.
+    '''
+    data = bytes(HexBytes(data))
+    words = [int.from_bytes(data[ix:ix + 32], 'big') for ix in range(0, len(data), 32)]
+
+    if size is None:
+        # Dynamic arrays, the head holds their offsets in bytes
+        receivers, amounts = [
+            words[offset // 32 + 1:offset // 32 + 1 + words[offset // 32]]
+            for offset in words[head:head + 2]
+        ]
+    else:
+        receivers = words[head:head + size]
+        amounts = words[head + size:head + 2 * size]
+
+    return [
+        (to_checksum_address(receiver.to_bytes(32, 'big')[-20:]), amount)
+        for receiver, amount in zip(receivers, amounts)
+    ]
+
+def decode(log, timestamp):
+    '''
+    Returns the events table rows of a raw log, one per receiver of a
+    compact round
+    '''
+    topics = [bytes(HexBytes(topic)) for topic in log['topics']]
+    event, indexed, layout = EVENTS[topics[0]]
+
+    fields = {
+        name: to_checksum_address(topic[-20:])
+        for name, topic in zip(indexed, topics[1:])
+    }
+
+    if layout is None:
+        payouts = [(fields['account'], int.from_bytes(HexBytes(log['data']), 'big'))]
+    else:
+        payouts = decode_round(log['data'], **layout)
+
+    return [
+        (
+            log['blockNumber'],
+            log['logIndex'],
+            timestamp,
+            HexBytes(log['transactionHash']).hex(),
+            to_checksum_address(log['address']),
+            event,
+            account,
+            fields.get('token'),
+            # Amounts exceed SQLite integers, stored as decimal text
+            str(amount),
+            item,
+        )
+        for item, (account, amount) in enumerate(payouts)
+    ]
+
+class Indexer:
+    def __init__(self, path, addresses, start_block=START_BLOCK, confirmations=CONFIRMATIONS):
+        self.connection = sqlite3.connect(path)
+
+        if self.connection.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+            # The store only caches the chain, rebuilt with the current layout
+            self.connection.executescript('''
+                DROP TABLE IF EXISTS events;
+                DROP TABLE IF EXISTS blocks;
+                DROP TABLE IF EXISTS checkpoint;
+            ''')
+            self.connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+        self.connection.executescript(SCHEMA)
+
+        self.addresses = [to_checksum_address(address) for address in addresses]
+        self.start_block = start_block
+        self.confirmations = confirmations
+
+        self.chunk = CHUNK
+        self.requests = 0
+
+    def checkpoint(self):
+        row = self.connection.execute('SELECT block FROM checkpoint').fetchone()
+
+        return row[0] if row else None
+
+    def _matches_chain(self, number):
+        stored = self.connection.execute('SELECT hash FROM blocks WHERE number = ?', (number,)).fetchone()
+
+        return stored is None or stored[0] == web3.eth.get_block(number)['hash'].hex()
+
+    def _resume_block(self, head):
+        '''
+        First block to (re)index, rolls back the confirmation window and any
+        deeper reorg detected through the stored block hashes.
+        '''
+        checkpoint = self.checkpoint()
+
+        if checkpoint is None:
+            return self.start_block
+
+        start = max(self.start_block, min(checkpoint, head) - self.confirmations + 1)
+
+        while True:
+            previous = self.connection.execute(
+                'SELECT number FROM blocks WHERE number < ? ORDER BY number DESC LIMIT 1', (start,)
+            ).fetchone()
+
+            if previous is None or self._matches_chain(previous[0]):
+                return start
+
+            start = previous[0]
+
+    def _get_logs(self, start, end):
+        '''
+        Yields (start, end, logs) covering the range, halving the block
+        range when the provider rejects a request and doubling it while
+        responses stay small.
+        '''
+        while start <= end:
+            stop = min(end, start + self.chunk - 1)
+
+            try:
+                self.requests += 1
+
+                logs = web3.eth.get_logs({
+                    'fromBlock': start,
+                    'toBlock': stop,
+                    'address': self.addresses,
+                    'topics': [['0x' + topic.hex() for topic in EVENTS]],
+                })
+            except (ValueError, requests.exceptions.RequestException):
+                if self.chunk == 1:
+                    raise
+
+                self.chunk = max(1, self.chunk // 2)
+                continue
+
+            yield start, stop, logs
+
+            start = stop + 1
+
+            if len(logs) < TARGET_LOGS:
+                self.chunk = min(MAX_CHUNK, self.chunk * 2)
+
+    def run(self):
+        '''
+        Indexes up to the current head, returns the number of rows added
+        '''
+        head = web3.eth.block_number
+        start = self._resume_block(head)
+
+        with self.connection:
+            self.connection.execute('DELETE FROM events WHERE block >= ?', (start,))
+            self.connection.execute('DELETE FROM blocks WHERE number >= ?', (start,))
+            self.connection.execute('DELETE FROM checkpoint')
+
+        added = 0
+
+        for _, last, logs in self._get_logs(start, head):
+            blocks = {}
+
+            for log in logs:
+                if log['blockNumber'] not in blocks:
+                    blocks[log['blockNumber']] = web3.eth.get_block(log['blockNumber'])
+
+            blocks[last] = blocks.get(last) or web3.eth.get_block(last)
+
+            rows = [row for log in logs for row in decode(log, blocks[log['blockNumber']]['timestamp'])]
+
+            with self.connection:
+                self.connection.executemany('INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO blocks VALUES (?, ?)',
+                    [(number, block['hash'].hex()) for number, block in blocks.items()],
+                )
+                self.connection.execute('INSERT OR REPLACE INTO checkpoint VALUES (0, ?)', (last,))
+
+            added += len(rows)
+
+        return added
+
+def monthly_received(connection, event='Distribution'):
+    '''
+    Returns {(account, 'YYYY-MM'): amount} from the local store
+    '''
+    totals = defaultdict(int)
+
+    rows = connection.execute(
+        "SELECT account, strftime('%Y-%m', timestamp, 'unixepoch'), amount FROM events WHERE event = ?",
+        (event,),
+    )
+
+    for account, month, amount in rows:
+        totals[account, month] += int(amount)
+
+    return dict(totals)
+
+def main():
+    addresses = os.environ.get('INDEXER_CONTRACTS')
+
+    if addresses:
+        addresses = addresses.split(',')
+    else:
+        with open(REGISTRY) as f:
+            addresses = [entry['unit'] for entry in json.load(f)]
+
+    indexer = Indexer(DATABASE, addresses)
+
+    started = time.perf_counter()
+    added = indexer.run()
+
+    print(f'Indexed {added} events up to block {indexer.checkpoint()} with {indexer.requests} requests in {time.perf_counter() - started:.2f}s')
+
+    started = time.perf_counter()
+    report = monthly_received(indexer.connection)
+
+    for (account, month), amount in sorted(report.items(), key=lambda item: (item[0][1], item[0][0])):
+        print(f'{month}  {account}  {amount / 10**18:>16,.2f}')
+
+    print(f'Report built in {(time.perf_counter() - started) * 1000:.1f}ms')
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+import os
+import time
+
+from brownie import Token, Unit, accounts, network
+from brownie.exceptions import VirtualMachineError
+
+# Unit contract constants
+DISTRIBUTION_THRESHOLD = 1_000_000_000_000_000_000
+VENDORS = 3
+
+# Reasons of the preview_distribution() status codes, 0 distributes
+STATUS = {
+    1: 'balance below the distribution threshold',
+    2: 'insufficient balance to pay vendors',
+    3: 'start date is in the future',
+}
+
+# JSON list of {"unit": address, "token": address} entries
+REGISTRY = os.environ.get('KEEPER_REGISTRY', 'scripts/keeper_registry.json')
+
+# Seconds between polling cycles
+INTERVAL = int(os.environ.get('KEEPER_INTERVAL', '3600'))
+
+# Concurrent RPC requests
+CONCURRENCY = int(os.environ.get('KEEPER_CONCURRENCY', '16'))
+
+log = logging.getLogger('keeper')
+
+def load_registry(path):
+    with open(path) as f:
+        return [
+            (Unit.at(entry['unit']), Token.at(entry['token']))
+            for entry in json.load(f)
+        ]
+
+def check(balance, pending, fees, arrears_mode=False):
+    '''
+    Mirrors the asserts of Unit.distribute(), returns the reason it would
+    revert or None when it would succeed. In arrears mode a short balance
+    pays the vendors partially instead of reverting.
+    '''
+    if pending is None:
+        return 'start date is in the future'
+
+    if not balance > DISTRIBUTION_THRESHOLD:
+        return 'balance below the distribution threshold'
+
+    if not arrears_mode and balance < sum(fees) * pending:
+        return 'insufficient balance to pay vendors'
+
+    return None
+
+class Keeper:
+    def __init__(self, units, sender, concurrency=CONCURRENCY):
+        self.units = units
+        self.sender = sender
+        self.concurrency = concurrency
+
+        # Totals since the keeper started
+        self.sent = 0
+        self.avoided = 0
+        self.failed = 0
+        self.cycles = 0
+
+    async def _call(self, fn, *args):
+        async with self.semaphore:
+            return await asyncio.to_thread(fn, *args)
+
+    async def _pending(self, unit):
+        try:
+            return await self._call(unit.pending_distributions)
+        except (ValueError, VirtualMachineError):
+            # Reverts while the start date is in the future
+            return None
+
+    async def _arrears_mode(self, unit):
+        try:
+            return await self._call(unit.arrears_mode)
+        except (ValueError, VirtualMachineError):
+            # Deployed before arrears mode, vendors are always paid in full
+            return False
+
+    async def _check(self, unit, token):
+        balance, pending, arrears_mode, *fees = await asyncio.gather(
+            self._call(token.balanceOf, unit),
+            self._pending(unit),
+            self._arrears_mode(unit),
+            *[self._call(unit.fees, ix) for ix in range(VENDORS)],
+        )
+
+        return check(balance, pending, fees, arrears_mode)
+
+    async def inspect(self, unit, token):
+        '''
+        Returns the reason distribute() would revert for `unit`, or None
+        '''
+        try:
+            preview = await self._call(unit.preview_distribution)
+        except (ValueError, VirtualMachineError):
+            # Deployed before preview_distribution(), mirrored off-chain
+            return await self._check(unit, token)
+
+        return STATUS.get(preview['status'])
+
+    def _distribute(self, unit):
+        try:
+            unit.distribute({'from': self.sender})
+        except VirtualMachineError as exc:
+            # State changed between the check and the transaction
+            log.warning('%s distribute reverted: %s', unit.address, exc.revert_msg)
+            self.failed += 1
+        except ValueError as exc:
+            # Same, caught by the gas estimation on live networks
+            log.warning('%s distribute would revert: %s', unit.address, exc)
+            self.failed += 1
+        else:
+            self.sent += 1
+
+    async def cycle(self):
+        '''
+        Polls every unit concurrently and sends distribute() to those that
+        would succeed, transactions are sent one at a time from the sender.
+        '''
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+
+        started = time.perf_counter()
+
+        reasons = await asyncio.gather(*[
+            self.inspect(unit, token) for unit, token in self.units
+        ])
+
+        polled = time.perf_counter()
+
+        sent = self.sent
+        avoided = 0
+
+        for (unit, _), reason in zip(self.units, reasons):
+            if reason is None:
+                await asyncio.to_thread(self._distribute, unit)
+            else:
+                log.debug('%s skipped, %s', unit.address, reason)
+                avoided += 1
+
+        self.avoided += avoided
+        self.cycles += 1
+
+        log.info(
+            'cycle %d: %d units polled in %.2fs, %d distributions sent in %.2fs, '
+            '%d transactions avoided (%d in total)',
+            self.cycles,
+            len(self.units),
+            polled - started,
+            self.sent - sent,
+            time.perf_counter() - polled,
+            avoided,
+            self.avoided,
+        )
+
+        return reasons
+
+    async def run(self, interval=INTERVAL, cycles=None):
+        while cycles is None or self.cycles < cycles:
+            started = time.monotonic()
+
+            await self.cycle()
+
+            await asyncio.sleep(max(0, interval - (time.monotonic() - started)))
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+
+    if network.show_active() == 'development':
+        sender = accounts[0]
+    else:
+        sender = accounts.load('test_account')
+
+    keeper = Keeper(load_registry(REGISTRY), sender)
+
+    asyncio.run(keeper.run())
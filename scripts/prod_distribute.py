@@ -1,9 +1,31 @@
 from brownie import Unit, accounts
+from brownie.exceptions import VirtualMachineError
 
 ME = accounts.load('test_account')
 
 # Datitos contract
 CONTRACT = Unit.at('0x09364b188f062cce8dec8dd1022111aa643bf33a')
 
+# Reasons of the preview_distribution() status codes, 0 distributes
+STATUS = {
+    1: 'balance below the distribution threshold',
+    2: 'insufficient balance to pay vendors',
+    3: 'start date is in the future',
+}
+
 def main():
+    try:
+        preview = CONTRACT.preview_distribution()
+    except (ValueError, VirtualMachineError):
+        # Deployed before preview_distribution()
+        preview = None
+
+    if preview is not None:
+        if preview['status'] != 0:
+            print(f'Not distributing, {STATUS[preview["status"]]}')
+            return
+
+        for receiver, amount in zip(preview['receivers'], preview['amounts']):
+            print(f'{receiver} {amount / 10**18:,.2f}')
+
     CONTRACT.distribute({'from': ME})
@@ -1,7 +1,7 @@
 from brownie.network import priority_fee
 priority_fee('auto')
 
-from brownie import Unit, accounts
+from brownie import Token, Unit, accounts, web3
 
 def ether(value):
     return value * 10**18
@@ -16,17 +16,76 @@ GONZA = '0xc81167615bd6b5486d0c20981a4f09d7c6f8f608'
 IMRE  = '0x9d36ec9da23ef8d32479cc51ffd44c8b5c380331'
 ZERO  = '0x0000000000000000000000000000000000000000'
 
+# Dai, the token of the deployed contract
+TOKEN = '0x6B175474E89094C44Da98b954EedeAC495271d0F'
+
 OWNER = accounts.load('test_account')
 
+MEMBERS  = [BATTO, MOYA,  GUS, TOMI, GONZA, ZERO, ZERO]
+EQUITIES = [ 1538, 3846, 2308, 1154,  1154,    0,    0]
+
+VENDORS = [      IMRE, ZERO, ZERO]
+FEES    = [ether(150),    0,    0]
+
+def implements(function):
+    '''
+    Whether the deployed contract has `function`, its selector is pushed as a
+    constant by the dispatcher
+    '''
+    return bytes.fromhex(function.signature[2:]) in bytes(web3.eth.get_code(CONTRACT.address))
+
+def read_state():
+    '''
+    Returns the snapshot() fields, read one by one from contracts deployed
+    before snapshot() was added
+    '''
+    if implements(CONTRACT.snapshot):
+        return CONTRACT.snapshot()
+
+    return {
+        'pending_distributions': CONTRACT.pending_distributions(),
+        'members': [CONTRACT.members(ix) for ix in range(len(MEMBERS))],
+        'equities': [CONTRACT.equities(ix) for ix in range(len(EQUITIES))],
+        'vendors': [CONTRACT.vendors(ix) for ix in range(len(VENDORS))],
+        'fees': [CONTRACT.fees(ix) for ix in range(len(FEES))],
+        'token_balance': Token.at(TOKEN).balanceOf(CONTRACT),
+    }
+
+def diff(label, current, wanted):
+    '''
+    Returns the slots whose value changes, printing each of them
+    '''
+    # Addresses compare regardless of checksum case
+    changed = [ix for ix, (old, new) in enumerate(zip(current, wanted)) if str(old).lower() != str(new).lower()]
+
+    for ix in changed:
+        print(f'{label}[{ix}]: {current[ix]} -> {wanted[ix]}')
+
+    return changed
+
 def main():
-    CONTRACT.change_members_and_equities(
-        [BATTO, MOYA,  GUS, TOMI, GONZA, ZERO, ZERO],
-        [ 1538, 3846, 2308, 1154,  1154,    0,    0],
-        {'from': OWNER}
-    )
-
-    CONTRACT.change_vendors_and_fees(
-        [      IMRE, ZERO, ZERO],
-        [ether(150),    0,    0],
-        {'from': OWNER}
-    )
+    # Whole configuration in a single call where available
+    state = read_state()
+
+    print(f"Members:  {list( zip(state['members'], state['equities']) )}")
+    print(f"Vendors:  {list( zip(state['vendors'], state['fees']) )}")
+    print(f"Balance:  {state['token_balance']}")
+
+    assert state['pending_distributions'] == 0, 'Distribute the pending months first'
+
+    members_changed = diff('members', state['members'], MEMBERS) + diff('equities', state['equities'], EQUITIES)
+    vendors_changed = diff('vendors', state['vendors'], VENDORS) + diff('fees', state['fees'], FEES)
+
+    # A single transaction, reconfigure() only when both halves change as
+    # it reads every slot of the configuration, and only on contracts that
+    # have it
+    if members_changed and vendors_changed and implements(CONTRACT.reconfigure):
+        CONTRACT.reconfigure(MEMBERS, EQUITIES, VENDORS, FEES, {'from': OWNER})
+    elif members_changed or vendors_changed:
+        if members_changed:
+            CONTRACT.change_members_and_equities(MEMBERS, EQUITIES, {'from': OWNER})
+
+        if vendors_changed:
+            CONTRACT.change_vendors_and_fees(VENDORS, FEES, {'from': OWNER})
+    else:
+        print('Configuration is up to date')
@@ -0,0 +1,278 @@
+import json
+import os
+import sqlite3
+import time
+
+from brownie import Unit, web3
+from eth_utils import keccak, to_checksum_address
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError
+
+# SQLite file with the cached configurations
+DATABASE = os.environ.get('UNIT_CACHE_DB', 'unit_cache.sqlite')
+
+# JSON list of {"unit": address, "token": address} entries
+REGISTRY = os.environ.get('KEEPER_REGISTRY', 'scripts/keeper_registry.json')
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+# Unit contract constants
+MEMBERS = 7
+VENDORS = 3
+
+# Logged by every change of the cached fields
+CONFIGURATION_CHANGED = keccak(text='ConfigurationChanged(address)')
+
+# Runtime code of an EIP-1167 proxy, the template address goes in between
+PROXY_PREFIX = bytes.fromhex('363d3d373d3d3d363d73')
+PROXY_SUFFIX = bytes.fromhex('5af43d82803e903d91602b57fd5bf3')
+
+# Fields of the Snapshot struct, in order
+SNAPSHOT = [
+    'owner', 'start_timestamp', 'distributions_counter', 'pending_distributions',
+    'members', 'equities', 'vendors', 'fees', 'token', 'token_balance',
+]
+
+# snapshot() fields that only change through a logged configuration change
+CONFIGURATION = ['owner', 'start_timestamp', 'members', 'equities', 'vendors', 'fees', 'token']
+
+# Calls reading a unit through its getters, one per configuration field and
+# slot plus the pending distributions and the token balance
+GETTER_CALLS = 3 + 2 * MEMBERS + 2 * VENDORS + 2
+
+BALANCE_OF_ABI = [{
+    'name': 'balanceOf',
+    'type': 'function',
+    'stateMutability': 'view',
+    'inputs': [{'name': 'account', 'type': 'address'}],
+    'outputs': [{'name': '', 'type': 'uint256'}],
+}]
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS units (
+    address TEXT PRIMARY KEY,
+    block INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    configuration TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS code (
+    address TEXT PRIMARY KEY,
+    logs_changes INTEGER NOT NULL
+);
+'''
+
+class UnitCache:
+    '''
+    Keeps the configuration of Units by address, valid at a block. An entry
+    is dropped when the unit logs ConfigurationChanged after that block or
+    when a reorg replaces the block, pending distributions and the token
+    balance are always read at the current block. Units deployed before the
+    event are read in full every time.
+    '''
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+        self.requests = 0
+
+        # Calls reading the same state through the getters would have made
+        self.uncached_requests = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self.invalidated = 0
+
+    def _logs_changes(self, address):
+        '''
+        Whether the deployed code logs ConfigurationChanged, its topic is
+        pushed as a constant. Proxies are resolved to their template.
+        '''
+        row = self.connection.execute('SELECT logs_changes FROM code WHERE address = ?', (address,)).fetchone()
+
+        if row:
+            return bool(row[0])
+
+        self.requests += 1
+        code = bytes(web3.eth.get_code(address))
+
+        if code.startswith(PROXY_PREFIX) and code.endswith(PROXY_SUFFIX):
+            self.requests += 1
+            code = bytes(web3.eth.get_code(to_checksum_address(code[len(PROXY_PREFIX):-len(PROXY_SUFFIX)])))
+
+        logs_changes = CONFIGURATION_CHANGED in code
+
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO code VALUES (?, ?)', (address, logs_changes))
+
+        return logs_changes
+
+    def _invalidate(self, head):
+        '''
+        Drops the entries whose block was reorged away or whose unit logged
+        a configuration change since, the rest become valid at `head`.
+        '''
+        entries = self.connection.execute('SELECT address, block, hash FROM units').fetchall()
+
+        if not entries:
+            return
+
+        stale = set()
+
+        for block in {block for _, block, _ in entries}:
+            if block > head['number']:
+                # The chain went back below the cached block
+                canonical = None
+            else:
+                self.requests += 1
+                canonical = web3.eth.get_block(block)['hash'].hex()
+
+            stale |= {address for address, number, hash in entries if number == block and hash != canonical}
+
+        valid = [(address, block) for address, block, _ in entries if address not in stale]
+
+        if valid and min(block for _, block in valid) < head['number']:
+            self.requests += 1
+
+            logs = web3.eth.get_logs({
+                'fromBlock': min(block for _, block in valid) + 1,
+                'toBlock': head['number'],
+                'address': [address for address, _ in valid],
+                'topics': ['0x' + CONFIGURATION_CHANGED.hex()],
+            })
+
+            blocks = dict(valid)
+
+            stale |= {
+                to_checksum_address(log['address']) for log in logs
+                if log['blockNumber'] > blocks[to_checksum_address(log['address'])]
+            }
+
+        self.invalidated += len(stale)
+
+        with self.connection:
+            self.connection.executemany('DELETE FROM units WHERE address = ?', [(address,) for address in stale])
+            self.connection.execute('UPDATE units SET block = ?, hash = ?', (head['number'], head['hash'].hex()))
+
+    def _snapshot(self, unit, token, block):
+        '''
+        Returns the snapshot() fields at `block`, read one by one from
+        contracts deployed before snapshot() was added
+        '''
+        self.requests += 1
+
+        try:
+            snapshot = unit.functions.snapshot().call(block_identifier=block)
+        except (BadFunctionCallOutput, ContractLogicError):
+            pass
+        else:
+            return {
+                name: list(value) if isinstance(value, (list, tuple)) else value
+                for name, value in zip(SNAPSHOT, snapshot)
+            }
+
+        # The pending distributions and balance are counted by _fresh()
+        self.requests += GETTER_CALLS - 2
+
+        view = unit.functions
+
+        state = {
+            'owner': view.owner().call(block_identifier=block),
+            'start_timestamp': view.start_timestamp().call(block_identifier=block),
+            'distributions_counter': view.distributions_counter().call(block_identifier=block),
+            'members': [view.members(ix).call(block_identifier=block) for ix in range(MEMBERS)],
+            'equities': [view.equities(ix).call(block_identifier=block) for ix in range(MEMBERS)],
+            'vendors': [view.vendors(ix).call(block_identifier=block) for ix in range(VENDORS)],
+            'fees': [view.fees(ix).call(block_identifier=block) for ix in range(VENDORS)],
+            'token': token,
+        }
+
+        state.update(self._fresh(unit, token, block))
+
+        return state
+
+    def _fresh(self, unit, token, block):
+        self.requests += 2
+
+        try:
+            pending = unit.functions.pending_distributions().call(block_identifier=block)
+        except ContractLogicError:
+            # Reverts while the start date is in the future
+            pending = 0
+
+        balance = web3.eth.contract(address=token, abi=BALANCE_OF_ABI).functions.balanceOf(unit.address).call(
+            block_identifier=block
+        )
+
+        return {'pending_distributions': pending, 'token_balance': balance}
+
+    def read(self, units):
+        '''
+        Returns {unit: state} at the current block for (unit, token) address
+        pairs, state holds the configuration fields of snapshot() and the
+        pending distributions and token balance
+        '''
+        self.requests += 1
+        head = web3.eth.get_block('latest')
+
+        self._invalidate(head)
+
+        states = {}
+
+        for address, token in units:
+            address, token = to_checksum_address(address), to_checksum_address(token)
+            # Plain web3 contract, Unit.at() would fetch the code
+            unit = web3.eth.contract(address=address, abi=Unit.abi)
+
+            self.uncached_requests += GETTER_CALLS
+
+            row = self.connection.execute('SELECT configuration FROM units WHERE address = ?', (address,)).fetchone()
+
+            if row:
+                self.hits += 1
+
+                state = json.loads(row[0])
+                state.update(self._fresh(unit, state['token'], head['number']))
+            else:
+                state = self._snapshot(unit, token, head['number'])
+
+                if self._logs_changes(address):
+                    self.misses += 1
+
+                    with self.connection:
+                        self.connection.execute(
+                            'INSERT OR REPLACE INTO units VALUES (?, ?, ?, ?)',
+                            (address, head['number'], head['hash'].hex(), json.dumps({name: state[name] for name in CONFIGURATION})),
+                        )
+                else:
+                    self.uncacheable += 1
+
+            states[address] = {name: state[name] for name in CONFIGURATION + ['pending_distributions', 'token_balance']}
+
+        return states
+
+    def report(self):
+        reads = self.hits + self.misses + self.uncacheable
+
+        return (
+            f'{reads} reads: {self.hits} hits ({self.hits / max(reads, 1):.0%}), {self.misses} misses, '
+            f'{self.uncacheable} not cacheable, {self.invalidated} entries invalidated; '
+            f'{self.requests} RPC calls, {self.uncached_requests - self.requests} saved over reading the getters'
+        )
+
+def main():
+    with open(REGISTRY) as f:
+        units = [(entry['unit'], entry['token']) for entry in json.load(f)]
+
+    cache = UnitCache(DATABASE)
+
+    started = time.perf_counter()
+    states = cache.read(units)
+
+    for address, state in states.items():
+        members = sum(member != ZERO for member in state['members'])
+
+        print(f'{address}  {members} members  {state["pending_distributions"]} pending  {state["token_balance"] / 10**18:>16,.2f}')
+
+    print(f'Read {len(states)} units in {time.perf_counter() - started:.2f}s')
+    print(cache.report())
@@ -0,0 +1,9 @@
+import pytest
+
+@pytest.fixture(scope='module', autouse=True)
+def chain_isolation(request):
+    # Every module starts from a clean chain, so modules can run in any order
+    # and on any worker when the suite runs in parallel. Modules running on
+    # an in-process EVM do not touch the local chain.
+    if not getattr(request.module, 'IN_PROCESS_EVM', False):
+        request.getfixturevalue('module_isolation')
@@ -0,0 +1,362 @@
+'''
+Pure-Python reference model of the Unit and Cell contracts.
+
+Mirrors the integer semantics of the Vyper sources (floor division, checked
+uint256 arithmetic, assert messages) so scenarios can be evaluated in-process
+and compared against the deployed contracts.
+'''
+
+UINT256_MAX = 2**256 - 1
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+class Revert(Exception):
+    '''
+    Raised wherever the contract would revert, `message` is the assert
+    reason (or dev comment) brownie reports for the same revert.
+    '''
+    def __init__(self, message=None):
+        super().__init__(message)
+        self.message = message
+
+def checked(value):
+    if value < 0:
+        raise Revert('Integer underflow')
+
+    if value > UINT256_MAX:
+        raise Revert('Integer overflow')
+
+    return value
+
+class UnitModel:
+    MONTH_TIMEDELTA = 2629800
+    DISTRIBUTION_THRESHOLD = 1_000_000_000_000_000_000
+
+    MEMBERS = 7
+    SHARES = 10000
+
+    VENDORS = 3
+
+    # Fees are packed in 85 bit lanes
+    FEE_MAX = 2**85 - 1
+
+    def __init__(self, start_timestamp, members, equities, vendors, fees, owner):
+        self._check_members(members, equities)
+        self._check_vendors(vendors, fees)
+
+        self.start_timestamp = start_timestamp
+        self.distributions_counter = 0
+
+        self.owner = owner
+
+        self.members = list(members)
+        self.equities = list(equities)
+
+        self.vendors = list(vendors)
+        self.fees = list(fees)
+
+        # Vendors get what the balance covers instead of reverting, the rest
+        # is owed per vendor slot
+        self.arrears_mode = False
+        self.arrears = [0] * self.VENDORS
+
+        # Distributions log a single round instead of one event per receiver
+        self.compact_events = False
+
+        # Token balance held by the contract
+        self.balance = 0
+
+        # Tokens received by every address ever paid
+        self.received = {}
+
+    def _check_members(self, members, equities):
+        assert len(members) == len(equities) == self.MEMBERS
+
+        total = 0
+
+        for member, equity in zip(members, equities):
+            if not ((member == ZERO and equity == 0) or (member != ZERO and equity > 0)):
+                raise Revert('Only zero address can have zero equity')
+
+            total = checked(total + equity)
+
+        if total != self.SHARES:
+            raise Revert('Equities sum not equals total shares')
+
+    def _check_vendors(self, vendors, fees):
+        assert len(vendors) == len(fees) == self.VENDORS
+
+        for vendor, fee in zip(vendors, fees):
+            if not ((vendor == ZERO and fee == 0) or (vendor != ZERO and fee > 0)):
+                raise Revert('Only zero address can have zero fee')
+
+            if fee > self.FEE_MAX:
+                raise Revert('Fee exceeds the maximum')
+
+    def _check_arrears(self, vendors):
+        if not self.arrears_mode:
+            return
+
+        for vendor, current, owed in zip(vendors, self.vendors, self.arrears):
+            if owed > 0 and vendor != current:
+                raise Revert('Vendor has arrears')
+
+    def _check_owner(self, sender):
+        if sender != self.owner:
+            raise Revert('dev: Caller is not the owner')
+
+    def pending_distributions(self, timestamp):
+        if not timestamp > self.start_timestamp:
+            raise Revert('dev: Contract start date is in the future')
+
+        months_since_start = (timestamp - self.start_timestamp) // self.MONTH_TIMEDELTA
+
+        return checked(months_since_start - self.distributions_counter)
+
+    def deposit(self, amount):
+        self.balance += amount
+
+    def distribute(self, timestamp):
+        '''
+        Returns the list of (receiver, amount) transfers, in the same order
+        as the Distribution logs emitted by the contract.
+        '''
+        token_balance = self.balance
+
+        if not token_balance > self.DISTRIBUTION_THRESHOLD:
+            raise Revert('Balance below the distribution threshold')
+
+        pending_distributions = self.pending_distributions(timestamp)
+
+        transfers = []
+        arrears = self.arrears
+
+        if pending_distributions > 0 or self.arrears_mode:
+            vendors_total = 0
+
+            for fee in self.fees:
+                vendors_total = checked(vendors_total + checked(fee * pending_distributions))
+
+            due = [fee * pending_distributions for fee in self.fees]
+
+            if self.arrears_mode:
+                amounts = [0] * self.VENDORS
+                available = token_balance
+
+                # Arrears first, then the pending months, in slot order
+                for ix in range(self.VENDORS):
+                    amounts[ix] = min(self.arrears[ix], available)
+                    available -= amounts[ix]
+
+                for ix in range(self.VENDORS):
+                    amount = min(due[ix], available)
+                    available -= amount
+
+                    amounts[ix] += amount
+
+                arrears = [checked(owed + amount) - paid for owed, amount, paid in zip(self.arrears, due, amounts)]
+            else:
+                if not token_balance >= vendors_total:
+                    raise Revert('Insufficient balance to pay vendors')
+
+                amounts = due
+
+            distributions_counter = checked(self.distributions_counter + pending_distributions)
+
+            for vendor, amount in zip(self.vendors, amounts):
+                if amount > 0:
+                    transfers.append((vendor, amount))
+
+            token_balance -= sum(amounts)
+        else:
+            distributions_counter = self.distributions_counter
+
+        for member, equity in zip(self.members, self.equities):
+            amount = checked(token_balance * equity) // self.SHARES
+
+            if amount > 0:
+                transfers.append((member, amount))
+
+        # Nothing is written until every check has passed, as a revert would
+        self.distributions_counter = distributions_counter
+        self.arrears = arrears
+        self.balance -= sum(amount for _, amount in transfers)
+
+        self.received = dict(self.received)
+
+        for receiver, amount in transfers:
+            self.received[receiver] = self.received.get(receiver, 0) + amount
+
+        return transfers
+
+    def change_owner(self, sender, new_owner):
+        self._check_owner(sender)
+
+        self.owner = new_owner
+
+    def change_members_and_equities(self, sender, timestamp, members, equities):
+        self._check_owner(sender)
+
+        if self.pending_distributions(timestamp) != 0:
+            raise Revert('There are pending distributions')
+
+        self._check_members(members, equities)
+
+        self.members = list(members)
+        self.equities = list(equities)
+
+    def change_vendors_and_fees(self, sender, timestamp, vendors, fees):
+        self._check_owner(sender)
+
+        if self.pending_distributions(timestamp) != 0:
+            raise Revert('There are pending distributions')
+
+        self._check_vendors(vendors, fees)
+        self._check_arrears(vendors)
+
+        self.vendors = list(vendors)
+        self.fees = list(fees)
+
+    def change_arrears_mode(self, sender, enabled):
+        self._check_owner(sender)
+
+        if not enabled and any(self.arrears):
+            raise Revert('Vendors have arrears')
+
+        self.arrears_mode = enabled
+
+    def change_compact_events(self, sender, enabled):
+        self._check_owner(sender)
+
+        self.compact_events = enabled
+
+    def reconfigure(self, sender, timestamp, members, equities, vendors, fees):
+        self._check_owner(sender)
+
+        if self.pending_distributions(timestamp) != 0:
+            raise Revert('There are pending distributions')
+
+        self._check_members(members, equities)
+        self._check_vendors(vendors, fees)
+        self._check_arrears(vendors)
+
+        self.members = list(members)
+        self.equities = list(equities)
+
+        self.vendors = list(vendors)
+        self.fees = list(fees)
+
+    def shutdown(self, sender):
+        '''
+        Returns the list of (receiver, amount) transfers.
+        '''
+        self._check_owner(sender)
+
+        transfers = []
+
+        # Vendor arrears first, as far as the balance goes
+        if self.arrears_mode:
+            for vendor, owed in zip(self.vendors, self.arrears):
+                amount = min(owed, self.balance)
+
+                if amount > 0:
+                    transfers.append((vendor, amount))
+
+                    self.balance -= amount
+
+        if self.balance > 0:
+            transfers.append((self.owner, self.balance))
+
+        self.balance = 0
+
+        return transfers
+
+class CellModel:
+    SIZE = 4
+
+    def __init__(self, rate, members, equities, owner, threshold=0, interval=0, timestamp=0):
+        assert len(members) == len(equities) == self.SIZE
+
+        total = 0
+
+        for equity in equities:
+            if not 0 <= equity <= 255:
+                raise OverflowError(equity)
+
+            total += equity
+
+            # uint8 accumulator
+            if total > 255:
+                raise Revert('Integer overflow')
+
+        if total != 100:
+            raise Revert()
+
+        self.rate = rate
+        self.members = list(members)
+        self.owner = owner
+        self.equities = list(equities)
+
+        self.threshold = threshold
+        self.interval = interval
+        self.last_distribution = timestamp
+
+        # Ether balance held by the contract
+        self.balance = 0
+
+    @staticmethod
+    def calculate(amount, equities):
+        return [checked(amount * equity) // 100 for equity in equities]
+
+    def _due(self, timestamp):
+        if self.threshold == 0 and self.interval == 0:
+            return True
+
+        if self.threshold > 0 and self.balance >= self.threshold:
+            return True
+
+        return self.interval > 0 and timestamp >= self.last_distribution + self.interval
+
+    def _distribute(self, timestamp=0):
+        if self.interval > 0:
+            self.last_distribution = timestamp
+
+        splits = self.calculate(self.balance, self.equities)
+
+        self.balance -= sum(splits)
+
+        return list(zip(self.members, splits))
+
+    def receive(self, value):
+        '''
+        Plain ether transfer, handled by __default__
+        '''
+        self.balance += value
+
+    def distribute(self, timestamp=0):
+        return self._distribute(timestamp)
+
+    def pay(self, value, timestamp=0):
+        '''
+        Returns the transfers, none while payments accumulate
+        '''
+        self.balance += value
+
+        return self._distribute(timestamp) if self._due(timestamp) else []
+
+    def shutdown(self, sender):
+        '''
+        Returns the list of (receiver, amount) transfers, the owner gets
+        the remaining balance on selfdestruct.
+        '''
+        if sender != self.owner:
+            raise Revert()
+
+        transfers = self._distribute()
+
+        transfers.append((self.owner, self.balance))
+
+        self.balance = 0
+
+        return transfers
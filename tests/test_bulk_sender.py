@@ -0,0 +1,208 @@
+import pytest
+
+from eth_account import Account
+
+from scripts.bulk_sender import PipelinedSender, administration
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+MONTH_TIMEDELTA = 2629800
+DAY = 86400
+
+GAS = 600_000
+
+def ether(value):
+    return value * 10**18
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+@pytest.fixture(scope='module')
+def admin(accounts):
+    key = Account.create()
+
+    accounts[0].transfer(key.address, ether(10))
+
+    yield key
+
+@pytest.fixture(scope='module')
+def units(Unit, Token, admin, chain, accounts):
+    token = Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': accounts[0]})
+
+    units = []
+
+    for _ in range(3):
+        unit = Unit.deploy(
+            chain.time() - MONTH_TIMEDELTA - DAY,
+            token,
+            [accounts[3], accounts[4], accounts[5], ZERO, ZERO, ZERO, ZERO],
+            [       5000,        3000,        2000,    0,    0,    0,    0],
+            [ accounts[6], ZERO, ZERO],
+            [  ether(150),    0,    0],
+            {'from': accounts[1]}
+        )
+
+        token.transfer(unit, ether(10_000), {'from': accounts[0]})
+        unit.change_owner(admin.address, {'from': accounts[1]})
+
+        units.append(unit)
+
+    yield units
+
+def max_fee(tx):
+    '''
+    Max fee of `tx`, the gas price of a legacy transaction
+    '''
+    return tx.fields.get('maxFeePerGas', tx.fields.get('gasPrice'))
+
+def submit(sender, calls):
+    return [
+        sender.submit(unit.address, getattr(unit, name).encode_input(*args), GAS)
+        for unit, name, args in calls
+    ]
+
+def test_pipeline_confirms_every_transaction(admin, units, web3):
+    sender = PipelinedSender(admin)
+
+    # Member changes are only accepted after the distribution before them
+    calls = administration(units, 9)
+    submit(sender, calls)
+
+    receipts = sender.wait()
+
+    assert [receipt['status'] for receipt in receipts] == [1] * 9
+    assert [web3.eth.get_transaction(receipt['transactionHash'])['nonce'] for receipt in receipts] == list(range(sender.nonce - 9, sender.nonce))
+
+    for unit in units:
+        assert unit.distributions_counter() == 1
+        assert unit.equities(1) == 5000
+        assert unit.fees(0) == ether(200)
+
+def test_lost_transaction_is_broadcast_again(admin, units, web3, monkeypatch):
+    sender = PipelinedSender(admin)
+
+    send = web3.eth.send_raw_transaction
+    lost = []
+
+    def flaky(raw):
+        if not lost:
+            lost.append(raw)
+            raise OSError('Connection reset')
+
+        return send(raw)
+
+    monkeypatch.setattr(web3.eth, 'send_raw_transaction', flaky)
+
+    # The later nonces wait behind the gap
+    submit(sender, administration(units, 3))
+
+    receipts = sender.wait(timeout=60)
+
+    assert [receipt['status'] for receipt in receipts] == [1] * 3
+    assert sender.rebroadcasts >= 1
+
+def test_legacy_gas_price_without_base_fee(admin, units, web3):
+    # The istanbul development chain predates London
+    assert web3.eth.get_block('latest').get('baseFeePerGas') is None
+
+    sender = PipelinedSender(admin)
+
+    tx, = submit(sender, administration(units, 1))
+
+    assert 'type' not in tx.fields and 'maxFeePerGas' not in tx.fields
+    assert tx.fields['gasPrice'] == min(web3.eth.gas_price, sender.max_fee)
+
+    receipt, = sender.wait(timeout=60)
+
+    assert receipt['status'] == 1
+    assert web3.eth.get_transaction(receipt['transactionHash'])['gasPrice'] == tx.fields['gasPrice']
+
+def test_reorged_transaction_is_mined_again(admin, units, chain):
+    sender = PipelinedSender(admin, confirmations=3)
+
+    chain.snapshot()
+
+    tx, = submit(sender, administration(units, 1))
+
+    assert sender.poll() == 1
+
+    orphaned = tx.receipt['blockHash']
+
+    # Replaced by a longer chain without the transaction
+    chain.revert()
+    chain.mine(3)
+
+    sender.poll()
+    chain.mine(3)
+
+    assert sender.poll() == 0
+    assert tx.confirmed
+    assert tx.receipt['blockHash'] != orphaned
+    assert sender.rebroadcasts == 1
+    assert units[0].distributions_counter() == 1
+
+def test_stuck_transaction_is_replaced(admin, units, chain, web3):
+    sender = PipelinedSender(admin, stuck_after=0)
+
+    web3.provider.make_request('miner_stop', [])
+
+    try:
+        tx, = submit(sender, administration(units, 1))
+
+        fees = max_fee(tx), tx.fields.get('maxPriorityFeePerGas')
+
+        # Still pending, so replaced with higher fees right away
+        assert sender.poll() == 1
+        assert sender.replacements == 1
+        assert len(tx.hashes) == 2
+
+        assert fees[0] < max_fee(tx) <= sender.max_fee
+
+        if fees[1] is not None:
+            assert tx.fields['maxPriorityFeePerGas'] > fees[1]
+
+        chain.mine()
+    finally:
+        web3.provider.make_request('miner_start', [])
+
+    receipt, = sender.wait(timeout=60)
+
+    assert receipt['status'] == 1
+    assert receipt['transactionHash'] == tx.hashes[-1]
+    assert units[0].distributions_counter() == 1
+
+def test_fees_are_not_bumped_above_the_cap(admin, units, web3):
+    sender = PipelinedSender(admin, stuck_after=0)
+
+    web3.provider.make_request('miner_stop', [])
+
+    try:
+        tx, = submit(sender, administration(units, 1))
+
+        # The cap is already reached, the transaction waits as it is
+        sender.max_fee = max_fee(tx)
+
+        assert sender.poll() == 1
+        assert sender.replacements == 0
+        assert len(tx.hashes) == 1
+    finally:
+        web3.provider.make_request('miner_start', [])
+
+def test_reorged_receipt_of_a_used_nonce_is_waited_for(admin, units, monkeypatch):
+    sender = PipelinedSender(admin)
+
+    tx, = submit(sender, administration(units, 1))
+
+    # Mined, but its receipt is not on the canonical chain yet
+    receipt = sender._receipt
+    monkeypatch.setattr(sender, '_receipt', lambda tx: None)
+
+    assert sender.poll() == 1
+    assert not tx.confirmed
+
+    monkeypatch.setattr(sender, '_receipt', receipt)
+
+    assert sender.poll() == 0
+    assert tx.confirmed
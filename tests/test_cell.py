@@ -9,7 +9,7 @@ def owner(accounts):
 
 @pytest.fixture()
 def cell(Cell, accounts, owner):
-    return Cell.deploy(6000, accounts[:4], equities, { 'from': owner })
+    return Cell.deploy(6000, accounts[:4], equities, 0, 0, False, { 'from': owner })
 
 def test_constructor_members(cell, accounts):
     for i in range(4):
@@ -17,7 +17,7 @@ def test_constructor_members(cell, accounts):
 
 def test_constructor_members_lenght(Cell, accounts, owner):
     with pytest.raises(ValueError):
-        Cell.deploy(6000, accounts[:5], equities, { 'from': owner })
+        Cell.deploy(6000, accounts[:5], equities, 0, 0, False, { 'from': owner })
 
 def test_constructor_owner(cell, owner):
     assert cell.owner() == owner
@@ -28,19 +28,19 @@ def test_constructor_equities(cell, accounts):
 
 def test_constructor_equities_lenght(Cell, accounts, owner):
     with pytest.raises(ValueError):
-        Cell.deploy(6000, accounts[:4], [20, 20, 20, 20, 20], { 'from': owner })
+        Cell.deploy(6000, accounts[:4], [20, 20, 20, 20, 20], 0, 0, False, { 'from': owner })
 
 def test_constructor_equities_sum_100(Cell, accounts, owner):
     with brownie.reverts():
-        Cell.deploy(6000, accounts[:4], [20, 20, 20, 20], { 'from': owner })
+        Cell.deploy(6000, accounts[:4], [20, 20, 20, 20], 0, 0, False, { 'from': owner })
 
 def test_constructor_equities_greater_equal_zero(Cell, accounts, owner):
     with pytest.raises(OverflowError):
-        Cell.deploy(6000, accounts[:4], [-10, 0, 10, 100], { 'from': owner })
+        Cell.deploy(6000, accounts[:4], [-10, 0, 10, 100], 0, 0, False, { 'from': owner })
 
 def test_constructor_equities_less_equal_100(Cell, accounts, owner):
     with brownie.reverts():
-        Cell.deploy(6000, accounts[:4], [110, 0, 0, 0], { 'from': owner })
+        Cell.deploy(6000, accounts[:4], [110, 0, 0, 0], 0, 0, False, { 'from': owner })
 
 def test_calculate_never_exceeds_balance(cell, accounts):
     eth = 1_000_000_000_000_000_000
@@ -69,6 +69,17 @@ def test_pay_equity_split(cell, accounts):
 
     assert new_balances == expected_balances
 
+def test_pay_compact_events(Cell, accounts, owner):
+    cell = Cell.deploy(6000, accounts[:4], equities, 0, 0, True, { 'from': owner })
+
+    assert cell.compact_events()
+
+    tx = cell.pay({ 'from': accounts[4], 'amount': 1000 })
+
+    assert 'Distribution' not in tx.events
+    assert tx.events['DistributionRound']['receivers'] == accounts[:4]
+    assert tx.events['DistributionRound']['amounts'] == [600, 200, 100, 100]
+
 def test_shutdown_only_owner(cell, accounts):
     with brownie.reverts():
         cell.shutdown({ 'from': accounts[1] })
@@ -86,3 +97,52 @@ def test_shutdown_forward_owner(cell, accounts, owner):
     cell.shutdown({ 'from': owner })
 
     assert owner.balance() == expected_balance
+
+@pytest.fixture()
+def accumulating_cell(Cell, accounts, owner):
+    # Fans out from 5000 wei or once a day
+    return Cell.deploy(6000, accounts[:4], equities, 5000, 86400, False, { 'from': owner })
+
+def test_pay_accumulates_below_threshold(accumulating_cell, accounts):
+    tx = accumulating_cell.pay({ 'from': accounts[4], 'amount': 1000 })
+
+    assert 'Distribution' not in tx.events
+    assert accumulating_cell.balance() == 1000
+
+def test_pay_distributes_from_threshold_and_carries_dust(accumulating_cell, accounts):
+    expected_balances = [
+        account.balance() + split
+        for account, split in zip( accounts[:4], [3001 + 3000, 1000 + 1000, 500 + 500, 500 + 500] )
+    ]
+
+    accumulating_cell.pay({ 'from': accounts[4], 'amount': 1000 })
+
+    # 5002 wei split into (3001, 1000, 500, 500), 1 spare wei is kept
+    tx = accumulating_cell.pay({ 'from': accounts[4], 'amount': 4002 })
+
+    assert len(tx.events['Distribution']) == 4
+    assert accumulating_cell.balance() == 1
+
+    # The spare wei is part of the next distribution, 5000 wei split exactly
+    accumulating_cell.pay({ 'from': accounts[4], 'amount': 4999 })
+
+    assert accumulating_cell.balance() == 0
+
+    new_balances = [ account.balance() for account in accounts[:4] ]
+
+    assert new_balances == expected_balances
+
+def test_pay_distributes_after_interval(accumulating_cell, accounts, chain):
+    accumulating_cell.pay({ 'from': accounts[4], 'amount': 1000 })
+
+    chain.sleep(86400)
+
+    tx = accumulating_cell.pay({ 'from': accounts[4], 'amount': 10 })
+
+    assert len(tx.events['Distribution']) == 4
+    assert accumulating_cell.last_distribution() == tx.timestamp
+
+    # The interval starts again from the last distribution
+    tx = accumulating_cell.pay({ 'from': accounts[4], 'amount': 1000 })
+
+    assert 'Distribution' not in tx.events
@@ -0,0 +1,69 @@
+import os
+import pytest
+
+## Gas of many small Cell payments
+#
+# Sends CELL_GAS_PAYMENTS payments to a Cell distributing on every payment and
+# to one accumulating up to a threshold, and compares the total gas paid.
+# Also compares a payment logging one event per member with a compact one.
+
+PAYMENTS = int(os.environ.get('CELL_GAS_PAYMENTS', '1000'))
+
+AMOUNT = 10**15 # 0.001 ether
+
+# Fans out every 100 payments
+THRESHOLD = 100 * AMOUNT
+
+equities = [60, 20, 10, 10]
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+def test_accumulation_gas(Cell, accounts):
+    MEMBERS = accounts[:4]
+    PAYER = accounts[4]
+    OWNER = accounts[5]
+
+    gas_used = {}
+
+    for name, threshold in [('eager', 0), ('accumulating', THRESHOLD)]:
+        cell = Cell.deploy(6000, MEMBERS, equities, threshold, 0, False, { 'from': OWNER })
+
+        before = [ member.balance() for member in MEMBERS ]
+
+        gas_used[name] = sum(
+            cell.pay({ 'from': PAYER, 'amount': AMOUNT }).gas_used
+            for _ in range(PAYMENTS)
+        )
+
+        received = [ member.balance() - balance for member, balance in zip(MEMBERS, before) ]
+
+        # Nothing is lost, what is not distributed yet stays in the cell
+        assert sum(received) + cell.balance() == PAYMENTS * AMOUNT
+
+        if PAYMENTS % 100 == 0:
+            assert received == [ PAYMENTS * AMOUNT * equity // 100 for equity in equities ]
+
+    print(f"\n{PAYMENTS} payments: {gas_used['eager']:,} gas eager, {gas_used['accumulating']:,} gas accumulating")
+
+    assert gas_used['accumulating'] < gas_used['eager']
+
+def test_compact_events_gas(Cell, accounts):
+    MEMBERS = accounts[:4]
+    PAYER = accounts[4]
+    OWNER = accounts[5]
+
+    gas_used = {}
+
+    for name, compact in [('events', False), ('compact', True)]:
+        cell = Cell.deploy(6000, MEMBERS, equities, 0, 0, compact, { 'from': OWNER })
+
+        # Members hold ether from the second payment on
+        cell.pay({ 'from': PAYER, 'amount': AMOUNT })
+
+        gas_used[name] = cell.pay({ 'from': PAYER, 'amount': AMOUNT }).gas_used
+
+    print(f"\nCell.pay(): {gas_used['events']:,} gas with one event per member, {gas_used['compact']:,} gas compact")
+
+    assert gas_used['compact'] < gas_used['events']
@@ -0,0 +1,50 @@
+import random
+import pytest
+
+from eth_account import Account
+
+from scripts.cell_load import EQUITIES, fund, percentile, run_load, schedule, table
+
+PAYMENTS = 60
+PAYERS = 6
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+def test_percentile():
+    values = list(range(1, 101))
+
+    assert [percentile(values, q) for q in (1, 50, 90, 99, 100)] == [1, 50, 90, 99, 100]
+    assert percentile([7], 50) == 7
+
+def test_schedule_splits_payments_among_payers():
+    amounts = schedule(random.Random(0), 10, 3)
+
+    assert [len(paid) for paid in amounts] == [4, 3, 3]
+    assert all(amount % 100 == 0 for paid in amounts for amount in paid)
+
+def test_load_configurations(accounts):
+    payers = [Account.create() for _ in range(PAYERS)]
+    members = [Account.create().address for _ in EQUITIES]
+
+    amounts = schedule(random.Random(0), PAYMENTS, PAYERS)
+
+    fund(payers, amounts, 3, accounts[0])
+
+    results = [run_load(name, payers, amounts, members, accounts[0]) for name in ('eager', 'accumulating', 'default')]
+
+    print('\n' + table(results))
+
+    eager, accumulating, default = results
+
+    for result in results:
+        assert result['payments'] == PAYMENTS
+        assert result['correct']
+
+    assert eager['distributions'] == PAYMENTS
+    # Fans out every ~100 payments, the rest by the final distribute()
+    assert accumulating['distributions'] < PAYMENTS
+    assert default['distributions'] == 0
+
+    assert default['gas'] < accumulating['gas'] < eager['gas']
@@ -0,0 +1,333 @@
+import pytest
+import brownie
+from brownie.network.state import Chain
+from datetime import datetime, timedelta
+
+chain = Chain()
+
+## Accounts
+#
+# 0. Client / Also owner of TST contract
+# CLIENT = accounts[0]
+#
+# 1. Contract owner
+# OWNER = accounts[1]
+#
+# 2. Keeper, triggers distributions
+# KEEPER = accounts[2]
+#
+# 3. Member A 50% equity
+# MEMBER_A = accounts[3]
+#
+# 4. Member B 30% equity
+# MEMBER_B = accounts[4]
+#
+# 5. Member C 20% equity
+# MEMBER_C = accounts[5]
+#
+# 6. Vendor A 150 TST
+# VENDOR_A = accounts[6]
+#
+# 7. Vendor B  50 TST
+# VENDOR_B = accounts[7]
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+MONTH_TIMEDELTA = 2629800
+
+# Contract start date is set to the first day of the next month
+START = datetime(datetime.now().year, datetime.now().month, 1) + timedelta(days=31)
+
+def ether(value):
+    return value * 10**18
+
+def chain_sleep(interval):
+    chain.sleep( int( interval.total_seconds() ) )
+    chain.mine()
+
+@pytest.fixture(scope='module')
+def token(Token, accounts):
+    CLIENT = accounts[0]
+
+    yield Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': CLIENT})
+
+@pytest.fixture(scope='module')
+def group(ClaimUnit, token, accounts):
+    OWNER = accounts[1]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    yield ClaimUnit.deploy(
+        int( START.timestamp() ), # seconds
+        token,
+        [MEMBER_A, MEMBER_B, MEMBER_C],
+        [    5000,     3000,     2000],
+        [  VENDOR_A,  VENDOR_B, ZERO],
+        [ether(150), ether(50),    0],
+        {'from': OWNER}
+    )
+
+def test_equities_should_equal_shares_when_deploying(ClaimUnit, token, accounts):
+    OWNER = accounts[1]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    VENDOR_A = accounts[6]
+
+    with brownie.reverts('Equities sum not equals total shares'):
+        ClaimUnit.deploy(
+            int( START.timestamp() ), # seconds
+            token,
+            [MEMBER_A, MEMBER_B],
+            [    5000,      500],
+            [  VENDOR_A, ZERO, ZERO],
+            [ether(150),    0,    0],
+            {'from': OWNER}
+        )
+
+    with brownie.reverts('Every member needs an address and non-zero equity'):
+        ClaimUnit.deploy(
+            int( START.timestamp() ), # seconds
+            token,
+            [MEMBER_A, MEMBER_B, ZERO],
+            [    5000,     5000,    0],
+            [  VENDOR_A, ZERO, ZERO],
+            [ether(150),    0,    0],
+            {'from': OWNER}
+        )
+
+    with brownie.reverts('Members and equities length mismatch'):
+        ClaimUnit.deploy(
+            int( START.timestamp() ), # seconds
+            token,
+            [MEMBER_A, MEMBER_B],
+            [   10000],
+            [  VENDOR_A, ZERO, ZERO],
+            [ether(150),    0,    0],
+            {'from': OWNER}
+        )
+
+def test_distribution_credits_without_transfers(token, group, accounts):
+    CLIENT = accounts[0]
+    KEEPER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    # ~10th day of the month following the start date
+    interval = START + timedelta(days=40) - datetime.now()
+    chain_sleep(interval)
+
+    assert group.pending_distributions() == 1
+
+    token.transfer(group, ether(10200), {'from': CLIENT})
+
+    tx = group.distribute({'from': KEEPER})
+
+    assert 'Transfer' not in tx.events
+
+    assert group.withdrawable(MEMBER_A) == ether(5000)
+    assert group.withdrawable(MEMBER_B) == ether(3000)
+    assert group.withdrawable(MEMBER_C) == ether(2000)
+    assert group.withdrawable(VENDOR_A) == ether( 150)
+    assert group.withdrawable(VENDOR_B) == ether(  50)
+
+    assert token.balanceOf(group) == ether(10200)
+    assert group.reserved() == ether(10200)
+    assert group.distributions_counter() == 1
+
+def test_reserved_tokens_are_not_distributed_again(token, group, accounts):
+    KEEPER = accounts[2]
+
+    with brownie.reverts('Balance below the distribution threshold'):
+        group.distribute({'from': KEEPER})
+
+def test_claim(token, group, accounts):
+    MEMBER_A = accounts[3]
+    VENDOR_A = accounts[6]
+
+    group.claim({'from': MEMBER_A})
+    group.claim({'from': VENDOR_A})
+
+    assert token.balanceOf(MEMBER_A) == ether(5000)
+    assert token.balanceOf(VENDOR_A) == ether( 150)
+
+    assert group.withdrawable(MEMBER_A) == 0
+    assert group.reserved() == ether(10200 - 5150)
+
+    with brownie.reverts('Nothing to claim'):
+        group.claim({'from': MEMBER_A})
+
+def test_credits_accumulate_between_claims(token, group, accounts):
+    CLIENT = accounts[0]
+    KEEPER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    VENDOR_A = accounts[6]
+
+    # About two months without triggering a distribution
+    chain_sleep(timedelta(days=60))
+
+    assert group.pending_distributions() == 2
+
+    token.transfer(group, ether(10400), {'from': CLIENT})
+
+    group.distribute({'from': KEEPER})
+
+    assert group.withdrawable(MEMBER_A) == ether(5000)
+    assert group.withdrawable(MEMBER_B) == ether(6000)
+    # Vendors get credited twice (once per month)
+    assert group.withdrawable(VENDOR_A) == ether( 300)
+
+    assert group.distributions_counter() == 3
+
+def test_pay_vendors_first(token, group, accounts):
+    CLIENT = accounts[0]
+    KEEPER = accounts[2]
+
+    chain_sleep(timedelta(days=30))
+
+    token.transfer(group, ether(10), {'from': CLIENT})
+
+    with brownie.reverts('Insufficient balance to pay vendors'):
+        group.distribute({'from': KEEPER})
+
+    token.transfer(group, ether(190), {'from': CLIENT})
+
+    group.distribute({'from': KEEPER})
+
+def test_change_members_settles_credits(token, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    KEEPER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+
+    before = [group.withdrawable(member) for member in (MEMBER_A, MEMBER_B, MEMBER_C)]
+
+    with brownie.reverts('dev: Caller is not the owner'):
+        group.change_members_and_equities([MEMBER_A, MEMBER_B], [5000, 5000], {'from': MEMBER_B})
+
+    group.change_members_and_equities([MEMBER_A, MEMBER_B], [5000, 5000], {'from': OWNER})
+
+    assert group.equities(MEMBER_C) == 0
+
+    token.transfer(group, ether(2000), {'from': CLIENT})
+
+    group.distribute({'from': KEEPER})
+
+    # Removed members keep what they had earned
+    assert group.withdrawable(MEMBER_A) == before[0] + ether(1000)
+    assert group.withdrawable(MEMBER_B) == before[1] + ether(1000)
+    assert group.withdrawable(MEMBER_C) == before[2]
+
+    group.claim({'from': MEMBER_C})
+
+    assert token.balanceOf(MEMBER_C) == before[2]
+
+def test_distribute_gas_is_flat(ClaimUnit, Token, accounts):
+    CLIENT = accounts[0]
+    KEEPER = accounts[2]
+
+    gas_used = {}
+
+    for members in (3, 200):
+        # Fresh token, vendors start from an empty balance for both sizes
+        token = Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': CLIENT})
+
+        addresses = [f'0x{0xa000 + ix:040x}' for ix in range(members)]
+        equities = [10000 // members] * members
+        equities[0] += 10000 % members
+
+        unit = ClaimUnit.deploy(
+            chain.time() - MONTH_TIMEDELTA - 86400,
+            token,
+            addresses,
+            equities,
+            [accounts[6], accounts[7], ZERO],
+            [ether(150), ether(50),       0],
+            {'from': CLIENT}
+        )
+
+        token.transfer(unit, ether(10000), {'from': CLIENT})
+
+        gas_used[members] = unit.distribute({'from': KEEPER}).gas_used
+
+    # Same storage writes whatever the number of members
+    assert abs(gas_used[200] - gas_used[3]) <= 200
+
+def test_shutdown_keeps_credits_of_removed_members(ClaimUnit, token, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    KEEPER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+
+    unit = ClaimUnit.deploy(
+        chain.time() - MONTH_TIMEDELTA - 86400,
+        token,
+        [MEMBER_A, MEMBER_B, MEMBER_C],
+        [    5000,     3000,     2000],
+        [  VENDOR_A, ZERO, ZERO],
+        [ether(150),    0,    0],
+        {'from': OWNER}
+    )
+
+    token.transfer(unit, ether(10_200), {'from': CLIENT})
+
+    unit.distribute({'from': KEEPER})
+
+    unit.change_members_and_equities([MEMBER_A, MEMBER_B], [5000, 5000], {'from': OWNER})
+
+    assert unit.withdrawable(MEMBER_C) == ether(2010)
+
+    # Received after the last distribution, returned to the owner
+    token.transfer(unit, ether(5), {'from': CLIENT})
+
+    before = {account: token.balanceOf(account) for account in (OWNER, MEMBER_A, MEMBER_B, MEMBER_C, VENDOR_A)}
+
+    unit.shutdown({'from': OWNER})
+
+    assert token.balanceOf(OWNER) == before[OWNER] + ether(5)
+    assert token.balanceOf(MEMBER_A) == before[MEMBER_A] + ether(5025)
+    assert token.balanceOf(MEMBER_B) == before[MEMBER_B] + ether(3015)
+    assert token.balanceOf(VENDOR_A) == before[VENDOR_A] + ether(150)
+
+    assert unit.shut_down()
+    assert token.balanceOf(unit) == unit.credited() == ether(2010)
+
+    with brownie.reverts('Unit is shut down'):
+        unit.distribute({'from': KEEPER})
+
+    unit.claim({'from': MEMBER_C})
+
+    assert token.balanceOf(MEMBER_C) == before[MEMBER_C] + ether(2010)
+    assert token.balanceOf(unit) == unit.credited() == 0
+
+def test_shutdown(token, group, accounts):
+    OWNER = accounts[1]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    owed = {
+        account: token.balanceOf(account) + group.withdrawable(account)
+        for account in (MEMBER_A, MEMBER_B, VENDOR_A, VENDOR_B)
+    }
+
+    with brownie.reverts('dev: Caller is not the owner'):
+        group.shutdown({'from': MEMBER_A})
+
+    group.shutdown({'from': OWNER})
+
+    for account, amount in owed.items():
+        assert token.balanceOf(account) == amount
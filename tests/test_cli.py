@@ -0,0 +1,74 @@
+import pytest
+import brownie
+
+from scripts.cli import Session, Signer, parse_pairs, tokens
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+MONTH_TIMEDELTA = 2629800
+DAY = 86400
+
+def ether(value):
+    return value * 10**18
+
+@pytest.fixture(scope='module')
+def token(Token, accounts):
+    yield Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': accounts[0]})
+
+@pytest.fixture(scope='module')
+def unit(Unit, token, chain, accounts):
+    # One pending month
+    yield Unit.deploy(
+        chain.time() - MONTH_TIMEDELTA - DAY,
+        token,
+        [accounts[3], accounts[4], ZERO, ZERO, ZERO, ZERO, ZERO],
+        [      5000,        5000,    0,    0,    0,    0,    0],
+        [accounts[6], ZERO, ZERO],
+        [ ether(150),    0,    0],
+        {'from': accounts[1]}
+    )
+
+@pytest.fixture(scope='module')
+def session(unit, accounts):
+    session = Session(brownie.web3, unit.address, interactive=False)
+
+    # Ganache accounts are unlocked on the node
+    session._signer = Signer(brownie.web3, unlocked=accounts[1].address)
+
+    yield session
+
+def test_parse_pairs(accounts):
+    assert parse_pairs([f'{accounts[3]}:150.5'], 3, tokens) == (
+        [accounts[3], ZERO, ZERO],
+        [ether(150) + ether(1) // 2, 0, 0],
+    )
+
+    with pytest.raises(ValueError):
+        parse_pairs(['0x1:1'] * 4, 3, int)
+
+def test_status(session, unit, token, accounts, capsys):
+    token.transfer(unit, ether(1000), {'from': accounts[0]})
+
+    session.onecmd('status')
+
+    out = capsys.readouterr().out
+
+    assert '0 distributions, 1 pending' in out
+    assert f'{accounts[6]} 150' in out
+    assert 'Balance:   1000' in out
+
+def test_edits_require_no_pending_distributions(session, unit, accounts):
+    with pytest.raises(AssertionError):
+        session.onecmd(f'members {accounts[3]}:10000')
+
+    session.onecmd('distribute')
+
+    assert unit.distributions_counter() == 1
+
+    session.onecmd(f'members {accounts[3]}:6000 {accounts[5]}:4000')
+    session.onecmd(f'vendors {accounts[6]}:99.5')
+
+    assert [unit.members(ix) for ix in range(3)] == [accounts[3], accounts[5], ZERO]
+    assert [unit.equities(ix) for ix in range(3)] == [6000, 4000, 0]
+    assert unit.fees(0) == ether(99) + ether(1) // 2
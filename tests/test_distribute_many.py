@@ -0,0 +1,208 @@
+import pytest
+import brownie
+
+## Accounts
+#
+# 0. Client / Also owner of the token contracts
+# CLIENT = accounts[0]
+#
+# 1. Contract owner
+# OWNER = accounts[1]
+#
+# 3. Member A 50% equity
+# MEMBER_A = accounts[3]
+#
+# 4. Member B 30% equity
+# MEMBER_B = accounts[4]
+#
+# 5. Member C 20% equity
+# MEMBER_C = accounts[5]
+#
+# 6. Vendor A 150 DAI
+# VENDOR_A = accounts[6]
+#
+# 7. Vendor B  50 DAI
+# VENDOR_B = accounts[7]
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+MONTH_TIMEDELTA = 2629800
+DAY = 86400
+
+def ether(value):
+    return value * 10**18
+
+def usdc(value):
+    return value * 10**6
+
+def accept(token, threshold, group, owner):
+    '''
+    Accepts `token` as an extra token of `group`
+    '''
+    group.change_threshold(token, threshold, {'from': owner})
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    # Every test starts from the freshly deployed contracts, one month pending
+    pass
+
+@pytest.fixture(scope='module')
+def dai(Token, accounts):
+    yield Token.deploy('Dai Stablecoin', 'DAI', 18, ether(1_000_000), {'from': accounts[0]})
+
+@pytest.fixture(scope='module')
+def usd(Token, accounts):
+    yield Token.deploy('USD Coin', 'USDC', 6, usdc(1_000_000), {'from': accounts[0]})
+
+@pytest.fixture(scope='module')
+def group(Unit, dai, chain, accounts):
+    OWNER = accounts[1]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    # One pending month
+    yield Unit.deploy(
+        chain.time() - MONTH_TIMEDELTA - DAY,
+        dai,
+        [MEMBER_A, MEMBER_B, MEMBER_C, ZERO, ZERO, ZERO, ZERO],
+        [    5000,     3000,     2000,    0,    0,    0,    0],
+        [  VENDOR_A,  VENDOR_B, ZERO],
+        [ether(150), ether(50),    0],
+        {'from': OWNER}
+    )
+
+def test_only_accepted_tokens(usd, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+
+    usd.transfer(group, usdc(1000), {'from': CLIENT})
+
+    with brownie.reverts('Token not accepted'):
+        group.distribute_many([usd], {'from': CLIENT})
+
+    with brownie.reverts('dev: Caller is not the owner'):
+        group.change_threshold(usd, usdc(1), {'from': CLIENT})
+
+    group.change_threshold(usd, usdc(1), {'from': OWNER})
+
+    assert group.thresholds(usd) == usdc(1)
+
+def test_primary_token_threshold_is_fixed(dai, group, accounts):
+    OWNER = accounts[1]
+
+    with brownie.reverts('Primary token threshold is fixed'):
+        group.change_threshold(dai, ether(10), {'from': OWNER})
+
+def test_distribute_many(dai, usd, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    accept(usd, usdc(1), group, OWNER)
+
+    dai.transfer(group, ether(10200), {'from': CLIENT})
+    usd.transfer(group, usdc(1000), {'from': CLIENT})
+
+    tx = group.distribute_many([usd], {'from': CLIENT})
+
+    # Vendors are paid in the primary token only
+    assert dai.balanceOf(VENDOR_A) == ether(150)
+    assert dai.balanceOf(VENDOR_B) == ether( 50)
+    assert usd.balanceOf(VENDOR_A) == 0
+
+    assert dai.balanceOf(MEMBER_A) == ether(5000)
+    assert dai.balanceOf(MEMBER_B) == ether(3000)
+    assert dai.balanceOf(MEMBER_C) == ether(2000)
+
+    assert usd.balanceOf(MEMBER_A) == usdc(500)
+    assert usd.balanceOf(MEMBER_B) == usdc(300)
+    assert usd.balanceOf(MEMBER_C) == usdc(200)
+
+    assert group.distributions_counter() == 1
+
+    assert len(tx.events['Distribution']) == 5
+    assert len(tx.events['TokenDistribution']) == 3
+
+def test_tokens_below_threshold_are_skipped(dai, usd, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    MEMBER_A = accounts[3]
+
+    accept(usd, usdc(1), group, OWNER)
+
+    # Settles the pending month, nothing is left of either token
+    dai.transfer(group, ether(10200), {'from': CLIENT})
+    usd.transfer(group, usdc(1000), {'from': CLIENT})
+
+    group.distribute_many([usd], {'from': CLIENT})
+
+    with brownie.reverts('Balance below the distribution threshold'):
+        group.distribute_many([usd], {'from': CLIENT})
+
+    # The primary token is below the threshold, vendors are not due anyway
+    usd.transfer(group, usdc(100), {'from': CLIENT})
+
+    group.distribute_many([usd], {'from': CLIENT})
+
+    assert usd.balanceOf(MEMBER_A) == usdc(550)
+    assert group.distributions_counter() == 1
+
+def test_shutdown_returns_accepted_tokens(Token, dai, usd, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+
+    eur = Token.deploy('Euro Coin', 'EUROC', 6, usdc(1_000_000), {'from': CLIENT})
+
+    accept(usd, usdc(1), group, OWNER)
+    accept(eur, usdc(1), group, OWNER)
+
+    # Dropped and accepted again, counted once
+    accept(eur, 0, group, OWNER)
+    accept(eur, usdc(1), group, OWNER)
+
+    assert group.accepted_tokens() == 2
+
+    dai.transfer(group, ether(1000), {'from': CLIENT})
+    usd.transfer(group, usdc(500), {'from': CLIENT})
+    eur.transfer(group, usdc(300), {'from': CLIENT})
+
+    with brownie.reverts('Accepted tokens missing'):
+        group.shutdown({'from': OWNER})
+
+    with brownie.reverts('Accepted tokens missing'):
+        group.shutdown([usd], {'from': OWNER})
+
+    with brownie.reverts('Duplicate token'):
+        group.shutdown([usd, usd], {'from': OWNER})
+
+    with brownie.reverts('Token not accepted'):
+        group.shutdown([usd, dai], {'from': OWNER})
+
+    group.shutdown([eur, usd], {'from': OWNER})
+
+    assert dai.balanceOf(OWNER) == ether(1000)
+    assert usd.balanceOf(OWNER) == usdc(500)
+    assert eur.balanceOf(OWNER) == usdc(300)
+
+def test_accepted_tokens_are_limited(Token, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+
+    # As many as shutdown() takes
+    for ix in range(8):
+        token = Token.deploy('Extra Token', 'EXT', 18, ether(1), {'from': CLIENT})
+
+        accept(token, ether(1), group, OWNER)
+
+    token = Token.deploy('Extra Token', 'EXT', 18, ether(1), {'from': CLIENT})
+
+    with brownie.reverts('Too many accepted tokens'):
+        accept(token, ether(1), group, OWNER)
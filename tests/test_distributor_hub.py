@@ -0,0 +1,128 @@
+import pytest
+
+from eth_account import Account
+
+from scripts.hub_distribute import distribute
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+MONTH_TIMEDELTA = 2629800
+DAY = 86400
+
+# DistributorHub outcomes
+DISTRIBUTED = 0
+BELOW_THRESHOLD = 1
+INSUFFICIENT_FOR_VENDORS = 2
+NOT_STARTED = 3
+FAILED = 4
+
+def ether(value):
+    return value * 10**18
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+@pytest.fixture(scope='module')
+def token(Token, accounts):
+    yield Token.deploy('Test Token', 'TST', 18, ether(10_000_000), {'from': accounts[0]})
+
+@pytest.fixture(scope='module')
+def hub(DistributorHub, accounts):
+    yield DistributorHub.deploy({'from': accounts[0]})
+
+def deploy(Unit, token, accounts, start, recipients=None):
+    # Units of co-ops have their own members and vendor
+    members = recipients or [accounts[3], accounts[4], accounts[5], accounts[6]]
+
+    return Unit.deploy(
+        start,
+        token,
+        members[:3] + [ZERO] * 4,
+        [5000, 3000, 2000, 0, 0, 0, 0],
+        [members[3], ZERO, ZERO],
+        [ether(150), 0, 0],
+        {'from': accounts[1]}
+    )
+
+def test_outcomes(Unit, hub, token, chain, accounts):
+    started = chain.time() - MONTH_TIMEDELTA - DAY
+
+    ready, empty, short = [deploy(Unit, token, accounts, started) for _ in range(3)]
+    future = deploy(Unit, token, accounts, chain.time() + MONTH_TIMEDELTA)
+
+    token.transfer(ready, ether(10_200), {'from': accounts[0]})
+    token.transfer(short, ether(100), {'from': accounts[0]})
+    token.transfer(future, ether(10_200), {'from': accounts[0]})
+
+    # A contract without distribute() and an account without code fail
+    # without reverting the others
+    addresses = [ready, empty, short, future, token, accounts[7]]
+
+    expected = [DISTRIBUTED, BELOW_THRESHOLD, INSUFFICIENT_FOR_VENDORS, NOT_STARTED, FAILED, FAILED]
+
+    assert hub.distribute.call(addresses, {'from': accounts[2]}) == expected
+
+    tx = hub.distribute(addresses, {'from': accounts[2]})
+
+    assert tx.events['DistributionResults']['addresses'] == addresses
+    assert tx.events['DistributionResults']['outcomes'] == expected
+
+    assert ready.distributions_counter() == 1
+    assert token.balanceOf(ready) == 0
+    assert token.balanceOf(accounts[6]) == ether(150)
+
+    for unit in (empty, short, future):
+        assert unit.distributions_counter() == 0
+
+    # Nothing left to distribute
+    assert hub.distribute.call([ready], {'from': accounts[2]}) == [BELOW_THRESHOLD]
+
+def test_driver_only_sends_batches_with_eligible_units(Unit, hub, token, chain, accounts):
+    started = chain.time() - MONTH_TIMEDELTA - DAY
+
+    units = [deploy(Unit, token, accounts, started) for _ in range(5)]
+
+    for unit in units[3:]:
+        token.transfer(unit, ether(10_200), {'from': accounts[0]})
+
+    height = chain.height
+
+    outcomes = distribute(hub, [unit.address for unit in units], accounts[2], batch=2)
+
+    assert list(outcomes.values()) == [BELOW_THRESHOLD] * 3 + [DISTRIBUTED] * 2
+
+    # The first batch was only dry run
+    assert chain.height == height + 2
+
+def test_distribute_gas(Unit, hub, token, chain, accounts):
+    started = chain.time() - MONTH_TIMEDELTA - DAY
+
+    print()
+
+    for count in (1, 10, 50):
+        single = [deploy(Unit, token, accounts, started, [Account.create().address for _ in range(4)]) for _ in range(count)]
+        hubbed = [deploy(Unit, token, accounts, started, [Account.create().address for _ in range(4)]) for _ in range(count)]
+
+        # Recipients hold tokens from the second round on, a first round of
+        # 50 units does not fit a 12M gas block
+        for unit in single + hubbed:
+            token.transfer(unit, ether(10_200), {'from': accounts[0]})
+            unit.distribute({'from': accounts[2]})
+
+        chain.sleep(MONTH_TIMEDELTA)
+
+        for unit in single + hubbed:
+            token.transfer(unit, ether(10_200), {'from': accounts[0]})
+
+        individual = sum(unit.distribute({'from': accounts[2]}).gas_used for unit in single)
+
+        tx = hub.distribute(hubbed, {'from': accounts[2]})
+
+        assert tx.events['DistributionResults']['outcomes'] == [DISTRIBUTED] * count
+
+        print(f'{count} units: {individual:,} gas in single transactions, {tx.gas_used:,} gas through the hub ({(individual - tx.gas_used) // count:,} saved per unit)')
+
+        if count > 1:
+            assert tx.gas_used < individual
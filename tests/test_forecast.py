@@ -0,0 +1,154 @@
+import os
+import time
+import pytest
+import brownie
+import numpy as np
+
+from model import Revert, UnitModel, ZERO
+from scripts.forecast import MONTH_TIMEDELTA, VENDORS, ether, random_scenarios, simulate
+
+## Cash-flow simulator against the reference model and the contract
+#
+# FORECAST_SCENARIOS scenarios of FORECAST_MONTHS months are simulated in one
+# batch and checked against tests/model.py, FORECAST_REPLAYS of them are also
+# replayed month by month on the local chain.
+
+SEED = int(os.environ.get('FORECAST_SEED', '0'))
+SCENARIOS = int(os.environ.get('FORECAST_SCENARIOS', '500'))
+MONTHS = int(os.environ.get('FORECAST_MONTHS', '36'))
+REPLAYS = int(os.environ.get('FORECAST_REPLAYS', '3'))
+
+DAY = 86400
+
+# The keeper runs ~10 days into every month
+OFFSET = 10 * DAY
+
+MEMBERS = [f'0x{0xa000 + ix:040x}' for ix in range(7)]
+VENDOR_ADDRESSES = [f'0x{0xb000 + ix:040x}' for ix in range(VENDORS)]
+
+def vendors(fees):
+    return [VENDOR_ADDRESSES[ix] if fee > 0 else ZERO for ix, fee in enumerate(fees)]
+
+@pytest.fixture(scope='module')
+def scenarios():
+    rng = np.random.default_rng(SEED)
+
+    payments, runs, fees = random_scenarios(rng, SCENARIOS, MONTHS, missed_run=0.3, fee_change=0.1)
+
+    # Wei level payments and a vendor the balance cannot always cover
+    payments[::3] = rng.integers(0, 10**6, payments[::3].shape).astype(object) * 10**17 + 7
+    fees[::5, :, 1] = ether(3000)
+
+    equities = rng.integers(1, 2500, (SCENARIOS, 7))
+    equities[:, 4:] = 0
+    equities[:, 3] = 10000 - equities[:, :3].sum(axis=1)
+
+    started = time.perf_counter()
+    result = simulate(payments, runs, fees, equities)
+
+    print(f'\n{SCENARIOS * MONTHS:,} scenario-months in {time.perf_counter() - started:.3f}s')
+
+    yield payments, runs, fees, equities, result
+
+def model_run(payments, runs, fees, equities):
+    '''
+    Same scenario on the reference model, returns (model, received, rejected)
+    '''
+    members = [MEMBERS[ix] if equity > 0 else ZERO for ix, equity in enumerate(equities)]
+
+    model = UnitModel(0, members, [int(equity) for equity in equities], vendors(fees[0]), list(fees[0]), 'owner')
+
+    received = {}
+    rejected = 0
+
+    for ix in range(len(payments)):
+        timestamp = (ix + 1) * MONTH_TIMEDELTA + OFFSET
+
+        model.deposit(payments[ix])
+
+        if runs[ix]:
+            try:
+                for receiver, amount in model.distribute(timestamp):
+                    received[receiver] = received.get(receiver, 0) + amount
+            except Revert:
+                pass
+
+        if ix + 1 < len(payments) and list(fees[ix + 1]) != model.fees:
+            try:
+                model.change_vendors_and_fees('owner', timestamp, vendors(fees[ix + 1]), list(fees[ix + 1]))
+            except Revert:
+                rejected += 1
+
+    return model, received, rejected
+
+def test_simulator_matches_model(scenarios):
+    payments, runs, fees, equities, result = scenarios
+
+    for ix in range(SCENARIOS):
+        model, received, rejected = model_run(payments[ix], runs[ix], fees[ix], equities[ix])
+
+        assert list(result['members'][ix]) == [received.get(address, 0) for address in MEMBERS], ix
+        assert list(result['vendors'][ix]) == [received.get(address, 0) for address in VENDOR_ADDRESSES], ix
+
+        assert result['balance'][ix] == model.balance, ix
+        assert result['distributions_counter'][ix] == model.distributions_counter, ix
+        assert result['rejected_fee_changes'][ix] == rejected, ix
+
+    # Every revert path is exercised
+    assert result['below_threshold'].sum() > 0
+    assert result['insufficient_balance'].sum() > 0
+    assert result['rejected_fee_changes'].sum() > 0
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+@pytest.mark.parametrize('index', range(REPLAYS))
+def test_chain_replay(Unit, Token, chain, accounts, scenarios, index):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    KEEPER = accounts[2]
+
+    payments, runs, fees, equities, result = scenarios
+
+    # Spread the replays over the batch
+    ix = index * SCENARIOS // REPLAYS
+
+    token = Token.deploy('Test Token', 'TST', 18, sum(payments[ix]), {'from': CLIENT})
+
+    start = chain.time()
+
+    unit = Unit.deploy(
+        start,
+        token,
+        [MEMBERS[slot] if equity > 0 else ZERO for slot, equity in enumerate(equities[ix])],
+        [int(equity) for equity in equities[ix]],
+        vendors(fees[ix][0]),
+        list(fees[ix][0]),
+        {'from': OWNER}
+    )
+
+    for month in range(MONTHS):
+        chain.sleep(start + (month + 1) * MONTH_TIMEDELTA + OFFSET - chain.time())
+        chain.mine()
+
+        if payments[ix][month] > 0:
+            token.transfer(unit, payments[ix][month], {'from': CLIENT})
+
+        if runs[ix][month]:
+            try:
+                unit.distribute({'from': KEEPER})
+            except brownie.exceptions.VirtualMachineError:
+                pass
+
+        if month + 1 < MONTHS and [unit.fees(slot) for slot in range(VENDORS)] != list(fees[ix][month + 1]):
+            try:
+                unit.change_vendors_and_fees(vendors(fees[ix][month + 1]), list(fees[ix][month + 1]), {'from': OWNER})
+            except brownie.exceptions.VirtualMachineError:
+                pass
+
+    assert [token.balanceOf(address) for address in MEMBERS] == list(result['members'][ix])
+    assert [token.balanceOf(address) for address in VENDOR_ADDRESSES] == list(result['vendors'][ix])
+
+    assert token.balanceOf(unit) == result['balance'][ix]
+    assert unit.distributions_counter() == result['distributions_counter'][ix]
@@ -0,0 +1,72 @@
+import pytest
+
+from scripts.gas_profile import Profile, step_costs
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+MONTH_TIMEDELTA = 2629800
+DAY = 86400
+
+def ether(value):
+    return value * 10**18
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+def test_step_costs_exclude_callee_gas():
+    trace = [
+        {'depth': 0, 'gas': 1000, 'gasCost': 3},
+        {'depth': 0, 'gas': 997, 'gasCost': 700}, # CALL
+        {'depth': 1, 'gas': 500, 'gasCost': 10},
+        {'depth': 1, 'gas': 490, 'gasCost': 5},
+        {'depth': 1, 'gas': 485, 'gasCost': 0},
+        {'depth': 0, 'gas': 900, 'gasCost': 3},
+        {'depth': 0, 'gas': 897, 'gasCost': 0},
+    ]
+
+    assert step_costs(trace) == [3, 82, 10, 5, 0, 3, 0]
+
+def test_distribute_profile(Unit, Token, chain, accounts, tmp_path):
+    token = Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': accounts[0]})
+
+    unit = Unit.deploy(
+        chain.time() - MONTH_TIMEDELTA - DAY,
+        token,
+        [accounts[3], accounts[4], accounts[5], ZERO, ZERO, ZERO, ZERO],
+        [       5000,        3000,        2000,    0,    0,    0,    0],
+        [ accounts[6], ZERO, ZERO],
+        [  ether(150),    0,    0],
+        {'from': accounts[1]}
+    )
+
+    # Leaves dust behind, clearing the balance slot would refund gas
+    token.transfer(unit, ether(10_000) + 7, {'from': accounts[0]})
+
+    tx = unit.distribute({'from': accounts[2]})
+
+    profile = Profile()
+    outside = profile.add(tx, 'distribute')
+
+    # Only the base cost and calldata are left outside the trace
+    assert 21000 <= outside < 22000
+
+    functions = {function for _, function, _ in profile.lines}
+
+    assert {'Unit.distribute', 'Unit._vendors_due', 'Unit._pending_distributions', 'Unit._distribute', 'Unit._payouts', 'Token.transfer_batch'} <= functions
+
+    loops = {loop for (function, loop) in profile.blocks if function == 'Unit._payouts'}
+
+    assert 'for ix in range(VENDORS)' in ' '.join(filter(None, loops))
+    assert 'for ix in range(MEMBERS)' in ' '.join(filter(None, loops))
+
+    assert sum(profile.lines.values()) == tx.gas_used
+
+    path = tmp_path / 'distribute.folded'
+    profile.write_folded(path)
+
+    stacks = [line.rsplit(' ', 1) for line in path.read_text().splitlines()]
+
+    assert sum(int(gas) for _, gas in stacks) >= tx.gas_used
+    assert any(stack.startswith('distribute;Unit._distribute;Token.transfer_batch;') for stack, _ in stacks)
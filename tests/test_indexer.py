@@ -0,0 +1,208 @@
+import os
+import time
+import pytest
+from collections import Counter
+
+from eth_utils import to_checksum_address
+
+from scripts.indexer import Indexer, decode_round, monthly_received
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+MONTH_TIMEDELTA = 2629800
+DAY = 86400
+
+# Cell payments generated for the benchmark, 4 distributions each
+PAYMENTS = int(os.environ.get('INDEXER_BENCHMARK', '250'))
+
+def ether(value):
+    return value * 10**18
+
+def expected_rows(history):
+    '''
+    Counts the indexed events of the given transactions by (event, account)
+    '''
+    rows = Counter()
+
+    for tx in history:
+        for name in ('Distribution', 'Payment', 'TokenDistribution'):
+            for event in tx.events[name] if name in tx.events else []:
+                account = event['receiver'] if 'receiver' in event else event['sender']
+                rows[name, account] += 1
+
+    return rows
+
+def stored_rows(indexer):
+    return Counter(indexer.connection.execute('SELECT event, account FROM events'))
+
+@pytest.fixture(scope='module')
+def cell(Cell, accounts):
+    yield Cell.deploy(6000, accounts[:4], [40, 30, 20, 10], 0, 0, False, {'from': accounts[0]})
+
+@pytest.fixture(scope='module')
+def unit(Unit, Token, chain, accounts):
+    token = Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': accounts[0]})
+
+    unit = Unit.deploy(
+        chain.time() - MONTH_TIMEDELTA - DAY,
+        token,
+        [accounts[3], accounts[4], accounts[5], ZERO, ZERO, ZERO, ZERO],
+        [      5000,        3000,        2000,    0,    0,    0,    0],
+        [accounts[6], ZERO, ZERO],
+        [ ether(150),    0,    0],
+        {'from': accounts[1]}
+    )
+
+    token.transfer(unit, ether(10_000), {'from': accounts[0]})
+
+    yield unit
+
+@pytest.fixture(scope='module')
+def indexer(cell, unit, chain, tmp_path_factory):
+    yield Indexer(
+        str(tmp_path_factory.mktemp('indexer') / 'distributions.sqlite'),
+        [cell.address, unit.address],
+        start_block=chain.height,
+        confirmations=4,
+    )
+
+def test_index_distributions(cell, unit, indexer, accounts):
+    history = [unit.distribute({'from': accounts[2]})]
+
+    for ix in range(PAYMENTS):
+        history.append(cell.pay({'from': accounts[ix % 10], 'value': 1000 + ix}))
+
+    started = time.perf_counter()
+    added = indexer.run()
+    elapsed = time.perf_counter() - started
+
+    print(f'\nIndexed {added} events in {elapsed:.2f}s ({added / elapsed:.0f} events/s, {indexer.requests} requests)')
+
+    assert added == sum(expected_rows(history).values())
+    assert stored_rows(indexer) == expected_rows(history)
+
+    started = time.perf_counter()
+    report = monthly_received(indexer.connection)
+
+    print(f'Monthly report built in {(time.perf_counter() - started) * 1000:.1f}ms')
+
+    received = Counter()
+
+    for (account, _), amount in report.items():
+        received[account] += amount
+
+    # Exact integer totals, amounts do not fit SQLite integers
+    for tx in history:
+        for event in tx.events['Distribution']:
+            received[event['receiver']] -= event['amount']
+
+    assert not +received and not -received
+
+def test_incremental_run_does_not_duplicate(cell, indexer, accounts):
+    before = stored_rows(indexer)
+
+    # Only the confirmation window is indexed again
+    indexer.run()
+
+    assert stored_rows(indexer) == before
+
+    tx = cell.pay({'from': accounts[0], 'value': 500})
+
+    indexer.run()
+
+    assert stored_rows(indexer) == before + expected_rows([tx])
+    assert indexer.checkpoint() == tx.block_number
+
+def test_reorg_is_rolled_back(cell, indexer, chain, accounts):
+    before = stored_rows(indexer)
+
+    chain.snapshot()
+
+    # Deeper than the confirmation window
+    orphaned = [cell.pay({'from': accounts[1], 'value': 700}) for _ in range(10)]
+
+    indexer.run()
+
+    assert stored_rows(indexer) == before + expected_rows(orphaned)
+
+    chain.revert()
+
+    canonical = [cell.pay({'from': accounts[2], 'value': 900}) for _ in range(12)]
+
+    indexer.run()
+
+    assert stored_rows(indexer) == before + expected_rows(canonical)
+
+def test_decode_round():
+    receivers = [to_checksum_address(f'0x{ix:040x}') for ix in (0xa1, 0xa2, 0xa3)]
+    amounts = [10, 20, 30]
+
+    def encode(*words):
+        return b''.join(word.to_bytes(32, 'big') for word in words)
+
+    addresses = [int(receiver, 16) for receiver in receivers]
+
+    # Unit rounds, months and distributions_counter, the offsets, then each
+    # array behind its length
+    data = encode(2, 14, 4 * 32, 8 * 32, 3, *addresses, 3, *amounts)
+
+    assert decode_round(data, head=2) == list(zip(receivers, amounts))
+
+    # Cell rounds, fixed size arrays in place
+    data = encode(*addresses, 0xa4, *amounts, 40)
+
+    assert decode_round(data, size=4) == list(zip(receivers + [to_checksum_address(f'0x{0xa4:040x}')], amounts + [40]))
+
+def test_index_compact_rounds(Cell, Unit, Token, chain, accounts, tmp_path):
+    token = Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': accounts[0]})
+
+    cell = Cell.deploy(6000, accounts[:4], [40, 30, 20, 10], 0, 0, True, {'from': accounts[0]})
+
+    unit = Unit.deploy(
+        chain.time() - MONTH_TIMEDELTA - DAY,
+        token,
+        [accounts[3], accounts[4], accounts[5], ZERO, ZERO, ZERO, ZERO],
+        [      5000,        3000,        2000,    0,    0,    0,    0],
+        [accounts[6], ZERO, ZERO],
+        [ ether(150),    0,    0],
+        {'from': accounts[1]}
+    )
+
+    unit.change_compact_events(True, {'from': accounts[1]})
+
+    token.transfer(unit, ether(10_000), {'from': accounts[0]})
+
+    indexer = Indexer(str(tmp_path / 'distributions.sqlite'), [cell.address, unit.address], start_block=chain.height)
+
+    history = [unit.distribute({'from': accounts[2]})]
+    history += [cell.pay({'from': accounts[ix], 'value': 1000 + ix}) for ix in range(5)]
+
+    # One round per distribution, stored as one row per receiver
+    expected = Counter()
+
+    for tx in history:
+        assert 'Distribution' not in tx.events
+        assert len(tx.events['DistributionRound']) == 1
+
+        for receiver in tx.events['DistributionRound']['receivers']:
+            expected['Distribution', receiver] += 1
+
+        for event in tx.events['Payment'] if 'Payment' in tx.events else []:
+            expected['Payment', event['sender']] += 1
+
+    assert indexer.run() == sum(expected.values())
+    assert stored_rows(indexer) == expected
+
+    received = Counter()
+
+    for (account, _), amount in monthly_received(indexer.connection).items():
+        received[account] += amount
+
+    for tx in history:
+        event = tx.events['DistributionRound']
+
+        for receiver, amount in zip(event['receivers'], event['amounts']):
+            received[receiver] -= amount
+
+    assert not +received and not -received
@@ -0,0 +1,121 @@
+import asyncio
+import pytest
+
+from scripts.keeper import Keeper, check
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+MONTH_TIMEDELTA = 2629800
+DAY = 86400
+
+# Units deployed per state
+UNITS = 8
+
+def ether(value):
+    return value * 10**18
+
+@pytest.fixture(scope='module')
+def token(Token, accounts):
+    yield Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': accounts[0]})
+
+def deploy(Unit, token, chain, accounts, start):
+    return Unit.deploy(
+        start,
+        token,
+        [accounts[3], accounts[4], accounts[5], ZERO, ZERO, ZERO, ZERO],
+        [       5000,        3000,        2000,    0,    0,    0,    0],
+        [ accounts[6], accounts[7], ZERO],
+        [  ether(150),   ether(50),    0],
+        {'from': accounts[1]}
+    )
+
+@pytest.fixture(scope='module')
+def units(Unit, token, chain, accounts):
+    started = chain.time() - MONTH_TIMEDELTA - DAY
+
+    ready = [deploy(Unit, token, chain, accounts, started) for _ in range(UNITS)]
+    empty = [deploy(Unit, token, chain, accounts, started) for _ in range(UNITS)]
+    short = [deploy(Unit, token, chain, accounts, started) for _ in range(UNITS)]
+    future = [deploy(Unit, token, chain, accounts, chain.time() + MONTH_TIMEDELTA) for _ in range(UNITS)]
+
+    for unit in ready + future:
+        token.transfer(unit, ether(10_200), {'from': accounts[0]})
+
+    # Above the threshold, below the vendor fees
+    for unit in short:
+        token.transfer(unit, ether(10), {'from': accounts[0]})
+
+    yield {'ready': ready, 'empty': empty, 'short': short, 'future': future}
+
+def test_check():
+    assert check(ether(10), None, [ether(1), 0, 0]) == 'start date is in the future'
+    assert check(ether(1), 0, [0, 0, 0]) == 'balance below the distribution threshold'
+    assert check(ether(10), 2, [ether(5), ether(1), 0]) == 'insufficient balance to pay vendors'
+    assert check(ether(12), 2, [ether(5), ether(1), 0]) is None
+    assert check(ether(2), 0, [ether(5), ether(1), 0]) is None
+    assert check(ether(10), 2, [ether(5), ether(1), 0], arrears_mode=True) is None
+
+class RevertingEstimate:
+    address = ZERO
+
+    def distribute(self, tx):
+        # Raised by brownie when gas estimation reverts on live networks
+        raise ValueError('Gas estimation failed: execution reverted')
+
+def test_keeper_counts_distributions_failing_gas_estimation(accounts):
+    keeper = Keeper([], accounts[2])
+
+    keeper._distribute(RevertingEstimate())
+
+    assert keeper.sent == 0
+    assert keeper.failed == 1
+
+def test_keeper_only_sends_distributions_that_succeed(token, units, accounts):
+    keeper = Keeper(
+        [(unit, token) for group in units.values() for unit in group],
+        accounts[2],
+    )
+
+    asyncio.run(keeper.cycle())
+
+    assert keeper.sent == UNITS
+    assert keeper.avoided == 3 * UNITS
+    assert keeper.failed == 0
+
+    for unit in units['ready']:
+        assert unit.distributions_counter() == 1
+        assert token.balanceOf(unit) == 0
+
+    for unit in units['empty'] + units['short'] + units['future']:
+        assert unit.distributions_counter() == 0
+
+    # Nothing left to distribute
+    asyncio.run(keeper.cycle())
+
+    assert keeper.sent == UNITS
+    assert keeper.avoided == 7 * UNITS
+    assert keeper.cycles == 2
+
+def test_keeper_mirrors_units_deployed_before_preview(Unit, LegacyUnit, token, chain, accounts):
+    started = chain.time() - MONTH_TIMEDELTA - DAY
+
+    legacy = [deploy(LegacyUnit, token, chain, accounts, started) for _ in range(3)]
+
+    token.transfer(legacy[0], ether(10_200), {'from': accounts[0]})
+    token.transfer(legacy[1], ether(10), {'from': accounts[0]})
+
+    # Read through the current ABI like the registry, preview_distribution()
+    # and arrears_mode() revert on the deployed code
+    keeper = Keeper([(Unit.at(unit.address), token) for unit in legacy], accounts[2])
+
+    reasons = asyncio.run(keeper.cycle())
+
+    assert reasons == [None, 'insufficient balance to pay vendors', 'balance below the distribution threshold']
+
+    assert keeper.sent == 1
+    assert keeper.avoided == 2
+    assert keeper.failed == 0
+
+    assert legacy[0].distributions_counter() == 1
+    assert token.balanceOf(legacy[0]) == 0
@@ -0,0 +1,397 @@
+import os
+import random
+import pytest
+import brownie
+
+from model import CellModel, Revert, UnitModel, UINT256_MAX, ZERO
+
+## Differential fuzzing of Unit and Cell
+#
+# Random scenarios (equities, fees, deposits, time jumps and edits) are run
+# against the in-process reference model in tests/model.py, checking the
+# contract invariants on every step. A sampled subset of the same scenarios
+# is replayed on the local chain and compared step by step with the model.
+#
+# FUZZ_SCENARIOS sets how many scenarios run against the model,
+# FUZZ_REPLAYS how many of them are replayed on chain and FUZZ_SEED the seed.
+
+FUZZ_SEED = int(os.environ.get('FUZZ_SEED', '0'))
+FUZZ_SCENARIOS = int(os.environ.get('FUZZ_SCENARIOS', '5000'))
+FUZZ_REPLAYS = int(os.environ.get('FUZZ_REPLAYS', '20'))
+
+MONTH_TIMEDELTA = UnitModel.MONTH_TIMEDELTA
+SHARES = UnitModel.SHARES
+
+# Symbolic senders, mapped to local accounts on replay
+OWNER = 'owner'
+STRANGER = 'stranger'
+
+# Recipient addresses shared by the model and the chain replay
+MEMBERS = [f'0x{0xa000 + ix:040x}' for ix in range(10)]
+VENDORS = [f'0x{0xb000 + ix:040x}' for ix in range(5)]
+
+REPLAYS = sorted(random.Random(FUZZ_SEED).sample(range(FUZZ_SCENARIOS), min(FUZZ_REPLAYS, FUZZ_SCENARIOS)))
+
+def ether(value):
+    return value * 10**18
+
+def random_split(rng, size, total):
+    '''
+    Splits `total` among a random subset of `size` slots, empty slots are 0.
+    '''
+    active = rng.sample(range(size), rng.randint(1, min(size, total)))
+    cuts = sorted(rng.sample(range(1, total), len(active) - 1))
+    parts = [b - a for a, b in zip([0] + cuts, cuts + [total])]
+
+    out = [0] * size
+
+    for ix, part in zip(active, parts):
+        out[ix] = part
+
+    return out
+
+def random_members(rng):
+    equities = random_split(rng, UnitModel.MEMBERS, SHARES)
+
+    # Sometimes break the equity rules to exercise the validation
+    if rng.random() < 0.05:
+        equities[rng.randrange(UnitModel.MEMBERS)] += rng.choice([-1, 1])
+
+    members = [
+        rng.choice(MEMBERS) if equity != 0 else ZERO
+        for equity in equities
+    ]
+
+    if rng.random() < 0.05:
+        members[rng.randrange(UnitModel.MEMBERS)] = ZERO
+
+    return members, [max(equity, 0) for equity in equities]
+
+def random_fee(rng):
+    return rng.choice([
+        0,
+        1,
+        ether(rng.randint(1, 500)),
+        rng.randint(1, UnitModel.FEE_MAX),
+        rng.randint(UnitModel.FEE_MAX - ether(1), UnitModel.FEE_MAX),
+    ]) if rng.random() > 0.02 else rng.randint(UnitModel.FEE_MAX + 1, UINT256_MAX)
+
+def random_vendors(rng):
+    fees = [random_fee(rng) for _ in range(UnitModel.VENDORS)]
+
+    vendors = [
+        rng.choice(VENDORS) if fee != 0 else ZERO
+        for fee in fees
+    ]
+
+    if rng.random() < 0.05:
+        vendors[rng.randrange(UnitModel.VENDORS)] = ZERO
+
+    return vendors, fees
+
+def random_deposit(rng):
+    return rng.choice([
+        rng.randint(0, ether(2)),
+        ether(rng.randint(1, 20_000)),
+        rng.randint(0, 2**200),
+        rng.randint(UINT256_MAX // SHARES - ether(1), UINT256_MAX // SHARES + ether(1)),
+    ])
+
+def unit_scenario(index):
+    '''
+    Returns a scenario dict, `future_start` deploys the Unit with a start
+    date half a month ahead of the first step.
+    '''
+    rng = random.Random(f'{FUZZ_SEED}-unit-{index}')
+
+    scenario = {
+        'future_start': rng.random() < 0.05,
+        'members': random_members(rng),
+        'vendors': random_vendors(rng),
+        'steps': [],
+    }
+
+    supply = UINT256_MAX
+
+    for _ in range(rng.randint(1, 12)):
+        op = rng.choices(
+            ['sleep', 'deposit', 'distribute', 'members', 'vendors', 'reconfigure', 'arrears', 'shutdown'],
+            weights=[4, 5, 6, 1, 1, 1, 1, 0.2],
+        )[0]
+
+        sender = STRANGER if rng.random() < 0.05 else OWNER
+
+        if op == 'sleep':
+            scenario['steps'].append(('sleep', rng.choice([0, 1, 1, 2, 12, 40])))
+        elif op == 'deposit':
+            amount = min(random_deposit(rng), supply)
+            supply -= amount
+
+            scenario['steps'].append(('deposit', amount))
+        elif op == 'distribute':
+            scenario['steps'].append(('distribute',))
+        elif op == 'members':
+            scenario['steps'].append(('members', sender, *random_members(rng)))
+        elif op == 'vendors':
+            scenario['steps'].append(('vendors', sender, *random_vendors(rng)))
+        elif op == 'reconfigure':
+            scenario['steps'].append(('reconfigure', sender, *random_members(rng), *random_vendors(rng)))
+        elif op == 'arrears':
+            scenario['steps'].append(('arrears', sender, rng.random() < 0.7))
+        else:
+            scenario['steps'].append(('shutdown', sender))
+
+            break
+
+    return scenario
+
+def unit_model(scenario, base_time):
+    '''
+    Deploys the scenario on the model, the first step happens at `base_time`
+    '''
+    offset = MONTH_TIMEDELTA // 2
+    start = base_time + offset if scenario['future_start'] else base_time - offset
+
+    return UnitModel(start, *scenario['members'], *scenario['vendors'], OWNER)
+
+def unit_step(unit, step, timestamp):
+    '''
+    Applies one step to the model, returns the transfers it made
+    '''
+    op = step[0]
+
+    if op == 'deposit':
+        unit.deposit(step[1])
+        return []
+    elif op == 'distribute':
+        return unit.distribute(timestamp)
+    elif op == 'members':
+        unit.change_members_and_equities(step[1], timestamp, step[2], step[3])
+        return []
+    elif op == 'vendors':
+        unit.change_vendors_and_fees(step[1], timestamp, step[2], step[3])
+        return []
+    elif op == 'reconfigure':
+        unit.reconfigure(step[1], timestamp, *step[2:])
+        return []
+    elif op == 'arrears':
+        unit.change_arrears_mode(step[1], step[2])
+        return []
+    elif op == 'shutdown':
+        return unit.shutdown(step[1])
+
+    return []
+
+@pytest.mark.parametrize('chunk', range(10))
+def test_unit_model_invariants(chunk):
+    base_time = 1_650_000_000
+
+    for index in range(chunk, FUZZ_SCENARIOS, 10):
+        scenario = unit_scenario(index)
+
+        try:
+            unit = unit_model(scenario, base_time)
+        except Revert:
+            continue
+
+        timestamp = base_time
+        deposited = 0
+        paid = 0
+
+        for step in scenario['steps']:
+            if step[0] == 'sleep':
+                timestamp += step[1] * MONTH_TIMEDELTA
+                continue
+
+            before = dict(vars(unit))
+
+            try:
+                pending = unit.pending_distributions(timestamp)
+            except Revert:
+                pending = None
+
+            try:
+                transfers = unit_step(unit, step, timestamp)
+            except Revert:
+                # A reverted call leaves no trace
+                assert vars(unit) == before, (index, step)
+                continue
+
+            if step[0] == 'deposit':
+                deposited += step[1]
+
+            paid += sum(amount for _, amount in transfers)
+
+            # No tokens created or lost
+            assert deposited == unit.balance + paid, (index, step)
+
+            if step[0] == 'distribute':
+                vendors = [t for t in transfers if t[0] in VENDORS]
+
+                # Vendors are paid once per pending month, before members
+                assert transfers[:len(vendors)] == vendors, (index, step)
+
+                # What the vendors were not paid is owed, and members only
+                # get paid once nothing is
+                owed = sum(before['arrears']) + sum(before['fees']) * pending
+                assert sum(amount for _, amount in vendors) + sum(unit.arrears) == owed, (index, step)
+
+                if any(unit.arrears):
+                    assert before['arrears_mode'] and unit.balance == 0, (index, step)
+                    assert len(transfers) == len(vendors), (index, step)
+
+                assert unit.distributions_counter == before['distributions_counter'] + pending, (index, step)
+
+                # Totals grow by what was transferred
+                assert sum(unit.received.values()) == sum(before['received'].values()) + sum(amount for _, amount in transfers), (index, step)
+                assert unit.pending_distributions(timestamp) == 0, (index, step)
+
+                # Integer division leaves less than one token unit per member
+                assert unit.balance < UnitModel.MEMBERS, (index, step)
+
+@pytest.mark.parametrize('chunk', range(10))
+def test_cell_model_invariants(chunk):
+    for index in range(chunk, FUZZ_SCENARIOS, 10):
+        rng = random.Random(f'{FUZZ_SEED}-cell-{index}')
+
+        equities = random_split(rng, CellModel.SIZE, 100)
+        amount = rng.choice([rng.randint(0, 10**6), rng.randint(0, 2**200), rng.randint(0, UINT256_MAX)])
+
+        try:
+            splits = CellModel.calculate(amount, equities)
+        except Revert:
+            assert amount * max(equities) > UINT256_MAX
+            continue
+
+        assert sum(splits) <= amount
+        assert amount - sum(splits) < CellModel.SIZE
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+def chain_result(fn, *args):
+    '''
+    Returns the revert message, or None when the transaction succeeded
+    '''
+    try:
+        fn(*args)
+    except brownie.exceptions.VirtualMachineError as exc:
+        return exc.revert_msg or ''
+
+def check_revert(expected, actual, context):
+    assert actual is not None, f'{context}: model reverted with {expected!r}, chain did not'
+
+    # Compiler inserted checks are reported differently by brownie
+    if expected is not None and not expected.startswith('Integer'):
+        assert actual == expected, context
+
+@pytest.mark.parametrize('index', REPLAYS)
+def test_unit_replay(Unit, Token, chain, accounts, index):
+    CLIENT = accounts[0]
+    SENDERS = {OWNER: accounts[1], STRANGER: accounts[2]}
+    KEEPER = accounts[3]
+
+    scenario = unit_scenario(index)
+
+    base_time = chain.time()
+
+    try:
+        model = unit_model(scenario, base_time)
+    except Revert as exc:
+        model = None
+        expected = exc.message
+
+    token = Token.deploy('Test Token', 'TST', 18, UINT256_MAX, {'from': CLIENT})
+
+    start = base_time + MONTH_TIMEDELTA // 2 if scenario['future_start'] else base_time - MONTH_TIMEDELTA // 2
+
+    deploy_args = (start, token, *scenario['members'], *scenario['vendors'])
+
+    if model is None:
+        with brownie.reverts(expected):
+            Unit.deploy(*deploy_args, {'from': SENDERS[OWNER]})
+        return
+
+    unit = Unit.deploy(*deploy_args, {'from': SENDERS[OWNER]})
+
+    timestamp = base_time
+    received = {}
+
+    for step in scenario['steps']:
+        context = f'scenario {index}, step {step[:2]}'
+
+        if step[0] == 'sleep':
+            timestamp += step[1] * MONTH_TIMEDELTA
+            chain.sleep(step[1] * MONTH_TIMEDELTA)
+            chain.mine()
+            continue
+
+        try:
+            transfers = unit_step(model, step, timestamp)
+            expected = None
+            reverted = False
+        except Revert as exc:
+            transfers = []
+            expected = exc.message
+            reverted = True
+
+        for receiver, amount in transfers:
+            received[receiver] = received.get(receiver, 0) + amount
+
+        if step[0] == 'deposit':
+            actual = chain_result(token.transfer, unit, step[1], {'from': CLIENT})
+        elif step[0] == 'distribute':
+            actual = chain_result(unit.distribute, {'from': KEEPER})
+        elif step[0] == 'members':
+            actual = chain_result(unit.change_members_and_equities, step[2], step[3], {'from': SENDERS[step[1]]})
+        elif step[0] == 'vendors':
+            actual = chain_result(unit.change_vendors_and_fees, step[2], step[3], {'from': SENDERS[step[1]]})
+        elif step[0] == 'reconfigure':
+            actual = chain_result(unit.reconfigure, *step[2:], {'from': SENDERS[step[1]]})
+        elif step[0] == 'arrears':
+            actual = chain_result(unit.change_arrears_mode, step[2], {'from': SENDERS[step[1]]})
+        else:
+            actual = chain_result(unit.shutdown, {'from': SENDERS[step[1]]})
+
+        if reverted:
+            check_revert(expected, actual, context)
+        else:
+            assert actual is None, f'{context}: chain reverted with {actual!r}, model did not'
+
+        if step[0] == 'shutdown' and not reverted:
+            assert token.balanceOf(SENDERS[OWNER]) == received.get(OWNER, 0), context
+            break
+
+        assert token.balanceOf(unit) == model.balance, context
+        assert unit.distributions_counter() == model.distributions_counter, context
+        assert unit.arrears_mode() == model.arrears_mode, context
+        assert [unit.arrears(ix) for ix in range(UnitModel.VENDORS)] == model.arrears, context
+
+        for address in set(MEMBERS + VENDORS):
+            assert token.balanceOf(address) == received.get(address, 0), context
+            assert unit.received(address) == model.received.get(address, 0), context
+
+@pytest.mark.parametrize('index', REPLAYS)
+def test_cell_replay(Cell, accounts, index):
+    rng = random.Random(f'{FUZZ_SEED}-cell-{index}')
+
+    equities = random_split(rng, CellModel.SIZE, 100)
+
+    cell = Cell.deploy(6000, accounts[4:8], equities, 0, 0, False, {'from': accounts[0]})
+    model = CellModel(6000, [a.address for a in accounts[4:8]], equities, accounts[0].address)
+
+    for _ in range(5):
+        amount = rng.randint(0, 10**18)
+
+        assert cell.calculate(amount, equities) == CellModel.calculate(amount, equities)
+
+        expected = [account.balance() for account in accounts[4:8]]
+
+        for ix, (_, split) in enumerate(model.pay(amount)):
+            expected[ix] += split
+
+        cell.pay({'from': accounts[1], 'amount': amount})
+
+        assert [account.balance() for account in accounts[4:8]] == expected
+        assert cell.balance() == model.balance
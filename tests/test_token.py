@@ -0,0 +1,35 @@
+import pytest
+import brownie
+
+def ether(value):
+    return value * 10**18
+
+@pytest.fixture()
+def token(Token, accounts):
+    return Token.deploy('Test Token', 'TST', 18, ether(1_000), {'from': accounts[0]})
+
+def test_supports_interface(token):
+    # ERC-165 and transfer_batch(address[],uint256[])
+    assert token.supportsInterface('0x01ffc9a7')
+    assert token.supportsInterface('0x53ca06e4')
+
+    assert not token.supportsInterface('0xffffffff')
+
+def test_transfer_batch(token, accounts):
+    tx = token.transfer_batch(accounts[1:4], [ether(1), ether(2), 0], {'from': accounts[0]})
+
+    assert token.balanceOf(accounts[0]) == ether(997)
+    assert token.balanceOf(accounts[1]) == ether(1)
+    assert token.balanceOf(accounts[2]) == ether(2)
+    assert token.balanceOf(accounts[3]) == 0
+
+    assert len(tx.events['Transfer']) == 3
+    assert tx.events['Transfer'][1]['receiver'] == accounts[2]
+
+def test_transfer_batch_insufficient_balance(token, accounts):
+    with brownie.reverts('Insufficient balance'):
+        token.transfer_batch(accounts[1:3], [ether(500), ether(501)], {'from': accounts[0]})
+
+def test_transfer_batch_length_mismatch(token, accounts):
+    with brownie.reverts('Receivers and amounts length mismatch'):
+        token.transfer_batch(accounts[1:3], [ether(1)], {'from': accounts[0]})
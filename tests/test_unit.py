@@ -41,10 +41,30 @@ START = datetime(datetime.now().year, datetime.now().month, 1) + timedelta(days=
 def ether(value):
     return value * 10**18
 
-def chain_sleep(interval):
-    chain.sleep( int( interval.total_seconds() ) )
+def travel(date):
+    '''
+    Moves the chain clock forward to `date`
+    '''
+    chain.sleep( int( date.timestamp() ) - chain.time() )
     chain.mine()
 
+def settle(token, group, client):
+    '''
+    Moves to the month following the start date and runs its distribution,
+    leaving the contract without pending distributions
+    '''
+    # i.e. 2022/07/10
+    travel(START + timedelta(days=40))
+
+    token.transfer(group, ether(10200), {'from': client})
+
+    group.distribute({'from': client})
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    # Every test starts from the freshly deployed contracts, before the start date
+    pass
+
 @pytest.fixture(scope='module')
 def token(Token, accounts):
     CLIENT = accounts[0]
@@ -159,6 +179,47 @@ def test_only_zero_address_should_have_zero_fee_when_deploying(Unit, token, acco
             {'from': OWNER}
         )
 
+def test_fee_should_not_exceed_maximum_when_deploying(Unit, token, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    NEW_OWNER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    # Fees are packed in 85 bit lanes
+    with brownie.reverts('Fee exceeds the maximum'):
+        Unit.deploy(
+            int( START.timestamp() ), # seconds
+            token,
+            [MEMBER_A, MEMBER_B, MEMBER_C, ZERO, ZERO, ZERO, ZERO],
+            [    5000,     3000,     2000,    0,    0,    0,    0],
+            [  VENDOR_A,  VENDOR_B, ZERO],
+            [ether(150),     2**85,    0],
+            {'from': OWNER}
+        )
+
+def test_packed_equities_and_fees(token, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    NEW_OWNER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    assert [group.equities(ix) for ix in range(7)] == [5000, 3000, 2000, 0, 0, 0, 0]
+    assert [group.fees(ix) for ix in range(3)] == [ether(150), ether(50), 0]
+
+    with brownie.reverts():
+        group.equities(7)
+
+    with brownie.reverts():
+        group.fees(3)
+
 def test_should_not_distribute_small_balances(token, group, accounts):
     CLIENT = accounts[0]
     OWNER = accounts[1]
@@ -199,8 +260,7 @@ def test_distribution(token, group, accounts):
 
     # Make a time travel to the ~10th day of the month following the start date
     # i.e. 2022/07/10
-    interval = START + timedelta(days=40) - datetime.now()
-    chain_sleep(interval)
+    travel(START + timedelta(days=40))
 
     assert group.pending_distributions({'from': OWNER}) == 1
 
@@ -226,9 +286,11 @@ def test_skipped_distribution(token, group, accounts):
     VENDOR_A = accounts[6]
     VENDOR_B = accounts[7]
 
+    settle(token, group, CLIENT)
+
     # About two months without triggering a distribution
     # i.e. 2022/09/10
-    chain_sleep(timedelta(days=60))
+    travel(START + timedelta(days=100))
 
     assert group.pending_distributions({'from': OWNER}) == 2
 
@@ -236,7 +298,7 @@ def test_skipped_distribution(token, group, accounts):
 
     group.distribute({'from': OWNER})
 
-    # Values add up from previous balance
+    # Values add up from the first month
     assert token.balanceOf(MEMBER_A) == ether(10000)
     assert token.balanceOf(MEMBER_B) == ether( 6000)
     assert token.balanceOf(MEMBER_C) == ether( 4000)
@@ -256,6 +318,8 @@ def test_repeated_distribution(token, group, accounts):
     VENDOR_A = accounts[6]
     VENDOR_B = accounts[7]
 
+    settle(token, group, CLIENT)
+
     assert group.pending_distributions({'from': OWNER}) == 0
 
     token.transfer(group, ether(10000), {'from': CLIENT})
@@ -263,14 +327,14 @@ def test_repeated_distribution(token, group, accounts):
     group.distribute({'from': OWNER})
 
     # Values add up from previous balance
-    assert token.balanceOf(MEMBER_A) == ether(15000)
-    assert token.balanceOf(MEMBER_B) == ether( 9000)
-    assert token.balanceOf(MEMBER_C) == ether( 6000)
+    assert token.balanceOf(MEMBER_A) == ether(10000)
+    assert token.balanceOf(MEMBER_B) == ether( 6000)
+    assert token.balanceOf(MEMBER_C) == ether( 4000)
     # Vendors already got paid this month (no balance increase)
-    assert token.balanceOf(VENDOR_A) == ether(  450)
-    assert token.balanceOf(VENDOR_B) == ether(  150)
+    assert token.balanceOf(VENDOR_A) == ether(  150)
+    assert token.balanceOf(VENDOR_B) == ether(   50)
 
-    assert group.distributions_counter() == 3
+    assert group.distributions_counter() == 1
 
 def test_anyone_can_distribute(token, group, accounts):
     CLIENT = accounts[0]
@@ -282,8 +346,8 @@ def test_anyone_can_distribute(token, group, accounts):
     VENDOR_A = accounts[6]
     VENDOR_B = accounts[7]
 
-    # i.e. 2022/10/10
-    chain_sleep(timedelta(days=30))
+    # i.e. 2022/07/10
+    travel(START + timedelta(days=40))
 
     assert group.pending_distributions({'from': OWNER}) == 1
 
@@ -291,7 +355,7 @@ def test_anyone_can_distribute(token, group, accounts):
 
     group.distribute({'from': CLIENT})
 
-    assert group.distributions_counter() == 4
+    assert group.distributions_counter() == 1
 
 def test_one_pending_distribution_per_completed_month(token, group, accounts):
     CLIENT = accounts[0]
@@ -303,10 +367,12 @@ def test_one_pending_distribution_per_completed_month(token, group, accounts):
     VENDOR_A = accounts[6]
     VENDOR_B = accounts[7]
 
+    settle(token, group, CLIENT)
+
     assert group.pending_distributions({'from': OWNER}) == 0
 
-    # i.e. 2023/11/10
-    chain_sleep(timedelta(days=365))
+    # i.e. 2023/07/15
+    travel(START + timedelta(days=405))
 
     assert group.pending_distributions({'from': OWNER}) == 12
 
@@ -320,12 +386,309 @@ def test_pay_vendors_first(token, group, accounts):
     VENDOR_A = accounts[6]
     VENDOR_B = accounts[7]
 
+    settle(token, group, CLIENT)
+
+    # Twelve months to pay vendors
+    # i.e. 2023/07/15
+    travel(START + timedelta(days=405))
+
     token.transfer(group, ether(10), {'from': CLIENT})
 
     with brownie.reverts('Insufficient balance to pay vendors'):
         group.distribute({'from': OWNER})
 
-    assert group.distributions_counter() == 4
+    assert group.distributions_counter() == 1
+
+def test_arrears_mode(token, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    NEW_OWNER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    with brownie.reverts('dev: Caller is not the owner'):
+        group.change_arrears_mode(True, {'from': NEW_OWNER})
+
+    group.change_arrears_mode(True, {'from': OWNER})
+
+    assert group.arrears_mode()
+
+    # Fees are unchanged by the mode flag
+    assert [group.fees(ix) for ix in range(3)] == [ether(150), ether(50), 0]
+
+    settle(token, group, CLIENT)
+
+    # Twelve months to pay vendors, 2400 TST
+    # i.e. 2023/07/15
+    travel(START + timedelta(days=405))
+
+    token.transfer(group, ether(2000), {'from': CLIENT})
+
+    # Vendors are paid in slot order as far as the balance goes
+    tx = group.distribute({'from': OWNER})
+
+    assert group.distributions_counter() == 13
+    assert group.pending_distributions() == 0
+
+    assert [(event['receiver'], event['amount']) for event in tx.events['Distribution']] == [
+        (VENDOR_A, ether(1800)),
+        (VENDOR_B, ether(200)),
+    ]
+
+    assert [group.arrears(ix) for ix in range(3)] == [0, ether(400), 0]
+    assert token.balanceOf(group) == 0
+
+    # Members are paid again once the arrears are
+    token.transfer(group, ether(1000), {'from': CLIENT})
+
+    tx = group.distribute({'from': OWNER})
+
+    assert [(event['receiver'], event['amount']) for event in tx.events['Distribution']] == [
+        (VENDOR_B, ether(400)),
+        (MEMBER_A, ether(300)),
+        (MEMBER_B, ether(180)),
+        (MEMBER_C, ether(120)),
+    ]
+
+    assert [group.arrears(ix) for ix in range(3)] == [0, 0, 0]
+    assert group.distributions_counter() == 13
+
+    assert token.balanceOf(VENDOR_A) == ether(1950)
+    assert token.balanceOf(VENDOR_B) == ether(650)
+
+    group.change_arrears_mode(False, {'from': OWNER})
+
+    assert not group.arrears_mode()
+
+def test_vendors_with_arrears(token, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    NEW_OWNER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    group.change_arrears_mode(True, {'from': OWNER})
+
+    settle(token, group, CLIENT)
+
+    # Two months, 400 TST
+    # i.e. 2022/09/10
+    travel(START + timedelta(days=101))
+
+    token.transfer(group, ether(250), {'from': CLIENT})
+
+    group.distribute({'from': OWNER})
+
+    assert [group.arrears(ix) for ix in range(3)] == [ether(50), ether(100), 0]
+
+    with brownie.reverts('Vendors have arrears'):
+        group.change_arrears_mode(False, {'from': OWNER})
+
+    # Nothing is pending, the contract can be reconfigured
+    with brownie.reverts('Vendor has arrears'):
+        group.change_vendors_and_fees(
+            [  VENDOR_A, NEW_OWNER, ZERO],
+            [ether(150), ether(50),    0],
+            {'from': OWNER}
+        )
+
+    with brownie.reverts('Vendor has arrears'):
+        group.reconfigure(
+            [MEMBER_A, MEMBER_B, MEMBER_C, ZERO, ZERO, ZERO, ZERO],
+            [    5000,     3000,     2000,    0,    0,    0,    0],
+            [ VENDOR_B,   VENDOR_A, ZERO],
+            [ether(50), ether(150),    0],
+            {'from': OWNER}
+        )
+
+    # Fees of vendors with arrears can change, and the mode is kept
+    group.change_vendors_and_fees(
+        [  VENDOR_A,  VENDOR_B, ZERO],
+        [ether(100), ether(50),    0],
+        {'from': OWNER}
+    )
+
+    assert group.arrears_mode()
+    assert [group.fees(ix) for ix in range(3)] == [ether(100), ether(50), 0]
+
+    # Arrears are owed per slot, paid before the next month's fees
+    # i.e. 2022/10/10
+    travel(START + timedelta(days=131))
+
+    token.transfer(group, ether(250), {'from': CLIENT})
+
+    tx = group.distribute({'from': OWNER})
+
+    assert [(event['receiver'], event['amount']) for event in tx.events['Distribution']] == [
+        (VENDOR_A, ether(150)),
+        (VENDOR_B, ether(100)),
+    ]
+
+    assert [group.arrears(ix) for ix in range(3)] == [0, ether(50), 0]
+
+@pytest.mark.parametrize('deposit,paid,returned', [
+    (120, [50,  70], 0),
+    (200, [50, 100], 50),
+])
+def test_shutdown_pays_arrears(token, group, accounts, deposit, paid, returned):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    group.change_arrears_mode(True, {'from': OWNER})
+
+    settle(token, group, CLIENT)
+
+    # Two months, 400 TST
+    # i.e. 2022/09/10
+    travel(START + timedelta(days=101))
+
+    token.transfer(group, ether(250), {'from': CLIENT})
+
+    group.distribute({'from': OWNER})
+
+    assert [group.arrears(ix) for ix in range(3)] == [ether(50), ether(100), 0]
+
+    before = [token.balanceOf(VENDOR_A), token.balanceOf(VENDOR_B)]
+
+    token.transfer(group, ether(deposit), {'from': CLIENT})
+
+    # Vendors are paid in slot order, the owner only gets what is left
+    tx = group.shutdown({'from': OWNER})
+
+    assert [(event['receiver'], event['amount']) for event in tx.events['Distribution']] == [
+        (VENDOR_A, ether(paid[0])),
+        (VENDOR_B, ether(paid[1])),
+    ]
+
+    assert token.balanceOf(VENDOR_A) == before[0] + ether(paid[0])
+    assert token.balanceOf(VENDOR_B) == before[1] + ether(paid[1])
+    assert token.balanceOf(OWNER) == ether(returned)
+
+def test_preview_distribution(token, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    NEW_OWNER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    def transfers(tx):
+        return [(event['receiver'], event['amount']) for event in tx.events['Distribution']]
+
+    # Same order of checks as distribute()
+    assert group.preview_distribution() == (1, [], [])
+
+    token.transfer(group, ether(10200), {'from': CLIENT})
+
+    assert group.preview_distribution() == (3, [], [])
+
+    # i.e. 2022/07/10
+    travel(START + timedelta(days=40))
+
+    preview = group.preview_distribution()
+
+    assert preview['status'] == 0
+    assert list(zip(preview['receivers'], preview['amounts'])) == [
+        (VENDOR_A, ether(150)),
+        (VENDOR_B, ether(50)),
+        (MEMBER_A, ether(5000)),
+        (MEMBER_B, ether(3000)),
+        (MEMBER_C, ether(2000)),
+    ]
+
+    assert transfers(group.distribute({'from': OWNER})) == list(zip(preview['receivers'], preview['amounts']))
+
+    # Twelve months to pay vendors
+    # i.e. 2023/07/15
+    travel(START + timedelta(days=405))
+
+    token.transfer(group, ether(10), {'from': CLIENT})
+
+    assert group.preview_distribution() == (2, [], [])
+
+    group.change_arrears_mode(True, {'from': OWNER})
+
+    preview = group.preview_distribution()
+
+    assert preview == (0, [VENDOR_A], [ether(10)])
+    assert transfers(group.distribute({'from': OWNER})) == list(zip(preview['receivers'], preview['amounts']))
+
+    # Arrears without pending months
+    token.transfer(group, ether(5000), {'from': CLIENT})
+
+    preview = group.preview_distribution()
+
+    assert list(zip(preview['receivers'], preview['amounts'])) == [
+        (VENDOR_A, ether(1790)),
+        (VENDOR_B, ether(600)),
+        (MEMBER_A, ether(1305)),
+        (MEMBER_B, ether(783)),
+        (MEMBER_C, ether(522)),
+    ]
+
+    assert transfers(group.distribute({'from': OWNER})) == list(zip(preview['receivers'], preview['amounts']))
+
+def test_compact_events(token, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    NEW_OWNER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    with brownie.reverts('dev: Caller is not the owner'):
+        group.change_compact_events(True, {'from': NEW_OWNER})
+
+    group.change_compact_events(True, {'from': OWNER})
+
+    assert group.compact_events()
+    assert group.batch_transfers()
+
+    # Two months, i.e. 2022/08/10
+    travel(START + timedelta(days=71))
+
+    token.transfer(group, ether(10400), {'from': CLIENT})
+
+    tx = group.distribute({'from': OWNER})
+
+    assert 'Distribution' not in tx.events
+
+    event = tx.events['DistributionRound']
+
+    assert event['months'] == 2
+    assert event['distributions_counter'] == 2
+    assert list(zip(event['receivers'], event['amounts'])) == [
+        (VENDOR_A, ether(300)),
+        (VENDOR_B, ether(100)),
+        (MEMBER_A, ether(5000)),
+        (MEMBER_B, ether(3000)),
+        (MEMBER_C, ether(2000)),
+    ]
+
+    # Back to one event per receiver, the token keeps being batched
+    group.change_compact_events(False, {'from': OWNER})
+
+    assert not group.compact_events()
+    assert group.batch_transfers()
+
+    token.transfer(group, ether(10000), {'from': CLIENT})
+
+    tx = group.distribute({'from': OWNER})
+
+    assert 'DistributionRound' not in tx.events
+    assert len(tx.events['Distribution']) == 3
 
 def test_should_not_change_members_if_there_are_pending_distributions(token, group, accounts):
     CLIENT = accounts[0]
@@ -337,6 +700,9 @@ def test_should_not_change_members_if_there_are_pending_distributions(token, gro
     VENDOR_A = accounts[6]
     VENDOR_B = accounts[7]
 
+    # i.e. 2022/07/10
+    travel(START + timedelta(days=40))
+
     with brownie.reverts('There are pending distributions'):
         group.change_members_and_equities(
             [MEMBER_A, MEMBER_B, ZERO, ZERO, ZERO, ZERO, ZERO],
@@ -354,6 +720,9 @@ def test_should_not_change_vendors_if_there_are_pending_distributions(token, gro
     VENDOR_A = accounts[6]
     VENDOR_B = accounts[7]
 
+    # i.e. 2022/07/10
+    travel(START + timedelta(days=40))
+
     with brownie.reverts('There are pending distributions'):
         group.change_vendors_and_fees(
             [  VENDOR_A, ZERO, ZERO],
@@ -372,9 +741,7 @@ def test_change_members_and_equities(token, group, accounts):
     VENDOR_B = accounts[7]
 
     # execute pending distributions
-    token.transfer(group, ether(2400), {'from': CLIENT})
-
-    group.distribute({'from': OWNER})
+    settle(token, group, CLIENT)
 
     with brownie.reverts('dev: Caller is not the owner'):
         group.change_members_and_equities(
@@ -415,6 +782,8 @@ def test_equities_should_equal_shares_when_changing_members(token, group, accoun
     VENDOR_A = accounts[6]
     VENDOR_B = accounts[7]
 
+    settle(token, group, CLIENT)
+
     with brownie.reverts('Equities sum not equals total shares'):
         group.change_members_and_equities(
             [MEMBER_A, MEMBER_B, ZERO, ZERO, ZERO, ZERO, ZERO],
@@ -432,6 +801,8 @@ def test_only_zero_address_should_have_zero_equity_when_changing_members(token,
     VENDOR_A = accounts[6]
     VENDOR_B = accounts[7]
 
+    settle(token, group, CLIENT)
+
     with brownie.reverts('Only zero address can have zero equity'):
         group.change_members_and_equities(
             [MEMBER_A, MEMBER_B, MEMBER_C, ZERO, ZERO, ZERO, ZERO],
@@ -456,6 +827,8 @@ def test_change_vendors_and_fees(token, group, accounts):
     VENDOR_A = accounts[6]
     VENDOR_B = accounts[7]
 
+    settle(token, group, CLIENT)
+
     with brownie.reverts('dev: Caller is not the owner'):
         group.change_vendors_and_fees(
             [  VENDOR_A, ZERO, ZERO],
@@ -487,6 +860,8 @@ def test_only_zero_address_should_have_zero_fee_when_chainging_vendors(token, gr
     VENDOR_A = accounts[6]
     VENDOR_B = accounts[7]
 
+    settle(token, group, CLIENT)
+
     with brownie.reverts('Only zero address can have zero fee'):
         group.change_vendors_and_fees(
             [  VENDOR_A,  VENDOR_B, ZERO],
@@ -501,6 +876,152 @@ def test_only_zero_address_should_have_zero_fee_when_chainging_vendors(token, gr
             {'from': OWNER}
         )
 
+def test_should_not_reconfigure_if_there_are_pending_distributions(token, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    NEW_OWNER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    # i.e. 2022/07/10
+    travel(START + timedelta(days=40))
+
+    with brownie.reverts('There are pending distributions'):
+        group.reconfigure(
+            [MEMBER_A, MEMBER_B, ZERO, ZERO, ZERO, ZERO, ZERO],
+            [    5000,     5000,    0,    0,    0,    0,    0],
+            [  VENDOR_A, ZERO, ZERO],
+            [ether(200),    0,    0],
+            {'from': OWNER}
+        )
+
+def test_reconfigure(token, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    NEW_OWNER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    settle(token, group, CLIENT)
+
+    with brownie.reverts('dev: Caller is not the owner'):
+        group.reconfigure(
+            [MEMBER_A, MEMBER_B, ZERO, ZERO, ZERO, ZERO, ZERO],
+            [    5000,     5000,    0,    0,    0,    0,    0],
+            [  VENDOR_A, ZERO, ZERO],
+            [ether(200),    0,    0],
+            {'from': MEMBER_B}
+        )
+
+    before = group.snapshot()
+
+    # Valid members do not get written when the vendors are invalid
+    with brownie.reverts('Only zero address can have zero fee'):
+        group.reconfigure(
+            [MEMBER_A, MEMBER_B, ZERO, ZERO, ZERO, ZERO, ZERO],
+            [    5000,     5000,    0,    0,    0,    0,    0],
+            [  VENDOR_A,  VENDOR_B, ZERO],
+            [ether(200),         0,    0],
+            {'from': OWNER}
+        )
+
+    with brownie.reverts('Equities sum not equals total shares'):
+        group.reconfigure(
+            [MEMBER_A, MEMBER_B, ZERO, ZERO, ZERO, ZERO, ZERO],
+            [    5000,     6000,    0,    0,    0,    0,    0],
+            [  VENDOR_A, ZERO, ZERO],
+            [ether(200),    0,    0],
+            {'from': OWNER}
+        )
+
+    with brownie.reverts('Fee exceeds the maximum'):
+        group.reconfigure(
+            [MEMBER_A, MEMBER_B, ZERO, ZERO, ZERO, ZERO, ZERO],
+            [    5000,     5000,    0,    0,    0,    0,    0],
+            [VENDOR_A, ZERO, ZERO],
+            [   2**85,    0,    0],
+            {'from': OWNER}
+        )
+
+    assert group.snapshot() == before
+
+    group.reconfigure(
+        [MEMBER_A, MEMBER_B, ZERO, ZERO, ZERO, ZERO, ZERO],
+        [    5000,     5000,    0,    0,    0,    0,    0],
+        [  VENDOR_A, ZERO, ZERO],
+        [ether(200),    0,    0],
+        {'from': OWNER}
+    )
+
+    assert [group.members(ix) for ix in range(7)] == [MEMBER_A, MEMBER_B, ZERO, ZERO, ZERO, ZERO, ZERO]
+    assert [group.equities(ix) for ix in range(7)] == [5000, 5000, 0, 0, 0, 0, 0]
+    assert [group.vendors(ix) for ix in range(3)] == [VENDOR_A, ZERO, ZERO]
+    assert [group.fees(ix) for ix in range(3)] == [ether(200), 0, 0]
+
+    # Same configuration again writes nothing
+    tx = group.reconfigure(
+        [MEMBER_A, MEMBER_B, ZERO, ZERO, ZERO, ZERO, ZERO],
+        [    5000,     5000,    0,    0,    0,    0,    0],
+        [  VENDOR_A, ZERO, ZERO],
+        [ether(200),    0,    0],
+        {'from': OWNER}
+    )
+
+    assert 'SSTORE' not in {step['op'] for step in tx.trace}
+
+def test_received_totals(token, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    NEW_OWNER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    assert group.received_totals() == ([0, 0, 0, 0, 0, 0, 0], [0, 0, 0])
+
+    settle(token, group, CLIENT)
+
+    assert group.received_totals() == (
+        [ether(5000), ether(3000), ether(2000), 0, 0, 0, 0],
+        [ether(150), ether(50), 0],
+    )
+
+    group.change_members_and_equities(
+        [MEMBER_A, MEMBER_B, ZERO, ZERO, ZERO, ZERO, ZERO],
+        [    5000,     5000,    0,    0,    0,    0,    0],
+        {'from': OWNER}
+    )
+
+    group.change_vendors_and_fees(
+        [  VENDOR_A, ZERO, ZERO],
+        [ether(200),    0,    0],
+        {'from': OWNER}
+    )
+
+    token.transfer(group, ether(10000), {'from': CLIENT})
+
+    group.distribute({'from': OWNER})
+
+    # Removed member and vendor keep their history
+    assert group.received(MEMBER_C) == ether(2000)
+    assert group.received(VENDOR_B) == ether(50)
+
+    assert group.received_totals() == (
+        [ether(10000), ether(8000), 0, 0, 0, 0, 0],
+        [ether(150), 0, 0],
+    )
+
+    for account in (MEMBER_A, MEMBER_B, MEMBER_C, VENDOR_A, VENDOR_B):
+        assert group.received(account) == token.balanceOf(account)
+
 def test_change_owner(token, group, accounts):
     CLIENT = accounts[0]
     OWNER = accounts[1]
@@ -518,6 +1039,71 @@ def test_change_owner(token, group, accounts):
 
     assert group.owner() == NEW_OWNER
 
+def test_configuration_changed_events(token, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    NEW_OWNER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    settle(token, group, CLIENT)
+
+    members = [MEMBER_A, MEMBER_B, ZERO, ZERO, ZERO, ZERO, ZERO]
+    equities = [    5000,     5000,    0,    0,    0,    0,    0]
+    vendors = [  VENDOR_A, ZERO, ZERO]
+    fees = [ether(200),    0,    0]
+
+    txs = [
+        group.change_members_and_equities(members, equities, {'from': OWNER}),
+        group.change_vendors_and_fees(vendors, fees, {'from': OWNER}),
+        group.reconfigure(members, equities, vendors, fees, {'from': OWNER}),
+        group.change_arrears_mode(True, {'from': OWNER}),
+        group.change_owner(NEW_OWNER, {'from': OWNER}),
+    ]
+
+    assert [ tx.events['ConfigurationChanged']['owner'] for tx in txs ] == [OWNER] * 4 + [NEW_OWNER]
+
+    # Event modes and distributions are not logged as configuration changes
+    tx = group.change_compact_events(True, {'from': NEW_OWNER})
+
+    assert 'ConfigurationChanged' not in tx.events
+
+def test_snapshot(token, group, accounts):
+    CLIENT = accounts[0]
+    OWNER = accounts[1]
+    NEW_OWNER = accounts[2]
+    MEMBER_A = accounts[3]
+    MEMBER_B = accounts[4]
+    MEMBER_C = accounts[5]
+    VENDOR_A = accounts[6]
+    VENDOR_B = accounts[7]
+
+    # Before the start date nothing is pending
+    assert group.snapshot()['pending_distributions'] == 0
+
+    # i.e. 2022/07/10
+    travel(START + timedelta(days=40))
+
+    token.transfer(group, ether(500), {'from': CLIENT})
+
+    snapshot = group.snapshot()
+
+    assert snapshot['owner'] == group.owner()
+    assert snapshot['start_timestamp'] == group.start_timestamp()
+    assert snapshot['distributions_counter'] == group.distributions_counter()
+    assert snapshot['pending_distributions'] == group.pending_distributions()
+
+    assert snapshot['members'] == [group.members(ix) for ix in range(7)]
+    assert snapshot['equities'] == [group.equities(ix) for ix in range(7)]
+    assert snapshot['vendors'] == [group.vendors(ix) for ix in range(3)]
+    assert snapshot['fees'] == [group.fees(ix) for ix in range(3)]
+
+    assert snapshot['token'] == token
+    assert snapshot['token_balance'] == token.balanceOf(group)
+
 def test_shutdown(token, group, accounts):
     CLIENT = accounts[0]
     OWNER = accounts[1]
@@ -533,8 +1119,8 @@ def test_shutdown(token, group, accounts):
     with brownie.reverts('dev: Caller is not the owner'):
         group.shutdown({'from': CLIENT})
 
-    assert token.balanceOf(NEW_OWNER) == 0
+    assert token.balanceOf(OWNER) == 0
 
-    group.shutdown({'from': NEW_OWNER})
+    group.shutdown({'from': OWNER})
 
-    assert token.balanceOf(NEW_OWNER) == ether(10000)
+    assert token.balanceOf(OWNER) == ether(10000)
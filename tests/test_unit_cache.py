@@ -0,0 +1,121 @@
+import pytest
+
+from scripts.deploy_units import deploy_factory
+from scripts.unit_cache import GETTER_CALLS, UnitCache
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+MONTH_TIMEDELTA = 2629800
+DAY = 86400
+
+def ether(value):
+    return value * 10**18
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+@pytest.fixture(scope='module')
+def token(Token, accounts):
+    yield Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': accounts[0]})
+
+def config(token, chain, accounts):
+    return (
+        chain.time() - MONTH_TIMEDELTA - DAY,
+        token,
+        [accounts[3], accounts[4], accounts[5], ZERO, ZERO, ZERO, ZERO],
+        [       5000,        3000,        2000,    0,    0,    0,    0],
+        [ accounts[6], ZERO, ZERO],
+        [  ether(150),    0,    0],
+    )
+
+@pytest.fixture(scope='module')
+def unit(Unit, token, chain, accounts):
+    yield Unit.deploy(*config(token, chain, accounts), {'from': accounts[1]})
+
+def test_cache_hits_until_configuration_changes(unit, token, accounts, tmp_path):
+    OWNER = accounts[1]
+
+    path = str(tmp_path / 'cache.sqlite')
+    units = [(unit.address, token.address)]
+
+    cache = UnitCache(path)
+
+    state = cache.read(units)[unit.address]
+    snapshot = unit.snapshot()
+
+    assert state == {name: snapshot[name] for name in state}
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    token.transfer(unit, ether(10_000), {'from': accounts[0]})
+
+    requests = cache.requests
+    state = cache.read(units)[unit.address]
+
+    # Head, reorg check and logs, then the pending distributions and balance
+    assert cache.requests - requests == 5
+    assert state['token_balance'] == ether(10_000)
+    assert state['pending_distributions'] == 1
+
+    # Distributions only change the values read fresh
+    unit.distribute({'from': accounts[2]})
+
+    state = cache.read(units)[unit.address]
+
+    assert state['pending_distributions'] == 0
+    assert state['token_balance'] == token.balanceOf(unit)
+    assert (cache.hits, cache.misses, cache.invalidated) == (2, 1, 0)
+
+    unit.change_members_and_equities(
+        [accounts[3], accounts[4], ZERO, ZERO, ZERO, ZERO, ZERO],
+        [       5000,        5000,    0,    0,    0,    0,    0],
+        {'from': OWNER}
+    )
+
+    state = cache.read(units)[unit.address]
+
+    assert state['members'] == [accounts[3], accounts[4], ZERO, ZERO, ZERO, ZERO, ZERO]
+    assert state['equities'] == [5000, 5000, 0, 0, 0, 0, 0]
+    assert (cache.hits, cache.misses, cache.invalidated) == (2, 2, 1)
+
+    # Entries outlive the process
+    cache = UnitCache(path)
+
+    assert cache.read(units)[unit.address]['members'] == state['members']
+    assert (cache.hits, cache.misses) == (1, 0)
+    # No block since the last read, the logs are not fetched
+    assert cache.uncached_requests - cache.requests == GETTER_CALLS - 4
+
+def test_cache_drops_entries_of_reorged_blocks(unit, token, chain, accounts, tmp_path):
+    OWNER = accounts[1]
+    NEW_OWNER = accounts[2]
+
+    units = [(unit.address, token.address)]
+
+    cache = UnitCache(str(tmp_path / 'cache.sqlite'))
+    cache.read(units)
+
+    chain.snapshot()
+
+    unit.change_owner(NEW_OWNER, {'from': OWNER})
+
+    assert cache.read(units)[unit.address]['owner'] == NEW_OWNER
+
+    # The change is orphaned, the cached block replaced by another one
+    chain.revert()
+    chain.mine(2)
+
+    assert cache.read(units)[unit.address]['owner'] == OWNER
+    assert cache.invalidated == 2
+
+def test_cache_resolves_proxies(Unit, UnitFactory, token, chain, accounts, tmp_path):
+    factory = deploy_factory(accounts[0])
+    proxy = factory.create_unit(*config(token, chain, accounts), accounts[1], {'from': accounts[0]}).return_value
+
+    cache = UnitCache(str(tmp_path / 'cache.sqlite'))
+
+    cache.read([(proxy, token.address)])
+    cache.read([(proxy, token.address)])
+
+    assert (cache.hits, cache.misses, cache.uncacheable) == (1, 1, 0)
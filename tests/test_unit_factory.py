@@ -0,0 +1,165 @@
+import json
+import pytest
+import brownie
+
+from scripts.deploy_units import create_units, deploy_factory, load_config
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+MONTH_TIMEDELTA = 2629800
+DAY = 86400
+
+# Units created by the batch deployment test
+BATCH = 20
+
+def ether(value):
+    return value * 10**18
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+@pytest.fixture(scope='module')
+def token(Token, accounts):
+    yield Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': accounts[0]})
+
+@pytest.fixture(scope='module')
+def factory(accounts):
+    yield deploy_factory(accounts[0])
+
+def config(token, chain, accounts):
+    return (
+        chain.time() - MONTH_TIMEDELTA - DAY,
+        token,
+        [accounts[3], accounts[4], accounts[5], ZERO, ZERO, ZERO, ZERO],
+        [       5000,        3000,        2000,    0,    0,    0,    0],
+        [ accounts[6], ZERO, ZERO],
+        [  ether(150),    0,    0],
+    )
+
+def test_factory_requires_template_without_owner(Unit, UnitFactory, token, chain, accounts):
+    template = Unit.deploy(*config(token, chain, accounts), {'from': accounts[1]})
+
+    with brownie.reverts('Template has an owner'):
+        UnitFactory.deploy(template, {'from': accounts[1]})
+
+def test_create_unit(Unit, factory, token, chain, accounts):
+    OWNER = accounts[1]
+
+    args = config(token, chain, accounts)
+
+    tx = factory.create_unit(*args, OWNER, {'from': accounts[2]})
+
+    unit = Unit.at(tx.return_value)
+
+    assert tx.events['UnitCreated']['unit'] == unit
+    assert tx.events['UnitCreated']['owner'] == OWNER
+
+    # EIP-1167 proxy of the template
+    template = factory.template()[2:].lower()
+    assert brownie.web3.eth.get_code(unit.address).hex().removeprefix('0x') == f'363d3d373d3d3d363d73{template}5af43d82803e903d91602b57fd5bf3'
+
+    snapshot = unit.snapshot()
+
+    assert snapshot['owner'] == OWNER
+    assert snapshot['start_timestamp'] == args[0]
+    assert snapshot['members'] == args[2]
+    assert snapshot['equities'] == args[3]
+    assert snapshot['vendors'] == args[4]
+    assert snapshot['fees'] == args[5]
+    assert snapshot['token'] == token
+    assert unit.batch_transfers()
+
+    token.transfer(unit, ether(10_200), {'from': accounts[0]})
+
+    unit.distribute({'from': accounts[2]})
+
+    assert token.balanceOf(accounts[6]) == ether(150)
+    assert token.balanceOf(accounts[3]) == ether(5025)
+    assert token.balanceOf(accounts[4]) == ether(3015)
+    assert token.balanceOf(accounts[5]) == ether(2010)
+
+    # Units do not share storage with each other or the template
+    other = Unit.at(factory.create_unit(*args, accounts[2], {'from': accounts[2]}).return_value)
+
+    assert other.owner() == accounts[2]
+    assert other.distributions_counter() == 0
+    assert Unit.at(factory.template()).owner() == ZERO
+
+def test_create_unit_validation(factory, token, chain, accounts):
+    start, token, members, equities, vendors, fees = config(token, chain, accounts)
+
+    with brownie.reverts('Equities sum not equals total shares'):
+        factory.create_unit(start, token, members, [5000, 6000, 2000, 0, 0, 0, 0], vendors, fees, accounts[1], {'from': accounts[1]})
+
+    with brownie.reverts('Only zero address can have zero equity'):
+        factory.create_unit(start, token, members, [5000, 5000, 0, 0, 0, 0, 0], vendors, fees, accounts[1], {'from': accounts[1]})
+
+    with brownie.reverts('Only zero address can have zero fee'):
+        factory.create_unit(start, token, members, equities, vendors, [0, 0, 0], accounts[1], {'from': accounts[1]})
+
+    with brownie.reverts('Fee exceeds the maximum'):
+        factory.create_unit(start, token, members, equities, vendors, [2**85, 0, 0], accounts[1], {'from': accounts[1]})
+
+def test_initialize_only_once(Unit, factory, token, chain, accounts):
+    args = config(token, chain, accounts)
+
+    proxy = Unit.at(factory.create_unit(*args, accounts[1], {'from': accounts[1]}).return_value)
+    direct = Unit.deploy(*args, {'from': accounts[1]})
+
+    for unit in (proxy, direct, Unit.at(factory.template())):
+        with brownie.reverts('Already initialized'):
+            unit.initialize(*args, accounts[2], {'from': accounts[2]})
+
+def test_deployment_gas(Unit, factory, token, chain, accounts):
+    args = config(token, chain, accounts)
+
+    direct = Unit.deploy(*args, {'from': accounts[1]})
+    created = factory.create_unit(*args, accounts[1], {'from': accounts[1]})
+
+    proxy = Unit.at(created.return_value)
+
+    # Recipients hold tokens from the second round on, same cost for both
+    for _ in range(2):
+        distributions = []
+
+        for unit in (direct, proxy):
+            token.transfer(unit, ether(10_200), {'from': accounts[0]})
+
+            distributions.append(unit.distribute({'from': accounts[2]}).gas_used)
+
+    print(f'\nDeploy: direct {direct.tx.gas_used} gas, proxy {created.gas_used} gas')
+    print(f'Distribute: direct {distributions[0]} gas, proxy {distributions[1]} gas')
+
+    assert created.gas_used * 4 < direct.tx.gas_used
+
+def test_create_units_from_config(Unit, factory, token, chain, accounts, tmp_path):
+    path = tmp_path / 'units.json'
+
+    entries = [
+        {
+            'start': '2022-05-01',
+            'token': token.address,
+            'members': {accounts[3 + ix % 3].address: 6000, accounts[9].address: 4000},
+            'vendors': {accounts[6].address: 100 + ix},
+        }
+        for ix in range(BATCH)
+    ]
+
+    path.write_text(json.dumps(entries))
+
+    units = load_config(path, accounts[1].address)
+
+    receipts = create_units(factory, units, accounts[1])
+
+    assert len({tx.return_value for tx in receipts}) == BATCH
+
+    for ix, tx in enumerate(receipts):
+        unit = Unit.at(tx.return_value)
+
+        assert unit.owner() == accounts[1]
+        assert unit.start_timestamp() == 1651363200
+        assert unit.members(0) == accounts[3 + ix % 3]
+        assert unit.equities(1) == 4000
+        assert unit.fees(0) == ether(100 + ix)
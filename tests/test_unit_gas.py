@@ -0,0 +1,234 @@
+import json
+import os
+import pytest
+import brownie
+
+from scripts.gas_profile import Profile
+
+## Gas benchmark of Unit.distribute()
+#
+# Every cell of the grid (active members x vendors x pending months) deploys
+# a fresh Token and Unit, so recipients always start from an empty balance and
+# the gas figures are reproducible between runs.
+#
+# Measurements are compared against tests/gas_baseline.json, a cell moving
+# more than GAS_TOLERANCE (relative) or missing from the baseline fails. Run
+# with GAS_BASELINE_UPDATE=1 to record the whole grid after an intended
+# contract change, and commit the baseline with it.
+
+# Zero address
+ZERO = '0x0000000000000000000000000000000000000000'
+
+MONTH_TIMEDELTA = 2629800
+DAY = 86400
+
+MEMBERS = 7
+VENDORS = 3
+SHARES = 10000
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'gas_baseline.json')
+GAS_TOLERANCE = float(os.environ.get('GAS_TOLERANCE', '0.02'))
+GAS_BASELINE_UPDATE = os.environ.get('GAS_BASELINE_UPDATE') == '1'
+
+# Istanbul storage costs (EIP-2200) of the chain pinned in brownie-config.yaml
+SLOAD_GAS = 800
+SSTORE_SET_GAS = 20_000
+SSTORE_RESET_GAS = 5_000
+
+# Indexing, overflow check and mapping key hashing around the storage access
+# of the received totals line
+TOTALS_OVERHEAD_GAS = 400
+
+TOTALS_LINE = 'self.received[receivers[ix]] += amounts[ix]'
+
+def ether(value):
+    return value * 10**18
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+@pytest.fixture(scope='module')
+def baseline():
+    try:
+        with open(BASELINE) as f:
+            recorded = json.load(f)
+    except FileNotFoundError:
+        recorded = {}
+
+    measured = dict(recorded)
+
+    yield measured
+
+    if measured != recorded:
+        with open(BASELINE, 'w') as f:
+            json.dump(measured, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+@pytest.fixture(scope='module')
+def recipients(accounts):
+    # Deterministic local accounts, members first and vendors last
+    return [
+        accounts.add(f'0x{ix + 1:064x}').address
+        for ix in range(MEMBERS + VENDORS)
+    ]
+
+def check_gas(baseline, key, gas_used):
+    if GAS_BASELINE_UPDATE:
+        baseline[key] = gas_used
+        return
+
+    assert key in baseline, f'{key} is not in the baseline, record it with GAS_BASELINE_UPDATE=1'
+
+    expected = baseline[key]
+
+    drift = abs(gas_used - expected) / expected
+
+    assert drift <= GAS_TOLERANCE, \
+        f'{key} used {gas_used} gas, baseline is {expected} ({drift:.2%} drift)'
+
+def deploy(Unit, Token, chain, owner, recipients, members, vendors, pending):
+    token = Token.deploy('Test Token', 'TST', 18, ether(1_000_000), {'from': owner})
+
+    equities = [SHARES // members] * members
+    equities[0] += SHARES % members
+
+    fees = [ether(10 * (ix + 1)) for ix in range(vendors)]
+
+    # Start date far enough in the past to leave exactly `pending` months
+    start = chain.time() - pending * MONTH_TIMEDELTA - DAY
+
+    unit = Unit.deploy(
+        start,
+        token,
+        recipients[:members] + [ZERO] * (MEMBERS - members),
+        equities + [0] * (MEMBERS - members),
+        recipients[MEMBERS:MEMBERS + vendors] + [ZERO] * (VENDORS - vendors),
+        fees + [0] * (VENDORS - vendors),
+        {'from': owner}
+    )
+
+    return token, unit
+
+@pytest.mark.parametrize('pending', [0, 1, 12])
+@pytest.mark.parametrize('vendors', range(VENDORS + 1))
+@pytest.mark.parametrize('members', range(1, MEMBERS + 1))
+def test_distribute_gas(Unit, Token, chain, accounts, recipients, baseline, members, vendors, pending):
+    OWNER = accounts[0]
+    KEEPER = accounts[1]
+
+    token, unit = deploy(Unit, Token, chain, OWNER, recipients, members, vendors, pending)
+
+    assert unit.pending_distributions() == pending
+
+    token.transfer(unit, ether(10_000), {'from': OWNER})
+
+    tx = unit.distribute({'from': KEEPER})
+
+    check_gas(baseline, f'distribute/members={members}/vendors={vendors}/pending={pending}', tx.gas_used)
+
+@pytest.mark.parametrize('pending', [1, 12])
+@pytest.mark.parametrize('vendors', range(1, VENDORS + 1))
+def test_distribute_insufficient_balance_gas(Unit, Token, chain, accounts, recipients, baseline, vendors, pending):
+    OWNER = accounts[0]
+    KEEPER = accounts[1]
+
+    token, unit = deploy(Unit, Token, chain, OWNER, recipients, 3, vendors, pending)
+
+    # Above the distribution threshold but below the smallest vendor fee
+    token.transfer(unit, ether(2), {'from': OWNER})
+
+    with brownie.reverts('Insufficient balance to pay vendors'):
+        unit.distribute({'from': KEEPER, 'gas_limit': 1_000_000, 'allow_revert': True})
+
+    tx = brownie.history[-1]
+
+    check_gas(baseline, f'distribute_revert/members=3/vendors={vendors}/pending={pending}', tx.gas_used)
+
+@pytest.mark.parametrize('pending', [0, 1])
+def test_batch_transfer_gas(Unit, Token, PlainToken, chain, accounts, recipients, baseline, pending):
+    OWNER = accounts[0]
+    KEEPER = accounts[1]
+
+    gas_used = {}
+
+    # Production configuration, 3 members and 2 vendors
+    for name, contract in [('batch', Token), ('plain', PlainToken)]:
+        token, unit = deploy(Unit, contract, chain, OWNER, recipients, 3, 2, pending)
+
+        assert unit.batch_transfers() == (name == 'batch')
+
+        token.transfer(unit, ether(10_000), {'from': OWNER})
+
+        tx = unit.distribute({'from': KEEPER})
+
+        gas_used[name] = tx.gas_used
+
+        check_gas(baseline, f'distribute_{name}/members=3/vendors=2/pending={pending}', tx.gas_used)
+
+    # With no month pending only the 3 members are paid, too few for the
+    # single call to make up for encoding the batch
+    if pending > 0:
+        assert gas_used['batch'] < gas_used['plain']
+
+@pytest.mark.parametrize('members', [1, 4, 7])
+def test_compact_events_gas(Unit, Token, chain, accounts, recipients, baseline, members):
+    OWNER = accounts[0]
+    KEEPER = accounts[1]
+
+    gas_used = {}
+
+    for name in ('events', 'compact'):
+        token, unit = deploy(Unit, Token, chain, OWNER, recipients, members, VENDORS, 1)
+
+        unit.change_compact_events(name == 'compact', {'from': OWNER})
+
+        token.transfer(unit, ether(10_000), {'from': OWNER})
+
+        tx = unit.distribute({'from': KEEPER})
+
+        assert ('DistributionRound' in tx.events) == (name == 'compact')
+
+        gas_used[name] = tx.gas_used
+
+        check_gas(baseline, f'distribute_{name}/members={members}/vendors={VENDORS}/pending=1', tx.gas_used)
+
+    print(f"\n{members + VENDORS} receivers: {gas_used['events']:,} gas with one event each, {gas_used['compact']:,} gas compact")
+
+    assert gas_used['compact'] < gas_used['events']
+
+@pytest.mark.parametrize('members', [1, 3, 7])
+def test_received_totals_gas(Unit, Token, chain, accounts, recipients, members):
+    OWNER = accounts[0]
+    KEEPER = accounts[1]
+
+    token, unit = deploy(Unit, Token, chain, OWNER, recipients, members, VENDORS, 1)
+
+    token.transfer(unit, ether(10_000), {'from': OWNER})
+
+    first = unit.distribute({'from': KEEPER})
+
+    # Same recipients a month later, their total slots exist
+    chain.sleep(MONTH_TIMEDELTA)
+
+    token.transfer(unit, ether(10_000), {'from': OWNER})
+
+    later = unit.distribute({'from': KEEPER})
+
+    gas_used = []
+
+    for tx in (first, later):
+        profile = Profile()
+        profile.add(tx, 'distribute')
+
+        gas_used.append(sum(
+            gas for (_, _, code), gas in profile.lines.items() if code == TOTALS_LINE
+        ))
+
+    paid = members + VENDORS
+
+    print(f"\n{paid} receivers: totals add {gas_used[0]:,} gas to the first distribution, {gas_used[1]:,} gas to later ones")
+
+    # One read and one write of a new slot per receiver, then of an existing one
+    for gas, sstore in zip(gas_used, (SSTORE_SET_GAS, SSTORE_RESET_GAS)):
+        assert paid * (SLOAD_GAS + sstore) <= gas <= paid * (SLOAD_GAS + sstore + TOTALS_OVERHEAD_GAS)
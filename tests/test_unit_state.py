@@ -0,0 +1,351 @@
+import os
+import time
+import pytest
+
+from hypothesis import HealthCheck, settings, strategies as st
+from hypothesis.stateful import RuleBasedStateMachine, initialize, invariant, rule, run_state_machine_as_test
+
+from model import Revert, UnitModel, ZERO
+
+boa = pytest.importorskip('boa')
+
+## Stateful property test of Unit on an in-process EVM
+#
+# Hypothesis interleaves time jumps, deposits, distributions and member,
+# vendor, arrears mode, event mode and owner changes against a Unit deployed
+# on titanoboa's in-process EVM, without the local ganache chain. Every step
+# is checked against the reference model in tests/model.py and the
+# invariants below, failing sequences are shrunk to the shortest one
+# reproducing the failure.
+#
+# STATE_EXAMPLES sequences of up to STATE_STEPS steps are run, the test
+# prints the steps per second.
+
+STATE_EXAMPLES = int(os.environ.get('STATE_EXAMPLES', '200'))
+STATE_STEPS = int(os.environ.get('STATE_STEPS', '50'))
+
+# Run on titanoboa, chain_isolation in conftest.py skips the local chain
+IN_PROCESS_EVM = True
+
+CONTRACTS = os.path.join(os.path.dirname(__file__), os.pardir, 'contracts')
+
+MONTH_TIMEDELTA = UnitModel.MONTH_TIMEDELTA
+SHARES = UnitModel.SHARES
+
+def ether(value):
+    return value * 10**18
+
+def address(ix):
+    return f'0x{ix:040x}'
+
+OWNER = address(0xe000)
+STRANGER = address(0xe001)
+KEEPER = address(0xe002)
+CLIENT = address(0xe003)
+
+# Disjoint pools, so vendor and member payments can be told apart
+MEMBERS = [address(0xa000 + ix) for ix in range(10)]
+VENDORS = [address(0xb000 + ix) for ix in range(5)]
+
+SENDERS = st.sampled_from([OWNER, STRANGER])
+
+@st.composite
+def members(draw):
+    '''
+    Valid members and equities most of the time, broken ones exercise the
+    validation
+    '''
+    active = draw(st.lists(st.integers(0, UnitModel.MEMBERS - 1), min_size=1, max_size=UnitModel.MEMBERS, unique=True))
+    cuts = sorted(draw(st.lists(st.integers(1, SHARES - 1), min_size=len(active) - 1, max_size=len(active) - 1, unique=True)))
+
+    equities = [0] * UnitModel.MEMBERS
+    addresses = [ZERO] * UnitModel.MEMBERS
+
+    for ix, low, high in zip(active, [0] + cuts, cuts + [SHARES]):
+        equities[ix] = high - low
+        addresses[ix] = draw(st.sampled_from(MEMBERS))
+
+    if draw(st.integers(0, 19)) == 0:
+        equities[draw(st.integers(0, UnitModel.MEMBERS - 1))] += 1
+
+    return addresses, equities
+
+@st.composite
+def vendors(draw):
+    fees = draw(st.lists(
+        st.one_of(st.just(0), st.integers(1, 500).map(ether), st.integers(1, ether(500)), st.integers(1, UnitModel.FEE_MAX + 1)),
+        min_size=UnitModel.VENDORS,
+        max_size=UnitModel.VENDORS,
+    ))
+
+    addresses = [draw(st.sampled_from(VENDORS)) if fee > 0 else ZERO for fee in fees]
+
+    if draw(st.integers(0, 19)) == 0:
+        addresses[draw(st.integers(0, UnitModel.VENDORS - 1))] = ZERO
+
+    return addresses, fees
+
+@st.composite
+def valid_vendors(draw):
+    addresses, fees = draw(vendors())
+
+    valid = [vendor != ZERO and fee <= UnitModel.FEE_MAX for vendor, fee in zip(addresses, fees)]
+
+    return (
+        [vendor if ok else ZERO for vendor, ok in zip(addresses, valid)],
+        [fee if ok else 0 for fee, ok in zip(fees, valid)],
+    )
+
+DEPOSITS = st.one_of(
+    st.integers(0, ether(2)),
+    st.integers(1, 20_000).map(ether),
+    st.integers(0, 2**200),
+)
+
+class UnitStateMachine(RuleBasedStateMachine):
+    deployers = None
+
+    # Totals over every sequence, for the steps per second report
+    steps = 0
+
+    @initialize(
+        batch=st.booleans(),
+        offset=st.integers(-3 * MONTH_TIMEDELTA, MONTH_TIMEDELTA),
+        config=members().filter(lambda config: sum(config[1]) == SHARES),
+        fees=valid_vendors(),
+        arrears=st.booleans(),
+    )
+    def deploy(self, batch, offset, config, fees, arrears):
+        token = self.deployers['Token' if batch else 'PlainToken']
+
+        with boa.env.prank(CLIENT):
+            self.token = token.deploy('Test Token', 'TST', 18, 2**256 - 1)
+
+        self.start = self.now() + offset
+
+        with boa.env.prank(OWNER):
+            self.unit = self.deployers['Unit'].deploy(self.start, self.token.address, *config, *fees)
+            self.unit.change_arrears_mode(arrears)
+
+        self.model = UnitModel(self.start, *config, *fees, OWNER)
+        self.model.change_arrears_mode(OWNER, arrears)
+
+        self.deposited = 0
+        self.steps_run = 0
+
+        # Months whose vendor fees were paid, and what every address was paid
+        # according to the Distribution logs
+        self.settled = 0
+        self.paid = {receiver: 0 for receiver in MEMBERS + VENDORS}
+
+        self.state = self.unit.snapshot()
+
+    def teardown(self):
+        UnitStateMachine.steps += self.steps_run
+
+        # Once per sequence, as every view call runs on the EVM interpreter
+        for receiver in MEMBERS + VENDORS:
+            assert self.token.balanceOf(receiver) == self.paid[receiver]
+            assert self.unit.received(receiver) == self.paid[receiver]
+
+    def now(self):
+        return boa.env.evm.patch.timestamp
+
+    def months(self):
+        return max(self.now() - self.start, 0) // MONTH_TIMEDELTA
+
+    def apply(self, sender, model_call, contract_call):
+        '''
+        Runs the same call on the model and the contract, both revert or
+        neither does. Returns the model transfers, None on revert.
+        '''
+        self.steps_run += 1
+
+        try:
+            transfers = model_call()
+        except Revert as exc:
+            with boa.env.prank(sender):
+                try:
+                    contract_call()
+                except boa.BoaError as error:
+                    # Compiler inserted checks carry no reason
+                    if exc.message and not exc.message.startswith('Integer'):
+                        assert exc.message.removeprefix('dev: ') in str(error), (exc.message, str(error))
+                else:
+                    raise AssertionError(f'model reverted with {exc.message!r}, contract did not')
+
+            return None
+
+        with boa.env.prank(sender):
+            contract_call()
+
+        # Before the snapshot call replaces them
+        self.logs = self.unit.get_logs()
+        self.state = self.unit.snapshot()
+
+        return transfers
+
+    @rule(seconds=st.one_of(st.integers(0, 3 * MONTH_TIMEDELTA), st.sampled_from([MONTH_TIMEDELTA - 1, MONTH_TIMEDELTA, MONTH_TIMEDELTA + 1])))
+    def sleep(self, seconds):
+        self.steps_run += 1
+
+        boa.env.time_travel(seconds=seconds)
+
+    @rule(amount=DEPOSITS)
+    def deposit(self, amount):
+        self.apply(CLIENT, lambda: self.model.deposit(amount), lambda: self.token.transfer(self.unit.address, amount))
+
+        self.deposited += amount
+
+    @rule()
+    def distribute(self):
+        settled = self.model.distributions_counter
+        vendors = self.model.vendors
+        fees = self.model.fees
+        owed = self.model.arrears
+
+        # Checked arithmetic reverts the preview like the distribution
+        try:
+            preview = self.unit.preview_distribution()
+        except boa.BoaError:
+            preview = None
+
+        transfers = self.apply(KEEPER, lambda: self.model.distribute(self.now()), self.unit.distribute)
+
+        if transfers is None:
+            assert preview is None or preview[0] != 0
+            return
+
+        assert preview[0] == 0
+        assert [(receiver.lower(), amount) for receiver, amount in zip(preview[1], preview[2])] == transfers
+
+        payouts = []
+
+        for event in self.logs:
+            if event.event_type.name == 'Distribution':
+                payouts.append((event.topics[0].lower(), event.args[0]))
+            elif event.event_type.name == 'DistributionRound':
+                months, counter, receivers, amounts = event.args
+
+                assert months == self.months() - settled
+                assert counter == self.model.distributions_counter
+
+                payouts += [(receiver.lower(), amount) for receiver, amount in zip(receivers, amounts)]
+
+        assert payouts == transfers
+
+        # Every month since the last distribution, and only those, pays the
+        # vendors, in arrears mode what is not paid is owed
+        months = self.months() - settled
+        arrears = [self.unit.arrears(ix) for ix in range(UnitModel.VENDORS)]
+
+        assert arrears == self.model.arrears
+
+        for vendor in VENDORS:
+            due = sum(
+                before + fee * months - after
+                for slot, fee, before, after in zip(vendors, fees, owed, arrears)
+                if slot == vendor
+            )
+
+            assert sum(amount for receiver, amount in payouts if receiver == vendor) == due
+
+        for receiver, amount in payouts:
+            self.paid[receiver] += amount
+
+        self.settled += months
+
+    @rule(sender=SENDERS, config=members())
+    def change_members(self, sender, config):
+        self.apply(
+            sender,
+            lambda: self.model.change_members_and_equities(sender, self.now(), *config),
+            lambda: self.unit.change_members_and_equities(*config),
+        )
+
+    @rule(sender=SENDERS, config=vendors())
+    def change_vendors(self, sender, config):
+        self.apply(
+            sender,
+            lambda: self.model.change_vendors_and_fees(sender, self.now(), *config),
+            lambda: self.unit.change_vendors_and_fees(*config),
+        )
+
+    @rule(sender=SENDERS, config=members(), fees=vendors())
+    def reconfigure(self, sender, config, fees):
+        self.apply(
+            sender,
+            lambda: self.model.reconfigure(sender, self.now(), *config, *fees),
+            lambda: self.unit.reconfigure(*config, *fees),
+        )
+
+    @rule(sender=SENDERS, enabled=st.booleans())
+    def change_arrears_mode(self, sender, enabled):
+        self.apply(
+            sender,
+            lambda: self.model.change_arrears_mode(sender, enabled),
+            lambda: self.unit.change_arrears_mode(enabled),
+        )
+
+    @rule(sender=SENDERS, enabled=st.booleans())
+    def change_compact_events(self, sender, enabled):
+        self.apply(
+            sender,
+            lambda: self.model.change_compact_events(sender, enabled),
+            lambda: self.unit.change_compact_events(enabled),
+        )
+
+    @rule(sender=SENDERS, new_owner=SENDERS)
+    def change_owner(self, sender, new_owner):
+        self.apply(
+            sender,
+            lambda: self.model.change_owner(sender, new_owner),
+            lambda: self.unit.change_owner(new_owner),
+        )
+
+    # Invariants check the snapshot taken after the last call
+
+    @invariant()
+    def no_tokens_created_or_lost(self):
+        assert self.state[9] + sum(self.paid.values()) == self.deposited
+
+    @invariant()
+    def vendors_paid_once_per_month(self):
+        assert self.state[2] == self.settled
+        assert self.state[2] <= self.months()
+
+    @invariant()
+    def matches_model(self):
+        owner, _, counter, _, members, equities, vendors, fees, _, balance = self.state
+
+        assert owner.lower() == self.model.owner
+        assert counter == self.model.distributions_counter
+        assert [member.lower() for member in members] == self.model.members
+        assert list(equities) == self.model.equities
+        assert [vendor.lower() for vendor in vendors] == self.model.vendors
+        assert list(fees) == self.model.fees
+        assert balance == self.model.balance
+
+@pytest.fixture(scope='module')
+def deployers():
+    return {
+        name: boa.load_partial(os.path.join(CONTRACTS, path))
+        for name, path in [('Unit', 'Unit.vy'), ('Token', 'Token.vy'), ('PlainToken', 'test/PlainToken.vy')]
+    }
+
+def test_unit_state_machine(deployers):
+    UnitStateMachine.deployers = deployers
+    UnitStateMachine.steps = 0
+
+    started = time.perf_counter()
+
+    run_state_machine_as_test(UnitStateMachine, settings=settings(
+        max_examples=STATE_EXAMPLES,
+        stateful_step_count=STATE_STEPS,
+        deadline=None,
+        suppress_health_check=[HealthCheck.too_slow, HealthCheck.filter_too_much],
+    ))
+
+    elapsed = time.perf_counter() - started
+
+    print(f'\n{UnitStateMachine.steps:,} steps in {elapsed:.2f}s ({UnitStateMachine.steps / elapsed:,.0f} steps/s)')